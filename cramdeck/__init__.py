@@ -0,0 +1,35 @@
+"""
+94CramManageSystem - 行銷簡報生成套件
+
+    from cramdeck import build_deck
+    build_deck('decks/94cram_marketing.json', 'demo.pptx')
+
+命令列：python -m cramdeck --help
+
+import cramdeck 不會輸出任何檔案，也不會載入 python-pptx；
+deck（python-pptx、lxml）只在 build_deck 或 CLI 真正輸出時才 import。
+"""
+
+import os
+
+from .cli import main
+from .spec import DEFAULT_SPEC, list_slides, load_spec, validate_spec
+
+__all__ = ['build_deck', 'main', 'load_spec', 'validate_spec', 'list_slides', 'DEFAULT_SPEC']
+
+
+def build_deck(spec, out, cache_dir=None, cache_size=512, jobs=1, reproducible=False):
+    """將 deck spec（dict 或 JSON 路徑）輸出到 `out`，回傳 Presentation
+
+    `out` 可為路徑或任何可寫入的二進位串流（stdout、socket、HTTP 回應），不需支援 seek。
+    `cache_dir` 啟用投影片快取；`jobs` 大於 1 時平行輸出；`reproducible` 時相同輸入輸出相同位元組。
+    """
+    from . import deck
+
+    if isinstance(spec, (str, os.PathLike)):
+        spec = load_spec(spec)
+    problems = validate_spec(spec)
+    if problems:
+        raise ValueError('；'.join(problems))
+    cache = deck.SlideCache(cache_dir, cache_size) if cache_dir else None
+    return deck.write_deck(deck.compile_deck(spec), out, cache, jobs, reproducible)
@@ -0,0 +1,167 @@
+"""
+94CramManageSystem - 圖片素材
+
+截圖與圖片放進簡報前先經過處理，不直接嵌入原檔：
+  - 以來源檔內容的 SHA-256 識別圖片：同一檔案換了路徑、同一路徑換了內容都能正確判斷
+  - 依放置的 EMU 尺寸與 IMAGE_DPI 換算像素，縮小後重新編碼；不放大，來源已經
+    夠小時直接沿用原檔
+  - 結果依 (來源雜湊, 像素尺寸, 裁切方式) 存入磁碟快取，記憶體中另外保留最近
+    用過的結果。相同的圖片與尺寸必定得到相同位元組，python-pptx 依 SHA-1 只存
+    一份 media part，放在多少頁都一樣
+  - prepare_many 以 thread pool 平行處理（Pillow 縮放與編碼時會釋放 GIL）
+
+Pillow 是 python-pptx 的相依套件，不需另外安裝。
+"""
+
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import functools
+import hashlib
+import io
+import json
+import math
+import os
+import threading
+
+from PIL import Image
+
+ASSET_VERSION = 1
+IMAGE_DPI = 150
+EMU_PER_INCH = 914400
+FITS = ('contain', 'cover')
+MEMO_SIZE = 64
+JPEG_QUALITY = 88
+
+Source = namedtuple('Source', 'path digest width height format')
+Placement = namedtuple('Placement', 'left top width height')
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+# ====== 來源圖片 ======
+@functools.lru_cache(maxsize=1024)
+def _source(path, mtime_ns, size):
+    with open(path, 'rb') as f:
+        blob = f.read()
+    with Image.open(io.BytesIO(blob)) as image:
+        width, height = image.size
+        fmt = image.format
+    return Source(path, hashlib.sha256(blob).hexdigest(), width, height, fmt)
+
+
+def source(path):
+    """來源圖片的資訊（依路徑、修改時間與檔案大小快取，檔案變動時重新讀取）"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _source(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _crop_box(src, width, height):
+    """cover 時從來源中裁出的範圍（與放置框同比例、置中）"""
+    crop_w = min(src.width, src.height * width / height)
+    crop_h = crop_w * height / width
+    left, top = (src.width - crop_w) / 2, (src.height - crop_h) / 2
+    return left, top, left + crop_w, top + crop_h
+
+
+def target_pixels(src, width, height, fit='contain', dpi=IMAGE_DPI):
+    """放在 width × height（EMU）時需要的像素尺寸；不超過來源的解析度"""
+    box_w = max(1, math.ceil(width * dpi / EMU_PER_INCH))
+    box_h = max(1, math.ceil(height * dpi / EMU_PER_INCH))
+    if fit == 'cover':
+        left, top, right, bottom = _crop_box(src, width, height)
+        scale = min(1, box_w / (right - left))
+        return max(1, round((right - left) * scale)), max(1, round((bottom - top) * scale))
+    scale = min(1, box_w / src.width, box_h / src.height)
+    return max(1, round(src.width * scale)), max(1, round(src.height * scale))
+
+
+def placement(src, left, top, width, height, fit='contain'):
+    """圖片實際放置的範圍（EMU）：contain 時保持比例置中於放置框內，cover 時填滿"""
+    if fit == 'cover':
+        return Placement(left, top, width, height)
+    if src.width * height > src.height * width:
+        placed_h = round(width * src.height / src.width)
+        return Placement(left, top + (height - placed_h) // 2, width, placed_h)
+    placed_w = round(height * src.width / src.height)
+    return Placement(left + (width - placed_w) // 2, top, placed_w, height)
+
+
+# ====== 處理與快取 ======
+def asset_key(src, pixels, fit):
+    payload = json.dumps([ASSET_VERSION, src.digest, pixels, fit, JPEG_QUALITY])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _encode(src, pixels, fit):
+    """縮放並重新編碼；JPEG 來源輸出 JPEG，其餘輸出 PNG"""
+    if fit == 'contain' and pixels == (src.width, src.height) and src.format in ('PNG', 'JPEG'):
+        with open(src.path, 'rb') as f:
+            return f.read()
+    with Image.open(src.path) as image:
+        box = _crop_box(src, *pixels) if fit == 'cover' else None
+        image = image.resize(pixels, Image.LANCZOS, box=box, reducing_gap=3.0)
+    buf = io.BytesIO()
+    if src.format == 'JPEG':
+        image.convert('RGB').save(buf, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    else:
+        image.save(buf, 'PNG', optimize=True)
+    return buf.getvalue()
+
+
+def _remember(key, blob):
+    with _memo_lock:
+        _memo[key] = blob
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def preload(items, dpi=IMAGE_DPI):
+    """將主行程處理好的結果放入記憶體（子行程用）；`items` 為 ((path, width, height, fit), 位元組)"""
+    for (path, width, height, fit), blob in items:
+        src = source(path)
+        _remember(asset_key(src, target_pixels(src, width, height, fit, dpi), fit), blob)
+
+
+def prepare(path, width, height, fit='contain', cache=None, dpi=IMAGE_DPI):
+    """放在 width × height（EMU）的圖片位元組；依序查記憶體、磁碟快取（`cache`），都沒有才處理"""
+    if fit not in FITS:
+        raise ValueError(f'未知的裁切方式：{fit!r}')
+    src = source(path)
+    pixels = target_pixels(src, width, height, fit, dpi)
+    key = asset_key(src, pixels, fit)
+    with _memo_lock:
+        blob = _memo.get(key)
+        if blob is not None:
+            _memo.move_to_end(key)
+            return blob
+    blob = cache.get(key) if cache is not None else None
+    if blob is None:
+        blob = _encode(src, pixels, fit)
+        if cache is not None:
+            cache.put(key, blob)
+    _remember(key, blob)
+    return blob
+
+
+def prepare_many(requests, jobs=4, cache=None, dpi=IMAGE_DPI):
+    """平行處理多張圖片；`requests` 為 (path, width, height, fit)，重複的只處理一次"""
+    unique = list(dict.fromkeys(requests))
+    if jobs <= 1 or len(unique) <= 1:
+        return [prepare(*request, cache=cache, dpi=dpi) for request in unique]
+    with ThreadPoolExecutor(max_workers=min(jobs, len(unique))) as pool:
+        return list(pool.map(lambda request: prepare(*request, cache=cache, dpi=dpi), unique))
+
+
+def mime_type(blob):
+    """處理後的圖片只會是 PNG 或 JPEG"""
+    return 'image/png' if blob.startswith(b'\x89PNG') else 'image/jpeg'
+
+
+def data_uri(path, width, height, fit='contain', dpi=IMAGE_DPI):
+    """內嵌於 HTML／SVG 的 data: URI"""
+    blob = prepare(path, width, height, fit, dpi=dpi)
+    return f'data:{mime_type(blob)};base64,{base64.b64encode(blob).decode("ascii")}'
@@ -0,0 +1,249 @@
+"""
+94CramManageSystem - 簡報生成器效能測試
+
+不依賴網路與額外套件的獨立測試程式，量測：
+  - 工具函數：add_text / add_para（屬性設定版本與 XML 範本快速路徑對照）、
+    add_icon_card、add_stat_card、slide_header
+  - 每一頁版型的編譯（spec → SlidePlan）與輸出（SlidePlan → slide）時間
+  - prs.save 序列化
+  - 整份簡報在 1×、10×、100× 頁數下的端到端時間
+
+執行：python -m cramdeck.bench
+結果可用 --json 寫成 JSON，再以 --compare 與另一次（例如前一個 commit）的結果對照。
+"""
+
+import argparse
+import datetime
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import pptx
+
+from . import deck as g
+from .spec import BASE_DIR, DEFAULT_SPEC, load_spec
+
+SAMPLE_TEXT = '紙本名冊、Excel 表格散落各處\n學員資料不統一，查詢耗時'
+
+
+def _rate(fn, slides, per_slide):
+    """在 `slides` 頁上各呼叫 `fn` `per_slide` 次，回傳每秒次數"""
+    start = time.perf_counter()
+    for slide in slides:
+        for i in range(per_slide):
+            fn(slide, i)
+    return len(slides) * per_slide / (time.perf_counter() - start)
+
+
+def _timings(fn, repeat):
+    """執行 `fn` `repeat` 次，回傳秒數統計（best / median / mean）"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {'best': min(samples), 'median': statistics.median(samples),
+            'mean': statistics.fmean(samples), 'repeat': repeat}
+
+
+def _blank_slides(n_slides):
+    """建立 `n_slides` 頁空白投影片（與 render_slide 相同，快取最大 shape id）"""
+    prs = g.new_presentation()
+    slides = [prs.slides.add_slide(g.blank_layout(prs)) for _ in range(n_slides)]
+    for slide in slides:
+        slide.shapes.turbo_add_enabled = True
+    return slides
+
+
+# ====== 工具函數 ======
+def bench_text(n_slides=20, per_slide=100):
+    """add_text 與 add_para 前後對照（shapes/sec、paragraphs/sec）"""
+    results = {}
+    for name, add_text, add_para in (
+        ('setters', g._add_text_setters, g._add_para_setters),
+        ('fast', g.add_text, g.add_para),
+    ):
+        slides = _blank_slides(n_slides)
+        results[f'add_text[{name}]'] = _rate(
+            lambda slide, i: add_text(slide, g.Inches(1), g.Inches(0.1 * i), g.Inches(3), g.Inches(0.4),
+                                      SAMPLE_TEXT, font_size=13, color=g.COLORS['text_light']),
+            slides, per_slide)
+        frames = {id(slide): add_text(slide, 0, 0, g.Inches(3), g.Inches(3), '').text_frame for slide in slides}
+        results[f'add_para[{name}]'] = _rate(
+            lambda slide, i: add_para(frames[id(slide)], SAMPLE_TEXT, font_size=13),
+            slides, per_slide)
+    return results
+
+
+def bench_helpers(n_slides=20, per_slide=50):
+    """複合工具函數（calls/sec）"""
+    cases = {
+        'add_icon_card': lambda slide, i: g.add_icon_card(
+            slide, g.Inches(0.6), g.Inches(1.6), g.Inches(3.8), g.Inches(2.4), '📋', '學員管理',
+            '學員資料、班級、家長聯絡一站整合', g.COLORS['white'], g.COLORS['primary']),
+        'add_stat_card': lambda slide, i: g.add_stat_card(
+            slide, g.Inches(0.6), g.Inches(1.6), '98%', '出勤率', g.COLORS['primary']),
+        'slide_header': lambda slide, i: g.slide_header(slide, '課堂點名', '點名、成績、聯絡簿一次完成'),
+    }
+    return {name: _rate(fn, _blank_slides(n_slides), per_slide) for name, fn in cases.items()}
+
+
+# ====== 逐頁版型 ======
+def bench_slides(spec, repeat=5):
+    """每一頁的編譯與輸出時間（秒）"""
+    deck = g.compile_deck(spec)
+    results = []
+    for i, (data, plan) in enumerate(zip(spec['slides'], deck.slides), 1):
+        prs = g.new_presentation(deck.width, deck.height)
+        results.append({
+            'slide': i,
+            'layout': data['layout'],
+            'shapes': len(plan.shapes),
+            'compile': _timings(lambda: g.compile_slide(spec, data), repeat),
+            'render': _timings(lambda: g.render_slide(prs, plan), repeat),
+        })
+    return results
+
+
+# ====== 序列化 ======
+def bench_save(spec, repeat=5):
+    """prs.save 序列化時間與輸出大小"""
+    prs = g.render_deck(g.compile_deck(spec))
+    size = 0
+
+    def save():
+        nonlocal size
+        buf = io.BytesIO()
+        prs.save(buf)
+        size = buf.tell()
+
+    result = _timings(save, repeat)
+    result['bytes'] = size
+    return result
+
+
+# ====== 整份簡報 ======
+def bench_scales(spec, scales=(1, 10, 100), repeat=3):
+    """將 spec 的頁面重複 1×、10×、100× 後端到端輸出（編譯 + 輸出 + 存檔）"""
+    results = {}
+    for scale in scales:
+        scaled = dict(spec, slides=spec['slides'] * scale)
+
+        def build():
+            g.write_deck(g.compile_deck(scaled), io.BytesIO())
+
+        result = _timings(build, repeat if scale < 100 else 1)
+        result['slides'] = len(scaled['slides'])
+        result['slides_per_sec'] = result['slides'] / result['best']
+        results[f'{scale}x'] = result
+    return results
+
+
+# ====== 報告 ======
+def environment():
+    """記錄執行環境，方便跨 commit 對照"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'python_pptx': pptx.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def run(spec, scales=(1, 10, 100), repeat=5, n_slides=20, per_slide=100):
+    """執行全部測試，回傳可寫成 JSON 的結果"""
+    return {
+        'env': environment(),
+        'text': bench_text(n_slides, per_slide),
+        'helpers': bench_helpers(n_slides, per_slide // 2),
+        'slides': bench_slides(spec, repeat),
+        'save': bench_save(spec, repeat),
+        'scales': bench_scales(spec, scales, max(1, repeat // 2)),
+    }
+
+
+def _flatten(report):
+    """將結果攤平成 {指標名稱: (數值, 越大越好)}，供對照用"""
+    flat = {}
+    for name, rate in {**report['text'], **report['helpers']}.items():
+        flat[f'{name} /s'] = (rate, True)
+    for row in report['slides']:
+        for phase in ('compile', 'render'):
+            flat[f'slide {row["slide"]:>2} {row["layout"]} {phase}'] = (row[phase]['best'], False)
+    flat['prs.save'] = (report['save']['best'], False)
+    for scale, result in report['scales'].items():
+        flat[f'deck {scale}'] = (result['best'], False)
+    return flat
+
+
+def print_report(report):
+    for name, rate in report['text'].items():
+        print(f'{name:<20} {rate:>12,.0f} /s')
+    for helper in ('add_text', 'add_para'):
+        print(f'{helper} 加速 {report["text"][f"{helper}[fast]"] / report["text"][f"{helper}[setters]"]:.1f}×')
+    for name, rate in report['helpers'].items():
+        print(f'{name:<20} {rate:>12,.0f} /s')
+
+    print(f'\n{"頁":>3} {"版型":<14} {"形狀":>5} {"編譯 ms":>9} {"輸出 ms":>9}')
+    for row in report['slides']:
+        print(f'{row["slide"]:>3} {row["layout"]:<14} {row["shapes"]:>5} '
+              f'{row["compile"]["best"] * 1000:>9.2f} {row["render"]["best"] * 1000:>9.2f}')
+
+    save = report['save']
+    print(f'\nprs.save {save["best"] * 1000:.1f} ms（{save["bytes"]:,} bytes）')
+    for scale, result in report['scales'].items():
+        print(f'deck {scale:<5} {result["slides"]:>5} 頁 {result["best"]:>8.2f} s '
+              f'{result["slides_per_sec"]:>8.1f} 頁/s')
+
+
+def print_compare(report, baseline):
+    """與基準結果對照，列出每個指標的變化（正值代表變快）"""
+    current, base = _flatten(report), _flatten(baseline)
+    print(f'\n對照 {baseline["env"].get("commit") or "基準"} → {report["env"].get("commit") or "目前"}')
+    for name, (value, higher_is_better) in current.items():
+        if name not in base or not base[name][0] or not value:
+            continue
+        ratio = value / base[name][0] if higher_is_better else base[name][0] / value
+        print(f'{name:<36} {(ratio - 1) * 100:>+7.1f}%')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='94Cram 簡報生成器效能測試')
+    parser.add_argument('--spec', default=DEFAULT_SPEC, help='deck spec JSON 路徑')
+    parser.add_argument('--slides', type=int, default=20, help='工具函數測試頁數（預設 20）')
+    parser.add_argument('--per-slide', type=int, default=100, help='每頁形狀數（預設 100）')
+    parser.add_argument('--repeat', type=int, default=5, help='每項重複次數（預設 5）')
+    parser.add_argument('--scales', default='1,10,100', help='整份簡報的頁數倍率（預設 1,10,100）')
+    parser.add_argument('--json', metavar='PATH', help='將結果寫成 JSON（- 代表 stdout）')
+    parser.add_argument('--compare', metavar='PATH', help='與先前的 JSON 結果對照')
+    args = parser.parse_args(argv)
+
+    scales = tuple(int(s) for s in args.scales.split(',') if s)
+    report = run(load_spec(args.spec), scales, args.repeat, args.slides, args.per_slide)
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f'\n📝 結果已寫入：{args.json}')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+94CramManageSystem - 圖表資料
+
+原生 PowerPoint 圖表（長條、漏斗、折線、環圈）的資料整理，只用標準函式庫：
+  - aggregate：欄式資料（dict of 等長序列，可為 list、tuple 或 NumPy 陣列）
+    依分類欄一次走訪完成加總 / 計數 / 平均，結果可直接作為圖表的分類與數列；
+    分校數據（snapshot.load_figures）也以此彙總
+  - chart_marks：把圖表拆成矩形、折線、扇環等基本圖形，供縮圖與網頁版繪製；
+    .pptx 仍輸出原生圖表（見 deck.add_chart）
+
+NumPy 不是本專案的相依套件；圖表的資料量（數個到數百個分類）以單次走訪
+的 dict 累加即可，傳入 NumPy 陣列時逐值轉成 float。
+"""
+
+from collections import namedtuple
+import math
+
+CHART_TYPES = ('bar', 'funnel', 'line', 'donut')
+AGGREGATES = ('sum', 'count', 'mean')
+
+Mark = namedtuple('Mark', 'kind color geometry')
+
+
+def aggregate(columns, by, value=None, how='sum', order=None):
+    """依 `by` 欄分組彙總 `value` 欄，回傳 (分類 tuple, 數值 tuple)
+
+    `how` 為 'sum'、'count' 或 'mean'（'count' 不需要 `value`）；`order` 指定
+    分類順序（缺少的分類補 0），未指定時依首次出現的順序。
+    """
+    if how not in AGGREGATES:
+        raise ValueError(f'不支援的彙總方式：{how!r}')
+    keys = columns[by]
+    values = [1] * len(keys) if how == 'count' else columns[value]
+    totals, counts = {}, {}
+    for key, number in zip(keys, values):
+        totals[key] = totals.get(key, 0) + float(number)
+        counts[key] = counts.get(key, 0) + 1
+    categories = tuple(order) if order is not None else tuple(totals)
+    if how == 'mean':
+        result = tuple(totals[key] / counts[key] if key in counts else 0.0 for key in categories)
+    else:
+        result = tuple(totals.get(key, 0.0) for key in categories)
+    return categories, result
+
+
+def normalize_series(series):
+    """數列整理成 ((名稱, (數值, …)), …)；`series` 可為 dict 或 (名稱, 數值) 序列"""
+    items = series.items() if isinstance(series, dict) else series
+    return tuple((str(name), tuple(float(v) for v in values)) for name, values in items)
+
+
+# ====== 基本圖形 ======
+# geometry 皆以圖表框左上角為原點（EMU）：
+#   rect: (left, top, width, height)
+#   line: ((x, y), …)
+#   wedge: (cx, cy, outer, inner, start, end)，角度以 12 點鐘方向為 0、順時針
+def _peak(values):
+    peak = max((v for v in values if v > 0), default=0)
+    return peak or 1
+
+
+def chart_marks(props, width, height):
+    """將圖表 Shape 的 props 拆成 Mark 清單"""
+    chart_type = props['chart_type']
+    categories, series, colors = props['categories'], props['series'], props['colors']
+    if not categories or not series:
+        return []
+    marks = []
+    if chart_type == 'funnel':
+        values = series[0][1]
+        peak = _peak(values)
+        row = height / len(categories)
+        for i, v in enumerate(values):
+            bar = width * max(v, 0) / peak
+            marks.append(Mark('rect', colors[i % len(colors)],
+                              ((width - bar) / 2, i * row + row * 0.1, bar, row * 0.8)))
+    elif chart_type == 'donut':
+        values = [max(v, 0) for v in series[0][1]]
+        total = sum(values) or 1
+        radius = min(width, height) * 0.45
+        start = 0.0
+        for i, v in enumerate(values):
+            end = start + 360 * v / total
+            marks.append(Mark('wedge', colors[i % len(colors)],
+                              (width / 2, height / 2, radius, radius * 0.5, start, end)))
+            start = end
+    elif chart_type == 'bar':
+        peak = _peak([v for _, values in series for v in values])
+        plot = height * 0.85
+        slot = width / len(categories)
+        bar = slot * 0.7 / len(series)
+        for s, (_, values) in enumerate(series):
+            for i, v in enumerate(values):
+                h = plot * max(v, 0) / peak
+                color = colors[(i if len(series) == 1 else s) % len(colors)]
+                marks.append(Mark('rect', color, (i * slot + slot * 0.15 + s * bar, plot - h, bar, h)))
+    elif chart_type == 'line':
+        peak = _peak([v for _, values in series for v in values])
+        plot = height * 0.85
+        slot = width / len(categories)
+        for s, (_, values) in enumerate(series):
+            points = tuple((i * slot + slot / 2, plot - plot * max(v, 0) / peak) for i, v in enumerate(values))
+            marks.append(Mark('line', colors[s % len(colors)], points))
+    else:
+        raise ValueError(f'未知的圖表種類：{chart_type!r}')
+    return marks
+
+
+def wedge_path(cx, cy, outer, inner, start, end):
+    """扇環的 SVG path（座標同 chart_marks）"""
+    if end - start >= 359.999:
+        # 完整圓環：以兩個半圓組成
+        return (f'M{cx:.0f},{cy - outer:.0f}A{outer:.0f},{outer:.0f} 0 1 1 {cx:.0f},{cy + outer:.0f}'
+                f'A{outer:.0f},{outer:.0f} 0 1 1 {cx:.0f},{cy - outer:.0f}Z'
+                f'M{cx:.0f},{cy - inner:.0f}A{inner:.0f},{inner:.0f} 0 1 0 {cx:.0f},{cy + inner:.0f}'
+                f'A{inner:.0f},{inner:.0f} 0 1 0 {cx:.0f},{cy - inner:.0f}Z')
+    large = 1 if end - start > 180 else 0
+
+    def point(radius, angle):
+        rad = math.radians(angle)
+        return cx + radius * math.sin(rad), cy - radius * math.cos(rad)
+
+    (x0, y0), (x1, y1) = point(outer, start), point(outer, end)
+    (x2, y2), (x3, y3) = point(inner, end), point(inner, start)
+    return (f'M{x0:.0f},{y0:.0f}A{outer:.0f},{outer:.0f} 0 {large} 1 {x1:.0f},{y1:.0f}'
+            f'L{x2:.0f},{y2:.0f}A{inner:.0f},{inner:.0f} 0 {large} 0 {x3:.0f},{y3:.0f}Z')
+
+
+def chart_svg(props, width, height):
+    """圖表的 SVG 元素（座標以圖表框左上角為原點，EMU）"""
+    out = []
+    for kind, color, geometry in chart_marks(props, width, height):
+        if kind == 'rect':
+            x, y, w, h = geometry
+            out.append(f'<rect x="{x:.0f}" y="{y:.0f}" width="{w:.0f}" height="{h:.0f}" fill="#{color}"/>')
+        elif kind == 'line':
+            points = ' '.join(f'{x:.0f},{y:.0f}' for x, y in geometry)
+            out.append(f'<polyline points="{points}" fill="none" stroke="#{color}" '
+                       f'stroke-width="{height * 0.02:.0f}" stroke-linejoin="round"/>')
+        else:
+            out.append(f'<path d="{wedge_path(*geometry)}" fill="#{color}" fill-rule="evenodd"/>')
+    return ''.join(out)
@@ -0,0 +1,188 @@
+"""
+94CramManageSystem - 簡報生成器命令列
+
+bot-gateway 會即時呼叫本程式，因此只在真正輸出簡報時才 import deck（python-pptx、lxml），
+--help、--list-slides、--check 只用標準函式庫，幾十毫秒內即可回應。
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+
+from .spec import BASE_DIR, DEFAULT_OUTPUT, DEFAULT_SPEC, REPORT_SPEC, list_slides, load_spec, validate_spec
+
+PROFILE_ENV = 'PPT_PROFILE'
+# 環境變數只能開啟剖析（只印表格）；JSON 報告路徑一律由 --profile JSON 指定
+_TRUTHY = ('1', 'true', 'yes', 'on')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='cramdeck', description='94Cram 行銷簡報生成器')
+    parser.add_argument('--spec', help='deck spec JSON 路徑（預設為行銷簡報；--reports 時為學員報告範本）')
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT, help='輸出的 .pptx 路徑（- 代表 stdout）')
+    parser.add_argument('--format', choices=('pptx', 'html'), default='pptx',
+                        help='單份輸出的格式：pptx 或內嵌 CSS 與圖片的單一 HTML 網頁（預設 pptx）')
+    parser.add_argument('--html-media', action='store_true',
+                        help='HTML 的圖片另存到輸出檔旁的 <檔名>_files/ 目錄（HTML 較小，但須連同目錄一起提供）')
+    parser.add_argument('--list-slides', action='store_true', help='列出 spec 中的頁面後結束')
+    parser.add_argument('--check', action='store_true', help='只檢查 spec 結構，不輸出簡報')
+    parser.add_argument('--lint', action='store_true',
+                        help='輸出前檢查版面（文字重疊、超出投影片、超出卡片），有問題時不輸出')
+    parser.add_argument('--cache', metavar='DIR', help='啟用投影片快取，存放於 DIR')
+    parser.add_argument('--cache-size', type=int, default=512, help='快取最多保留的頁數（預設 512）')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N', help='平行輸出的行程數（預設 1）')
+    parser.add_argument('--batch', metavar='SNAPSHOT',
+                        help='依分校數據快照（SQLite 檔或 CSV 目錄）為每個分校各輸出一份簡報')
+    parser.add_argument('--reports', metavar='SNAPSHOT',
+                        help='依分校數據快照為每位在籍學員輸出一份學習報告；中斷後重新執行會略過已完成的學員')
+    parser.add_argument('--out-dir', default=os.path.join(BASE_DIR, 'decks_out'), help='批次輸出目錄')
+    parser.add_argument('--as-of', metavar='YYYY-MM-DD', help='批次統計的基準日（預設今天）')
+    parser.add_argument('--reproducible', action='store_true',
+                        help='固定 zip 時間戳與文件日期（SOURCE_DATE_EPOCH），相同輸入輸出相同位元組')
+    parser.add_argument('--merge-text', action='store_true',
+                        help='將同一欄上下相疊的文字框合併成多段落文字框（依估計的行高，搭配 --lint 檢查位置）')
+    parser.add_argument('--artifacts', metavar='DIR',
+                        help='可重現輸出並依輸入雜湊存入 DIR；已有相同雜湊的成品時直接複製，不重新輸出')
+    parser.add_argument('--thumbnails', metavar='DIR', help='另外將每頁縮圖輸出到 DIR（slide-01.svg …）')
+    parser.add_argument('--thumb-format', choices=('svg', 'png'), default='svg', help='縮圖格式（預設 svg）')
+    parser.add_argument('--thumb-width', type=int, default=480, metavar='PX', help='縮圖寬度（預設 480 px）')
+    parser.add_argument('--thumb-font', metavar='TTF', help='PNG 縮圖繪製文字用的字型檔（未指定時文字以色條表示）')
+    parser.add_argument('--profile', nargs='?', const='', metavar='JSON',
+                        help=f'逐頁剖析形狀數、XML 大小、耗時與記憶體，可指定 JSON 報告路徑'
+                             f'（或設定 {PROFILE_ENV}=1，只印出表格）')
+    args = parser.parse_args(argv)
+
+    if args.spec is None:
+        args.spec = REPORT_SPEC if args.reports else DEFAULT_SPEC
+    spec = load_spec(args.spec)
+    problems = validate_spec(spec)
+    if problems:
+        for problem in problems:
+            print(f'❌ {problem}', file=sys.stderr)
+        return 1
+    if args.list_slides:
+        for index, layout, title in list_slides(spec):
+            print(f'{index:>3}  {layout:<14} {title}')
+        return 0
+    if args.check:
+        print(f'✅ {args.spec}：{len(spec["slides"])} 頁，格式正確')
+        return 0
+
+    from . import deck, icons
+
+    try:
+        icons.emoji_font()
+    except OSError as e:
+        print(f'❌ {e}', file=sys.stderr)
+        return 1
+    if args.batch or args.reports:
+        # 批次的各份簡報在子行程中編譯，這裡只能確認是否找得到 emoji 字型
+        warning = icons.fallback_warning()
+        if warning:
+            print(warning, file=sys.stderr)
+
+    profile = args.profile is not None or os.environ.get(PROFILE_ENV, '').strip().lower() in _TRUTHY
+    profiler = deck.SlideProfiler() if profile else None
+    if profiler is not None:
+        # 剖析只在本行程內進行，且每頁都要實際輸出
+        args.jobs = 1
+        args.cache = None
+        args.artifacts = None
+
+    if args.format == 'html' and args.output == DEFAULT_OUTPUT:
+        args.output = os.path.splitext(DEFAULT_OUTPUT)[0] + '.html'
+    if args.html_media and (args.format != 'html' or args.output == '-'):
+        print('❌ --html-media 只能搭配 --format html 並輸出到檔案', file=sys.stderr)
+        return 1
+    if args.output == '-':
+        # 簡報直接串流到 stdout，訊息改寫到 stderr
+        output, log = sys.stdout.buffer, sys.stderr
+    else:
+        output, log = args.output, sys.stdout
+
+    with profiler or contextlib.nullcontext():
+        if args.batch:
+            count = 0
+            try:
+                for output in deck.build_branch_decks(spec, args.batch, args.out_dir, args.as_of,
+                                                      args.cache, args.cache_size, args.jobs,
+                                                      args.reproducible or bool(args.artifacts), args.lint):
+                    count += 1
+                    print(f'✅ {output}')
+            except ValueError as e:
+                print(f'❌ {e}', file=sys.stderr)
+                return 1
+            print(f'📦 共輸出 {count} 份分校簡報')
+        elif args.reports:
+            built = skipped = 0
+            try:
+                for output, fresh in deck.build_student_reports(spec, args.reports, args.out_dir, args.as_of,
+                                                                jobs=args.jobs, reproducible=args.reproducible,
+                                                                lint=args.lint):
+                    if fresh:
+                        built += 1
+                        print(f'✅ {output}')
+                    else:
+                        skipped += 1
+            except ValueError as e:
+                print(f'❌ {e}', file=sys.stderr)
+                return 1
+            print(f'📦 共輸出 {built} 份學員報告，略過 {skipped} 份已完成的報告')
+        else:
+            try:
+                plan = deck.compile_deck(spec)
+            except ValueError as e:
+                print(f'❌ {e}', file=sys.stderr)
+                return 1
+            warning = icons.fallback_warning(plan.slides)
+            if warning:
+                print(warning, file=sys.stderr)
+            if args.lint:
+                issues = deck.layout_lint.lint_deck(plan)
+                if args.merge_text:
+                    issues += deck.merge_drift(plan)
+                for issue in issues:
+                    print(f'❌ {deck.layout_lint.format_issue(issue)}', file=sys.stderr)
+                if issues:
+                    return 1
+            cache = deck.SlideCache(args.cache, args.cache_size) if args.cache else None
+            if args.format == 'html':
+                from . import web
+
+                size = web.write_html(plan, output, spec.get('name', ''), external_media=args.html_media)
+            elif args.artifacts:
+                key, hit = deck.write_artifact(plan, output, args.artifacts, cache, jobs=args.jobs,
+                                               merge_text=args.merge_text)
+            else:
+                deck.write_deck(plan, output, cache, jobs=args.jobs, reproducible=args.reproducible,
+                                merge_text=args.merge_text)
+            if output is sys.stdout.buffer:
+                output.flush()
+            print(f'✅ 簡報已生成：{args.output}', file=log)
+            print(f'📊 共 {len(plan.slides)} 頁投影片', file=log)
+            if args.format == 'html':
+                print(f'🌐 HTML {size / 1024:.1f} KB', file=log)
+                if args.html_media:
+                    print(f'🖼️  圖片目錄：{web.media_files(output).directory}（須與 HTML 一起提供）', file=log)
+            elif args.artifacts:
+                print(f'🔑 {key}（{"沿用既有成品" if hit else "已存入成品目錄"}）', file=log)
+            if args.thumbnails:
+                from . import thumbnail
+
+                thumb_cache = (deck.SlideCache(args.cache, args.cache_size, suffix=f'.{args.thumb_format}')
+                               if args.cache else None)
+                paths = thumbnail.render_thumbnails(plan, args.thumbnails, args.thumb_format, args.thumb_width,
+                                                    args.jobs, thumb_cache, args.thumb_font)
+                print(f'🖼️  縮圖 {len(paths)} 張：{args.thumbnails}', file=log)
+            if cache is not None:
+                print(f'♻️  快取命中 {cache.hits} 頁，重建 {cache.misses} 頁', file=log)
+
+    if profiler is not None:
+        with contextlib.redirect_stdout(log):
+            print()
+            profiler.print_table()
+            if args.profile:
+                profiler.write_json(args.profile)
+                print(f'📝 剖析報告已寫入：{args.profile}')
+    return 0
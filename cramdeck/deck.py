@@ -0,0 +1,2268 @@
+"""
+94CramManageSystem - 行銷推銷簡報生成器
+莫蘭迪色系 + 現代風格 PPT
+
+簡報內容放在 decks/*.json 的 deck spec；本模組將 spec 編譯成記憶體中的
+形狀計畫（DeckPlan），再透過工具函數輸出成 .pptx。python-pptx 與 lxml
+都在這裡載入，CLI 只在真正輸出簡報時才 import 本模組。
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+import contextlib
+import copy
+import copyreg
+import datetime
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+import pptx
+
+from pptx import Presentation
+from pptx.util import Inches, Pt, Emu, lazyproperty
+from pptx.chart.data import CategoryChartData
+from pptx.chart.xlsx import CategoryWorkbookWriter
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LABEL_POSITION, XL_LEGEND_POSITION, XL_MARKER_STYLE
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.enum.text import PP_ALIGN
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.serialized import PackageWriter
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.oxml.simpletypes import ST_TextSpacingPoint
+from pptx.shapes.autoshape import Shape as AutoShape
+from pptx.text.text import _Paragraph
+
+from . import assets
+from . import charts
+from . import geometry as geo
+from . import icons
+from . import lint as layout_lint
+from . import snapshot as branch_snapshot
+from . import textfit
+from .spec import resolve_asset
+
+
+# ====== 莫蘭迪色系配色 ======
+COLORS = {
+    'primary':      RGBColor(0x4A, 0x6B, 0x8A),   # 深莫蘭迪藍
+    'secondary':    RGBColor(0x8B, 0x9D, 0x83),   # 莫蘭迪綠
+    'accent':       RGBColor(0xC4, 0x8B, 0x6A),   # 莫蘭迪橘
+    'accent2':      RGBColor(0xA0, 0x7E, 0x93),   # 莫蘭迪紫
+    'dark':         RGBColor(0x2D, 0x3A, 0x4A),   # 深色背景
+    'dark2':        RGBColor(0x3A, 0x4A, 0x5C),   # 次深色
+    'light':        RGBColor(0xF5, 0xF0, 0xEB),   # 淺米色
+    'light2':       RGBColor(0xE8, 0xE0, 0xD8),   # 次淺色
+    'white':        RGBColor(0xFF, 0xFF, 0xFF),
+    'text_dark':    RGBColor(0x2D, 0x2D, 0x2D),
+    'text_light':   RGBColor(0x6B, 0x6B, 0x6B),
+    'red':          RGBColor(0xC0, 0x5C, 0x5C),   # 莫蘭迪紅
+    'gold':         RGBColor(0xC4, 0xA3, 0x5A),   # 莫蘭迪金
+    'green_check':  RGBColor(0x5A, 0x8C, 0x6A),   # 打勾綠
+    'red_cross':    RGBColor(0xB0, 0x5A, 0x5A),   # 叉叉紅
+    'gradient_top': RGBColor(0x2D, 0x3A, 0x4A),
+    'gradient_bot': RGBColor(0x4A, 0x6B, 0x8A),
+}
+
+# 比較表中「打勾」與總計列的淡綠底色
+HIGHLIGHT_BG = RGBColor(0xEE, 0xF5, 0xF0)
+
+# 平行輸出時 SlidePlan 要送進子行程：RGBColor 的建構子需要 r, g, b 三個參數，
+# Inches / Pt 則會把 EMU 整數再換算一次，預設的 pickle 都無法正確還原。
+copyreg.pickle(RGBColor, lambda c: (RGBColor, tuple(c)))
+copyreg.pickle(Inches, lambda v: (Emu, (int(v),)))
+copyreg.pickle(Pt, lambda v: (Emu, (int(v),)))
+
+# ====== 佈景主題配色 ======
+# 最常用的 10 個顏色編進佈景主題的 clrScheme，形狀與文字改以 schemeClr 參照；
+# 換品牌色只需改寫 ppt/theme/theme1.xml 一個 part。其餘顏色仍寫 srgbClr，
+# 並列在 custClrLst 中，PowerPoint 的色盤上也看得到完整的莫蘭迪色系。
+# hlink / folHlink 保留給超連結，不放品牌色。
+THEME_NAME = '94Cram 莫蘭迪'
+
+# (clrScheme 色槽, 投影片中的參照名稱（經 slide master 的 clrMap 對應）, COLORS key)
+THEME_COLORS = (
+    ('dk1', 'tx1', 'text_dark'),
+    ('lt1', 'bg1', 'white'),
+    ('dk2', 'tx2', 'dark'),
+    ('lt2', 'bg2', 'light2'),
+    ('accent1', 'accent1', 'primary'),
+    ('accent2', 'accent2', 'secondary'),
+    ('accent3', 'accent3', 'accent'),
+    ('accent4', 'accent4', 'green_check'),
+    ('accent5', 'accent5', 'red_cross'),
+    ('accent6', 'accent6', 'text_light'),
+)
+
+_SCHEME_REFS = {str(COLORS[key]): ref for _, ref, key in THEME_COLORS}
+
+
+def _color_xml(color, children=''):
+    """顏色在佈景主題中時回傳 <a:schemeClr>，否則回傳 <a:srgbClr>"""
+    ref = _SCHEME_REFS.get(str(color))
+    tag, val = ('schemeClr', ref) if ref else ('srgbClr', color)
+    if children:
+        return f'<a:{tag} val="{val}">{children}</a:{tag}>'
+    return f'<a:{tag} val="{val}"/>'
+
+
+def _set_color(color_format, color):
+    """以 python-pptx 的 ColorFormat 設定顏色（佈景主題色用 theme_color）"""
+    ref = _SCHEME_REFS.get(str(color))
+    if ref is None:
+        color_format.rgb = color
+    else:
+        color_format.theme_color = MSO_THEME_COLOR.from_xml(ref)
+
+
+@functools.lru_cache(maxsize=None)
+def _theme_blob(blob):
+    """將預設範本的佈景主題改寫為莫蘭迪 clrScheme 與 custClrLst"""
+    theme = etree.fromstring(blob)
+    scheme = theme.find(f'{qn("a:themeElements")}/{qn("a:clrScheme")}')
+    scheme.set('name', THEME_NAME)
+    for slot, _, key in THEME_COLORS:
+        el = scheme.find(qn(f'a:{slot}'))
+        el.clear()
+        etree.SubElement(el, qn('a:srgbClr')).set('val', str(COLORS[key]))
+
+    cust = theme.find(qn('a:custClrLst'))
+    if cust is not None:
+        theme.remove(cust)
+    cust = etree.Element(qn('a:custClrLst'))
+    seen = set(_SCHEME_REFS)
+    for name, color in (*COLORS.items(), ('highlight_bg', HIGHLIGHT_BG)):
+        if str(color) not in seen:
+            seen.add(str(color))
+            el = etree.SubElement(cust, qn('a:custClr'), name=name)
+            etree.SubElement(el, qn('a:srgbClr')).set('val', str(color))
+    ext_lst = theme.find(qn('a:extLst'))
+    if ext_lst is not None:
+        ext_lst.addprevious(cust)
+    else:
+        theme.append(cust)
+    return etree.tostring(theme, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+# ====== 工具函數 ======
+def add_bg(slide, color):
+    """設定整頁背景色"""
+    bg = slide.background
+    fill = bg.fill
+    fill.solid()
+    _set_color(fill.fore_color, color)
+
+def add_rect(slide, left, top, width, height, color, alpha=None):
+    """加入矩形色塊（alpha 為不透明度 %）"""
+    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, height)
+    _apply_fill(shape, color, alpha)
+    return shape
+
+def add_rounded_rect(slide, left, top, width, height, color, alpha=None):
+    """加入圓角矩形"""
+    shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height)
+    _apply_fill(shape, color, alpha)
+    return shape
+
+def add_text(slide, left, top, width, height, text, font_size=18, color=COLORS['text_dark'],
+             bold=False, alignment=PP_ALIGN.LEFT, font_name='Microsoft JhengHei'):
+    """加入文字框"""
+    shapes = slide.shapes
+    shape_id = shapes._next_shape_id
+    sp = copy.deepcopy(_textbox_template(font_size, color, bold, alignment, font_name))
+    nvSpPr, spPr, txBody = sp
+    cNvPr = nvSpPr[0]
+    cNvPr.set('id', str(shape_id))
+    cNvPr.set('name', f'TextBox {shape_id - 1}')
+    off, ext = spPr[0]
+    off.set('x', '%d' % left)
+    off.set('y', '%d' % top)
+    ext.set('cx', '%d' % width)
+    ext.set('cy', '%d' % height)
+    _append_runs(txBody[2], text)
+    shapes.element.insert_element_before(sp, 'p:extLst')
+    return AutoShape(sp, shapes)
+
+def add_para(text_frame, text, font_size=16, color=COLORS['text_dark'], bold=False,
+             alignment=PP_ALIGN.LEFT, space_before=Pt(4), space_after=Pt(4), font_name='Microsoft JhengHei'):
+    """在既有 text_frame 加入段落"""
+    p = copy.deepcopy(_para_template(font_size, color, bold, alignment, space_before, space_after, font_name))
+    _append_runs(p, text)
+    text_frame._txBody.append(p)
+    return _Paragraph(p, text_frame)
+
+def add_circle(slide, left, top, size, color, alpha=None):
+    """加入圓形"""
+    shape = slide.shapes.add_shape(MSO_SHAPE.OVAL, left, top, size, size)
+    _apply_fill(shape, color, alpha)
+    return shape
+
+def add_icon_card(slide, left, top, width, height, icon_text, title, desc, bg_color, icon_color):
+    """加入帶圖標的卡片"""
+    plan = SlidePlan('icon_card')
+    plan.icon_card(left, top, width, height, icon_text, title, desc, bg_color, icon_color)
+    return emit_shapes(slide, plan.shapes)[0]
+
+def add_stat_card(slide, left, top, number, label, color):
+    """加入數據統計卡片"""
+    plan = SlidePlan('stat_card')
+    plan.stat_card(left, top, number, label, color)
+    return emit_shapes(slide, plan.shapes)[0]
+
+def add_feature_bullet(text_frame, icon, text, font_size=15, color=COLORS['text_dark']):
+    """加入功能要點"""
+    p = text_frame.add_paragraph()
+    p.text = f"{icon}  {text}"
+    p.font.size = Pt(font_size)
+    _set_color(p.font.color, color)
+    p.font.name = 'Microsoft JhengHei'
+    p.space_before = Pt(6)
+    p.space_after = Pt(2)
+    return p
+
+def slide_header(slide, title, subtitle=None):
+    """統一頁面標題"""
+    presentation = slide.part.package.presentation_part.presentation
+    plan = SlidePlan('header', width=presentation.slide_width)
+    plan.header(title, subtitle)
+    emit_shapes(slide, plan.shapes)
+
+def add_image(slide, left, top, width, height, path, fit='contain'):
+    """加入圖片：依放置尺寸縮小後嵌入（見 assets）；contain 保持比例置中，cover 裁切填滿"""
+    place = assets.placement(assets.source(path), left, top, width, height, fit)
+    blob = assets.prepare(path, width, height, fit)
+    return slide.shapes.add_picture(io.BytesIO(blob), *place)
+
+def add_chart(slide, left, top, width, height, chart_type, categories, series, colors, labels=True,
+              number_format='General', font_size=12, text_color=COLORS['text_dark'], legend=False):
+    """加入原生圖表（chart_type：bar / funnel / line / donut；series 為 ((名稱, 數值), …)）"""
+    chart_data = _ChartData(number_format=number_format)
+    chart_data.categories = categories
+    if chart_type == 'funnel':
+        # 漏斗以堆疊橫條圖呈現：前面加一段透明的墊塊讓各列置中
+        name, values = series[0]
+        peak = max(values, default=0)
+        chart_data.add_series(' ', [(peak - v) / 2 for v in values])
+        chart_data.add_series(name, values)
+    else:
+        for name, values in series:
+            chart_data.add_series(name, values)
+    graphic_frame = slide.shapes.add_chart(_CHART_TYPES[chart_type], left, top, width, height, chart_data)
+
+    chart = graphic_frame.chart
+    chart.has_title = False
+    chart.has_legend = legend
+    if legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    chart.font.size = Pt(font_size)
+    chart.font.name = 'Microsoft JhengHei'
+    _set_color(chart.font.color, text_color)
+
+    plot = chart.plots[0]
+    if chart_type == 'donut':
+        plot._element.find(qn('c:holeSize')).set('val', '55')
+    else:
+        chart.value_axis.has_major_gridlines = False
+        chart.value_axis.visible = chart_type != 'funnel'
+        chart.category_axis.format.line.fill.background()
+        if chart_type == 'funnel':
+            plot.gap_width = 30
+            plot.overlap = 100
+            chart.category_axis.reverse_order = True
+        else:
+            plot.gap_width = 80
+
+    painted = list(plot.series)
+    if chart_type == 'funnel':
+        painted.pop(0).format.fill.background()
+    for i, one in enumerate(painted):
+        if chart_type == 'line':
+            _set_color(one.format.line.color, colors[i % len(colors)])
+            one.marker.style = XL_MARKER_STYLE.CIRCLE
+            _fill(one.marker.format, colors[i % len(colors)])
+            one.smooth = False
+        elif len(painted) == 1:
+            for j, point in enumerate(one.points):
+                _fill(point.format, colors[j % len(colors)])
+        else:
+            _fill(one.format, colors[i % len(colors)])
+        if labels:
+            data_labels = one.data_labels
+            data_labels.number_format = number_format
+            data_labels.number_format_is_linked = False
+            data_labels.show_value = True
+            if chart_type in ('funnel', 'bar'):
+                data_labels.position = (XL_LABEL_POSITION.CENTER if chart_type == 'funnel'
+                                        else XL_LABEL_POSITION.OUTSIDE_END)
+            if chart_type == 'funnel':
+                data_labels.font.bold = True
+                _set_color(data_labels.font.color, COLORS['white'])
+    return graphic_frame
+
+
+# ====== 原生圖表 ======
+_CHART_TYPES = {
+    'bar': XL_CHART_TYPE.COLUMN_CLUSTERED,
+    'funnel': XL_CHART_TYPE.BAR_STACKED,
+    'line': XL_CHART_TYPE.LINE_MARKERS,
+    'donut': XL_CHART_TYPE.DOUGHNUT,
+}
+# 內嵌活頁簿的建立時間；固定後相同資料的圖表 part 位元組相同（可重現輸出）
+CHART_WORKBOOK_DATE = datetime.datetime(1980, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class _PinnedWorkbookWriter(CategoryWorkbookWriter):
+    """內嵌活頁簿的 core properties 使用固定時間，不寫入輸出當下的時間"""
+
+    @contextlib.contextmanager
+    def _open_worksheet(self, xlsx_file):
+        with super()._open_worksheet(xlsx_file) as (workbook, worksheet):
+            workbook.set_properties({'created': CHART_WORKBOOK_DATE})
+            yield workbook, worksheet
+
+
+class _ChartData(CategoryChartData):
+    @lazyproperty
+    def _workbook_writer(self):
+        return _PinnedWorkbookWriter(self)
+
+
+def _fill(fmt, color):
+    """設定圖表元素的實心填色"""
+    fmt.fill.solid()
+    _set_color(fmt.fill.fore_color, color)
+
+
+# ====== 填色範本 ======
+# 半透明填色依 (color, alpha) 預先編譯成 <a:solidFill> 片段並快取，
+# 每次只需 deepcopy 插入 spPr，不必再搜尋 srgbClr 節點、手動補 alpha 元素。
+@functools.lru_cache(maxsize=None)
+def _solid_fill_template(color, alpha):
+    """依顏色與不透明度（%）建立（並快取）solidFill 片段"""
+    alpha_xml = f'<a:alpha val="{int(alpha * 1000)}"/>'
+    return parse_xml(f'<a:solidFill {nsdecls("a")}>{_color_xml(color, alpha_xml)}</a:solidFill>')
+
+
+def _apply_fill(shape, color, alpha=None):
+    """設定形狀的實心填色並移除外框"""
+    if alpha is None:
+        shape.fill.solid()
+        _set_color(shape.fill.fore_color, color)
+    else:
+        spPr = shape._element.spPr
+        spPr._remove_eg_fillProperties()
+        spPr._insert_solidFill(copy.deepcopy(_solid_fill_template(color, alpha)))
+    shape.line.fill.background()
+
+
+# ====== 文字框快速路徑 ======
+# add_text / add_para 不逐一透過 python-pptx 的屬性設定（每次都要走訪、修改 lxml），
+# 而是依樣式快取一份已解析、已套好字型的 XML 範本，deepcopy 後只填入位置與文字。
+# 產生的 XML 與 _add_text_setters / _add_para_setters 完全相同。
+_TEXTBOX_XML = (
+    '<p:sp %s><p:nvSpPr><p:cNvPr id="0" name=""/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="square"><a:spAutoFit/></a:bodyPr><a:lstStyle/>%s</p:txBody></p:sp>'
+)
+_PARA_XML = (
+    '<a:p %s><a:pPr algn="%s">%s<a:defRPr sz="%d" b="%d"><a:solidFill>%s</a:solidFill>'
+    '<a:latin typeface="%s"/></a:defRPr></a:pPr></a:p>'
+)
+_LINE_BREAK = re.compile('\n|\v')
+_CTRL_CHARS = re.compile(r'([\x00-\x08\x0B-\x1F])')
+_TAG_R, _TAG_T, _TAG_BR = qn('a:r'), qn('a:t'), qn('a:br')
+
+
+def _para_xml(font_size, color, bold, alignment, font_name, spacing='', ns=''):
+    return _PARA_XML % (ns, PP_ALIGN.to_xml(alignment), spacing, Pt(font_size).centipoints,
+                        bool(bold), _color_xml(color), escape(font_name, {'"': '&quot;'}))
+
+
+@functools.lru_cache(maxsize=None)
+def _textbox_template(font_size, color, bold, alignment, font_name):
+    """依樣式建立（並快取）文字框範本"""
+    return parse_xml(_TEXTBOX_XML % (nsdecls('p', 'a'), _para_xml(font_size, color, bold, alignment, font_name)))
+
+
+@functools.lru_cache(maxsize=None)
+def _para_template(font_size, color, bold, alignment, space_before, space_after, font_name):
+    """依樣式建立（並快取）段落範本"""
+    spacing = ''
+    if space_before is not None:
+        spacing += f'<a:spcBef><a:spcPts val="{ST_TextSpacingPoint.convert_to_xml(space_before)}"/></a:spcBef>'
+    if space_after is not None:
+        spacing += f'<a:spcAft><a:spcPts val="{ST_TextSpacingPoint.convert_to_xml(space_after)}"/></a:spcAft>'
+    return parse_xml(_para_xml(font_size, color, bold, alignment, font_name, spacing, nsdecls('a')))
+
+
+def _append_runs(p, text):
+    """與 python-pptx 的 p.text 相同：換行轉為 a:br，空字串不產生 a:r"""
+    for idx, chunk in enumerate(_LINE_BREAK.split(text)):
+        if idx:
+            etree.SubElement(p, _TAG_BR)
+        if chunk:
+            r = etree.SubElement(p, _TAG_R)
+            etree.SubElement(r, _TAG_T).text = _CTRL_CHARS.sub(lambda m: '_x%04X_' % ord(m.group(1)), chunk)
+
+
+def _add_text_setters(slide, left, top, width, height, text, font_size=18, color=COLORS['text_dark'],
+                      bold=False, alignment=PP_ALIGN.LEFT, font_name='Microsoft JhengHei'):
+    """add_text 的 python-pptx 屬性設定版本（基準測試與 XML 比對用）"""
+    txBox = slide.shapes.add_textbox(left, top, width, height)
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.text = text
+    p.font.size = Pt(font_size)
+    _set_color(p.font.color, color)
+    p.font.bold = bold
+    p.font.name = font_name
+    p.alignment = alignment
+    return txBox
+
+
+def _add_para_setters(text_frame, text, font_size=16, color=COLORS['text_dark'], bold=False,
+                      alignment=PP_ALIGN.LEFT, space_before=Pt(4), space_after=Pt(4),
+                      font_name='Microsoft JhengHei'):
+    """add_para 的 python-pptx 屬性設定版本（基準測試與 XML 比對用）"""
+    p = text_frame.add_paragraph()
+    p.text = text
+    p.font.size = Pt(font_size)
+    _set_color(p.font.color, color)
+    p.font.bold = bold
+    p.font.name = font_name
+    p.alignment = alignment
+    p.space_before = space_before
+    p.space_after = space_after
+    return p
+
+
+# ====== 形狀計畫 ======
+# 每個 Shape 對應一次基本工具函數呼叫（add_rect / add_rounded_rect / add_circle / add_text），
+# 參數全部展開存放，方便之後做快取、比對或平行輸出。
+Shape = namedtuple('Shape', 'kind left top width height props')
+DeckPlan = namedtuple('DeckPlan', 'width height slides')
+
+
+class SlidePlan:
+    """單頁投影片的形狀計畫"""
+
+    def __init__(self, layout, width=Inches(13.333), height=Inches(7.5),
+                 brand_tag='94Cram 智慧補教'):
+        self.layout = layout
+        self.width = width
+        self.height = height
+        self.brand_tag = brand_tag
+        self.bg = None
+        self.shapes = []
+        self.decorative = set()     # 不受版面檢查的裝飾形狀（shapes 的索引）
+
+    # ---- 基本形狀 ----
+    def background(self, color):
+        self.bg = color
+
+    def rect(self, left, top, width, height, color, alpha=None, decorative=False):
+        self._fill('rect', left, top, width, height, color, alpha, decorative)
+
+    def rounded_rect(self, left, top, width, height, color, alpha=None, decorative=False):
+        self._fill('rounded_rect', left, top, width, height, color, alpha, decorative)
+
+    def circle(self, left, top, size, color, alpha=None, decorative=False):
+        self._fill('circle', left, top, size, size, color, alpha, decorative)
+
+    def _fill(self, kind, left, top, width, height, color, alpha, decorative):
+        if decorative:
+            self.decorative.add(len(self.shapes))
+        self.shapes.append(Shape(kind, left, top, width, height, {'color': color, 'alpha': alpha}))
+
+    def text(self, left, top, width, height, text, font_size=18, color=COLORS['text_dark'],
+             bold=False, alignment=PP_ALIGN.LEFT, font_name='Microsoft JhengHei', fit=False):
+        """文字框；`fit` 時若排不進 width × height，縮小字級直到放得下（最小 textfit.MIN_FONT_SIZE）"""
+        if not isinstance(text, str):
+            raise TypeError(f'文字必須是字串：{text!r}')
+        if fit:
+            font_size = textfit.fit(text, width, height, font_size, font_name, bold).font_size
+        self.shapes.append(Shape('text', left, top, width, height, {
+            'text': text, 'font_size': font_size, 'color': color,
+            'bold': bold, 'alignment': alignment, 'font_name': font_name,
+        }))
+
+    def chart(self, left, top, width, height, chart_type, categories, series, colors, labels=True,
+              number_format='General', font_size=12, text_color=COLORS['text_dark'], legend=False):
+        """原生圖表；`series` 為 {名稱: 數值} 或 (名稱, 數值) 序列，數值可為 list 或 NumPy 陣列"""
+        if chart_type not in charts.CHART_TYPES:
+            raise ValueError(f'未知的圖表種類：{chart_type!r}')
+        self.shapes.append(Shape('chart', left, top, width, height, {
+            'chart_type': chart_type, 'categories': tuple(map(str, categories)),
+            'series': charts.normalize_series(series), 'colors': tuple(colors), 'labels': labels,
+            'number_format': number_format, 'font_size': font_size, 'text_color': text_color, 'legend': legend,
+        }))
+
+    def icon(self, left, top, width, height, text, font_size=18, color=COLORS['text_dark'],
+             bold=False, alignment=PP_ALIGN.LEFT):
+        """單獨一格的 emoji 圖標；指定了 emoji 字型時放入點陣圖（見 icons），否則照舊輸出文字框
+
+        點陣圖放在文字框第一行 emoji 所在的位置：邊長為 emoji 字寬，依 `alignment` 水平對齊。
+        """
+        path = icons.sprite(text, str(color))
+        if path is None:
+            self.text(left, top, width, height, text, font_size, color, bold, alignment)
+            return
+        em = font_size * textfit.EMU_PER_PT
+        metrics = textfit.font_metrics(textfit.DEFAULT_FONT)
+        side = round(em * metrics.emoji / 1000)
+        if alignment == PP_ALIGN.CENTER:
+            x = left + (width - side) // 2
+        elif alignment == PP_ALIGN.RIGHT:
+            x = left + width - textfit.INSET_X - side
+        else:
+            x = left + textfit.INSET_X
+        y = top + textfit.INSET_Y + round((em * metrics.line_height - side) / 2)
+        self._image(x, y, side, side, path)
+
+    def image(self, left, top, width, height, path, fit='contain'):
+        """圖片；`path` 為相對於素材目錄（spec.ASSET_ROOT）的路徑，不可超出該目錄，
+        `fit` 為 contain（保持比例）或 cover（裁切填滿）
+        """
+        self._image(left, top, width, height, resolve_asset(path), fit)
+
+    def _image(self, left, top, width, height, path, fit='contain'):
+        if fit not in assets.FITS:
+            raise ValueError(f'未知的裁切方式：{fit!r}')
+        self.shapes.append(Shape('image', left, top, width, height, {
+            'path': path, 'fit': fit, 'digest': assets.source(path).digest,
+        }))
+
+    # ---- 組合元件 ----
+    def icon_card(self, left, top, width, height, icon_text, title, desc, bg_color, icon_color):
+        """帶圖標的卡片"""
+        self.rounded_rect(left, top, width, height, bg_color)
+        # 圖標圓形
+        self.circle(left + Inches(0.3), top + Inches(0.3), Inches(0.7), icon_color)
+        # 圖標文字
+        self.icon(left + Inches(0.3), top + Inches(0.3), Inches(0.7), Inches(0.7),
+                  icon_text, font_size=24, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+        # 標題
+        self.text(left + Inches(1.15), top + Inches(0.3), width - Inches(1.5), Inches(0.5),
+                  title, font_size=18, color=COLORS['dark'], bold=True)
+        # 描述
+        self.text(left + Inches(1.15), top + Inches(0.75), width - Inches(1.5), height - Inches(1.0),
+                  desc, font_size=13, color=COLORS['text_light'])
+
+    def stat_card(self, left, top, number, label, color):
+        """數據統計卡片"""
+        self.rounded_rect(left, top, Inches(2.4), Inches(1.6), COLORS['white'])
+        # 頂部色條
+        self.rect(left, top, Inches(2.4), Inches(0.06), color)
+        # 數字
+        self.text(left, top + Inches(0.25), Inches(2.4), Inches(0.8),
+                  number, font_size=36, color=color, bold=True, alignment=PP_ALIGN.CENTER)
+        # 標籤
+        self.text(left, top + Inches(1.0), Inches(2.4), Inches(0.5),
+                  label, font_size=14, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+    def header(self, title, subtitle=None):
+        """統一頁面標題"""
+        # 頂部裝飾條
+        self.rect(Inches(0), Inches(0), self.width, Inches(0.06), COLORS['primary'])
+        # 標題
+        self.text(Inches(0.8), Inches(0.3), Inches(10), Inches(0.7),
+                  title, font_size=32, color=COLORS['dark'], bold=True)
+        if subtitle:
+            self.text(Inches(0.8), Inches(0.95), Inches(10), Inches(0.4),
+                      subtitle, font_size=16, color=COLORS['text_light'])
+        # 右上角品牌
+        self.text(Inches(10.5), Inches(0.35), Inches(2.5), Inches(0.4),
+                  self.brand_tag, font_size=14, color=COLORS['primary'], bold=True, alignment=PP_ALIGN.RIGHT)
+
+    def dark_header(self, title, subtitle):
+        """深色頁面標題"""
+        self.rect(Inches(0), Inches(0), self.width, Inches(0.06), COLORS['accent'])
+        self.text(Inches(0.8), Inches(0.4), Inches(10), Inches(0.6),
+                  title, font_size=32, color=COLORS['white'], bold=True)
+        self.text(Inches(0.8), Inches(1.0), Inches(10), Inches(0.4),
+                  subtitle, font_size=16, color=COLORS['light2'])
+        self.text(Inches(10.5), Inches(0.45), Inches(2.5), Inches(0.4),
+                  self.brand_tag, font_size=14, color=COLORS['primary'], bold=True, alignment=PP_ALIGN.RIGHT)
+
+
+# ====== 版型編譯 ======
+LAYOUTS = {}
+
+
+def layout(name):
+    """註冊 deck spec 中 `layout` 欄位對應的編譯函數"""
+    def register(fn):
+        LAYOUTS[name] = fn
+        return fn
+    return register
+
+
+# =========================================================
+# SLIDE 1: 封面
+# =========================================================
+@layout('cover')
+def compile_cover(s, data):
+    s.background(COLORS['dark'])
+
+    # 裝飾元素
+    s.circle(Inches(-1.5), Inches(-2), Inches(6), COLORS['dark2'], decorative=True)
+    s.circle(Inches(9), Inches(4), Inches(5), COLORS['dark2'], decorative=True)
+
+    # 頂部色條
+    s.rect(Inches(0), Inches(0), s.width, Inches(0.08), COLORS['accent'])
+
+    # 品牌標識
+    s.text(Inches(1), Inches(1.2), Inches(11), Inches(0.6),
+           data['brand'], font_size=24, color=COLORS['accent'], bold=True)
+
+    # 主標題
+    s.text(Inches(1), Inches(2.0), Inches(11), Inches(1.2),
+           data['title'], font_size=54, color=COLORS['white'], bold=True)
+
+    # 副標題
+    s.text(Inches(1), Inches(3.3), Inches(11), Inches(0.8),
+           data['subtitle'], font_size=28, color=COLORS['light2'])
+
+    # 分隔線
+    s.rect(Inches(1), Inches(4.3), Inches(3), Inches(0.04), COLORS['accent'])
+
+    # 描述
+    s.text(Inches(1), Inches(4.6), Inches(8), Inches(0.5),
+           data['tagline'], font_size=18, color=COLORS['light2'])
+
+    # 日期
+    s.text(Inches(1), Inches(5.5), Inches(5), Inches(0.4),
+           data['date'], font_size=16, color=COLORS['text_light'])
+
+    # 右下角裝飾
+    badge_title, badge_note = data['badge']
+    s.rounded_rect(Inches(9.5), Inches(5.5), Inches(3), Inches(1.3), COLORS['primary'])
+    s.text(Inches(9.5), Inches(5.7), Inches(3), Inches(0.4),
+           badge_title, font_size=20, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+    s.text(Inches(9.5), Inches(6.15), Inches(3), Inches(0.3),
+           badge_note, font_size=14, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 2: 補習班的痛點
+# =========================================================
+@layout('pain_points')
+def compile_pain_points(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    pain_points = data['pain_points']
+    boxes = geo.grid(0.5, 1.7, len(pain_points), 3, 4.2, 2.7, 3.8, 2.3)
+    for (left, top, width, height), (icon, title, desc, color) in zip(boxes, pain_points):
+        color = COLORS[color]
+
+        s.rounded_rect(left, top, width, height, COLORS['white'])
+        # 左側色條
+        s.rect(left, top + Inches(0.3), Inches(0.06), Inches(1.7), color)
+
+        s.icon(left + Inches(0.3), top + Inches(0.2), Inches(0.6), Inches(0.6),
+               icon, font_size=28, alignment=PP_ALIGN.CENTER)
+        s.text(left + Inches(0.9), top + Inches(0.25), Inches(2.7), Inches(0.4),
+               title, font_size=18, color=color, bold=True)
+        s.text(left + Inches(0.3), top + Inches(0.85), Inches(3.2), Inches(1.2),
+               desc, font_size=13, color=COLORS['text_light'], fit=True)
+
+
+# =========================================================
+# SLIDE 3: 解決方案總覽
+# =========================================================
+@layout('solutions')
+def compile_solutions(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    systems = data['systems']
+    for (left, top, width, height), (icon_char, name, subtitle, features, color) in zip(
+            geo.row(0.5, 1.7, len(systems), 4.2, 3.8, 4.5), systems):
+        color = COLORS[color]
+
+        s.rounded_rect(left, top, width, height, COLORS['white'])
+        # 頂部色帶
+        s.rect(left, top, width, Inches(0.8), color)
+        # 圖標
+        s.circle(left + Inches(1.4), top + Inches(0.08), Inches(0.65), COLORS['white'])
+        s.text(left + Inches(1.4), top + Inches(0.08), Inches(0.65), Inches(0.65),
+               icon_char, font_size=24, color=color, bold=True, alignment=PP_ALIGN.CENTER)
+        # 系統名
+        s.text(left, top + Inches(0.95), width, Inches(0.5),
+               name, font_size=24, color=color, bold=True, alignment=PP_ALIGN.CENTER)
+        # 副標題
+        s.text(left, top + Inches(1.4), width, Inches(0.4),
+               subtitle, font_size=14, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+        # 分隔線
+        s.rect(left + Inches(0.5), top + Inches(1.85), Inches(2.8), Inches(0.02), COLORS['light2'])
+        # 功能列表
+        s.text(left + Inches(0.4), top + Inches(2.0), Inches(3.0), Inches(2.3),
+               features, font_size=13, color=COLORS['text_dark'])
+
+    # AI 底部橫幅
+    banner_title, banner_note = data['banner']
+    s.rounded_rect(Inches(0.5), Inches(6.4), Inches(12.3), Inches(0.85), COLORS['dark'])
+    s.text(Inches(1.5), Inches(6.5), Inches(10), Inches(0.35),
+           banner_title, font_size=17, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+    s.text(Inches(1.5), Inches(6.85), Inches(10), Inches(0.3),
+           banner_note, font_size=13, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 4: 94Manage 學員管理 — 核心功能
+# =========================================================
+@layout('manage')
+def compile_manage(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    # 左半部分：招生漏斗
+    s.rounded_rect(Inches(0.5), Inches(1.6), Inches(6.0), Inches(5.5), COLORS['white'])
+    s.text(Inches(0.8), Inches(1.75), Inches(5), Inches(0.4),
+           data['funnel_title'], font_size=20, color=COLORS['primary'], bold=True)
+
+    stages = data['funnel_stages']
+    if data.get('funnel_chart'):
+        # 原生漏斗圖：以各階段百分比呈現
+        values = [float(pct.rstrip('%')) for _, pct, _, _ in stages]
+        s.chart(Inches(0.8), Inches(2.3), Inches(5.4), Inches(3.8), 'funnel',
+                [stage for stage, *_ in stages], {data['funnel_title']: values},
+                [COLORS[color] for *_, color in stages],
+                number_format='0"%"', font_size=13)
+        stages = []
+    for t, (stage, pct, width, color) in zip(geo.steps(2.4, 0.75, len(stages)), stages):
+        color = COLORS[color]
+        width = Inches(width)
+        offset = (Inches(5.0) - width) / 2
+        left = Inches(1.0) + offset
+        s.rounded_rect(left, t, width, Inches(0.55), color)
+        s.text(left, t + Inches(0.05), width, Inches(0.45),
+               f'{stage}  {pct}', font_size=14, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+
+    s.text(Inches(0.8), Inches(6.2), Inches(5.5), Inches(0.5),
+           data['funnel_note'], font_size=12, color=COLORS['text_light'])
+
+    # 右半部分：核心模組
+    features = data['right_features']
+    for (left, top, width, height), (icon, title, desc) in zip(
+            geo.column(6.8, 1.65, len(features), 0.9, 5.8, 0.78), features):
+        s.rounded_rect(left, top, width, height, COLORS['white'])
+        s.icon(Inches(7.0), top + Inches(0.05), Inches(0.5), Inches(0.5),
+               icon, font_size=22, alignment=PP_ALIGN.CENTER)
+        s.text(Inches(7.6), top + Inches(0.05), Inches(1.5), Inches(0.35),
+               title, font_size=16, color=COLORS['dark'], bold=True)
+        s.text(Inches(7.6), top + Inches(0.38), Inches(4.8), Inches(0.35),
+               desc, font_size=12, color=COLORS['text_light'], fit=True)
+
+
+# =========================================================
+# SLIDE 5: AI 流失預警系統
+# =========================================================
+@layout('churn')
+def compile_churn(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    # 左邊說明
+    s.rounded_rect(Inches(0.5), Inches(1.6), Inches(5.8), Inches(5.5), COLORS['white'])
+    s.text(Inches(0.8), Inches(1.8), Inches(5), Inches(0.4),
+           data['signals_title'], font_size=20, color=COLORS['primary'], bold=True)
+
+    signals = data['signals']
+    for top, (icon, title, desc) in zip(geo.steps(2.4, 0.8, len(signals)), signals):
+        s.icon(Inches(0.8), top, Inches(0.5), Inches(0.4), icon, font_size=20)
+        s.text(Inches(1.4), top, Inches(2), Inches(0.35),
+               title, font_size=15, color=COLORS['dark'], bold=True)
+        s.text(Inches(1.4), top + Inches(0.3), Inches(4.5), Inches(0.35),
+               desc, font_size=12, color=COLORS['text_light'])
+
+    # 右邊風險儀表板
+    s.rounded_rect(Inches(6.6), Inches(1.6), Inches(6.2), Inches(5.5), COLORS['dark'])
+    s.text(Inches(7.0), Inches(1.85), Inches(5.5), Inches(0.4),
+           data['dashboard_title'], font_size=20, color=COLORS['white'], bold=True)
+
+    risk_levels = data['risk_levels']
+    for (left, top, width, height), (icon, level, count, action, color) in zip(
+            geo.column(7.0, 2.5, len(risk_levels), 1.5, 5.4, 1.2), risk_levels):
+        color = COLORS[color]
+        s.rounded_rect(left, top, width, height, COLORS['dark2'])
+        s.rect(left, top, Inches(0.08), height, color)
+        s.icon(Inches(7.3), top + Inches(0.1), Inches(0.4), Inches(0.4),
+               icon, font_size=22)
+        s.text(Inches(7.8), top + Inches(0.1), Inches(1.5), Inches(0.35),
+               level, font_size=18, color=color, bold=True)
+        s.text(Inches(10.0), top + Inches(0.15), Inches(2), Inches(0.3),
+               count, font_size=16, color=COLORS['white'], alignment=PP_ALIGN.RIGHT)
+        s.text(Inches(7.3), top + Inches(0.6), Inches(5), Inches(0.4),
+               f'建議行動：{action}', font_size=12, color=COLORS['light2'])
+
+    # 底部統計
+    s.text(Inches(7.0), Inches(6.4), Inches(5.5), Inches(0.35),
+           data['footer'], font_size=14, color=COLORS['gold'], bold=True, alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 6: 94inClass 點名系統
+# =========================================================
+@layout('inclass')
+def compile_inclass(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    # NFC 點名 / AI 臉辨 / LINE 通知卡片
+    cards = data['cards']
+    for (left, top, width, height), (icon, title, tagline, desc, color) in zip(
+            geo.row(0.5, 1.6, len(cards), 4.2, 3.8, 3.2), cards):
+        s.rounded_rect(left, top, width, height, COLORS[color])
+        s.icon(left, Inches(1.85), width, Inches(0.5),
+               icon, font_size=40, alignment=PP_ALIGN.CENTER)
+        s.text(left, Inches(2.5), width, Inches(0.5),
+               title, font_size=24, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left + Inches(0.3), Inches(3.1), Inches(3.2), Inches(0.35),
+               tagline, font_size=16, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+        s.text(left + Inches(0.3), Inches(3.55), Inches(3.2), Inches(0.8),
+               desc, font_size=13, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+
+    # 底部功能列
+    features = data['features_bottom']
+    for (left, top, width, height), (title, desc) in zip(
+            geo.row(0.5, 5.2, len(features), 2.55, 2.3, 1.8), features):
+        s.rounded_rect(left, top, width, height, COLORS['white'])
+        s.text(left, top + Inches(0.15), width, Inches(0.35),
+               title, font_size=14, color=COLORS['dark'], bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left + Inches(0.15), top + Inches(0.55), Inches(2.0), Inches(1.0),
+               desc, font_size=12, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# 產品實際畫面
+# =========================================================
+@layout('showcase')
+def compile_showcase(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    screenshots = data['screenshots']
+    for (left, top, width, height), (path, title, desc) in zip(
+            geo.row(0.5, 1.6, len(screenshots), 6.3, 6.0, 5.5), screenshots):
+        s.rounded_rect(left, top, width, height, COLORS['white'])
+        s.image(left + Inches(0.3), top + Inches(0.3), width - Inches(0.6), Inches(4.0), path)
+        s.text(left + Inches(0.3), top + Inches(4.4), width - Inches(0.6), Inches(0.4),
+               title, font_size=18, color=COLORS['dark'], bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left + Inches(0.3), top + Inches(4.85), width - Inches(0.6), Inches(0.35),
+               desc, font_size=13, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 7: 94Stock 庫存管理
+# =========================================================
+@layout('stock')
+def compile_stock(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    # 主要流程
+    flow_items = data['flow_items']
+    # 箭頭佔 0.6 吋、卡片佔 2.75 吋（卡片寬 2.7 吋），4 張卡片加 3 個箭頭剛好放進 13.33 吋寬
+    lefts = geo.stack(Inches(0.3), [Inches(0.6) if title == '' else Inches(2.75) for _, title, _ in flow_items])
+    for x_pos, (icon, title, desc) in zip(lefts, flow_items):
+        if title == '':
+            # 箭頭
+            s.text(x_pos, Inches(2.5), Inches(0.6), Inches(0.6),
+                   '→', font_size=36, color=COLORS['accent'], bold=True, alignment=PP_ALIGN.CENTER)
+        else:
+            s.rounded_rect(x_pos, Inches(1.6), Inches(2.7), Inches(2.6), COLORS['white'])
+            s.icon(x_pos, Inches(1.75), Inches(2.7), Inches(0.5),
+                   icon, font_size=32, alignment=PP_ALIGN.CENTER)
+            s.text(x_pos, Inches(2.3), Inches(2.7), Inches(0.4),
+                   title, font_size=20, color=COLORS['dark'], bold=True, alignment=PP_ALIGN.CENTER)
+            s.text(x_pos + Inches(0.2), Inches(2.8), Inches(2.3), Inches(1.2),
+                   desc, font_size=13, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+    # 底部特色功能
+    features = data['bottom_features']
+    for (left, top, width, height), (icon, title, desc, color) in zip(
+            geo.row(0.5, 4.7, len(features), 3.2, 2.9, 2.4), features):
+        color = COLORS[color]
+        s.rounded_rect(left, top, width, height, COLORS['white'])
+        s.rect(left, top, width, Inches(0.06), color)
+        s.icon(left, top + Inches(0.2), width, Inches(0.5),
+               icon, font_size=28, alignment=PP_ALIGN.CENTER)
+        s.text(left, top + Inches(0.75), width, Inches(0.4),
+               title, font_size=16, color=color, bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left + Inches(0.2), top + Inches(1.2), Inches(2.5), Inches(1.0),
+               desc, font_size=12, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 8: AI 機器人 — Telegram & LINE
+# =========================================================
+@layout('bot')
+def compile_bot(s, data):
+    s.background(COLORS['dark'])
+    s.dark_header(data['title'], data['subtitle'])
+
+    # 管理員模式
+    s.rounded_rect(Inches(0.5), Inches(1.7), Inches(6.0), Inches(5.3), COLORS['dark2'])
+    s.text(Inches(0.8), Inches(1.9), Inches(5.5), Inches(0.4),
+           data['admin_title'], font_size=18, color=COLORS['accent'], bold=True)
+
+    commands = data['admin_commands']
+    for top, (cmd, result) in zip(geo.steps(2.5, 0.68, len(commands)), commands):
+        # 指令氣泡
+        s.rounded_rect(Inches(0.8), top, Inches(2.5), Inches(0.5), COLORS['primary'])
+        s.text(Inches(0.9), top + Inches(0.05), Inches(2.3), Inches(0.4),
+               cmd, font_size=13, color=COLORS['white'], bold=True)
+        # 回應
+        s.text(Inches(3.5), top + Inches(0.05), Inches(3.0), Inches(0.4),
+               result, font_size=13, color=COLORS['light2'])
+
+    # 安全機制
+    s.rounded_rect(Inches(0.8), Inches(6.4), Inches(5.5), Inches(0.45), COLORS['accent'])
+    s.text(Inches(1.0), Inches(6.45), Inches(5.0), Inches(0.35),
+           data['admin_footer'], font_size=13, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+
+    # 家長模式
+    s.rounded_rect(Inches(6.8), Inches(1.7), Inches(6.0), Inches(5.3), COLORS['dark2'])
+    s.text(Inches(7.1), Inches(1.9), Inches(5.5), Inches(0.4),
+           data['parent_title'], font_size=18, color=COLORS['secondary'], bold=True)
+
+    # 各列平分 2.5 – 6.3 吋之間的高度，不壓到底部說明
+    features = data['parent_features']
+    pitch = min(0.9, 3.8 / max(1, len(features)))
+    for (left, top, width, height), (title, desc) in zip(
+            geo.column(7.1, 2.5, len(features), pitch, 5.4, pitch - 0.06), features):
+        s.rounded_rect(left, top, width, height, COLORS['dark'])
+        s.text(Inches(7.3), top + Inches(0.03), Inches(1.5), Inches(0.3),
+               title, font_size=14, color=COLORS['secondary'], bold=True)
+        s.text(Inches(7.3), top + Inches(0.27), Inches(5.0), Inches(0.4),
+               desc, font_size=11, color=COLORS['light2'])
+
+    # 家長底部
+    s.rounded_rect(Inches(7.1), Inches(6.4), Inches(5.5), Inches(0.45), COLORS['secondary'])
+    s.text(Inches(7.3), Inches(6.45), Inches(5.0), Inches(0.35),
+           data['parent_footer'], font_size=13, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 9: 與競品比較
+# =========================================================
+@layout('compare')
+def compile_compare(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    # 表頭
+    col_widths = [Inches(w) for w in data['col_widths']]
+
+    for i, (header, left, width) in enumerate(zip(data['headers'], geo.stack(Inches(0.5), col_widths), col_widths)):
+        bg_color = COLORS['primary'] if i == 1 else COLORS['dark']
+        s.rounded_rect(left, Inches(1.6), width, Inches(0.7), bg_color)
+        s.text(left, Inches(1.62), width, Inches(0.65),
+               header, font_size=13, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+
+    # 比較項目：各列平分表頭與底部結論之間（2.35 – 6.3 吋）的高度
+    items = data['compare_items']
+    pitch = min(0.4, 3.95 / max(1, len(items)))
+    for row_i, ((feature, *values), (name_box, *value_boxes)) in enumerate(
+            zip(items, geo.table(0.5, 2.35, col_widths, len(items), pitch, pitch - 0.02))):
+        left, top, width, height = name_box
+        bg = COLORS['white'] if row_i % 2 == 0 else COLORS['light2']
+
+        # 功能名稱
+        s.rect(left, top, width, height, bg)
+        s.text(left + Inches(0.2), top, width, height,
+               feature, font_size=12, color=COLORS['text_dark'], bold=True)
+
+        # 數值列
+        for col_i, (val, (left, top, width, height)) in enumerate(zip(values, value_boxes)):
+            cell_bg = HIGHLIGHT_BG if col_i == 0 and val == '✓' else bg
+            s.rect(left, top, width, height, cell_bg)
+
+            if val == '✓':
+                c = COLORS['green_check']
+                display = '✓'
+            elif val == '✗':
+                c = COLORS['red_cross']
+                display = '✗'
+            elif val == '△':
+                c = COLORS['gold']
+                display = '△'
+            else:
+                c = COLORS['text_dark']
+                display = val
+
+            font_bold = True if val in ('✓', '✗', '△') else False
+            fs = 14 if val in ('✓', '✗', '△') else 11
+            s.text(left, top, width, height,
+                   display, font_size=fs, color=c, bold=font_bold, alignment=PP_ALIGN.CENTER)
+
+    # 底部結論
+    conclusion_title, conclusion_note = data['conclusion']
+    s.rounded_rect(Inches(0.5), Inches(6.4), Inches(12.3), Inches(0.8), COLORS['primary'])
+    s.text(Inches(1.0), Inches(6.48), Inches(11), Inches(0.3),
+           conclusion_title, font_size=16, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+    s.text(Inches(1.0), Inches(6.82), Inches(11), Inches(0.25),
+           conclusion_note, font_size=13, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 10: 技術架構優勢
+# =========================================================
+@layout('architecture')
+def compile_architecture(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    # 架構圖示
+    layers = data['arch_layers']
+    for top, (layer, desc, color) in zip(geo.steps(1.55, 0.9, len(layers)), layers):
+        # 層級標籤
+        s.rounded_rect(Inches(0.5), top, Inches(2.0), Inches(0.7), COLORS[color])
+        s.text(Inches(0.5), top + Inches(0.1), Inches(2.0), Inches(0.5),
+               layer, font_size=15, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+        # 描述橫條
+        s.rounded_rect(Inches(2.7), top, Inches(5.3), Inches(0.7), COLORS['white'])
+        s.text(Inches(2.9), top + Inches(0.1), Inches(5.0), Inches(0.5),
+               desc, font_size=13, color=COLORS['text_dark'])
+
+    # 右邊優勢列表
+    advantages = data['advantages']
+    for (left, top, width, height), (icon, title, desc) in zip(
+            geo.grid(8.3, 1.55, len(advantages), 2, 2.5, 1.85, 2.3, 1.65), advantages):
+        s.rounded_rect(left, top, width, height, COLORS['white'])
+        s.icon(left, top + Inches(0.1), width, Inches(0.4),
+               icon, font_size=26, alignment=PP_ALIGN.CENTER)
+        s.text(left, top + Inches(0.55), width, Inches(0.35),
+               title, font_size=14, color=COLORS['dark'], bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left + Inches(0.1), top + Inches(0.9), Inches(2.1), Inches(0.65),
+               desc, font_size=11, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 11: 安全與合規
+# =========================================================
+@layout('security')
+def compile_security(s, data):
+    s.background(COLORS['dark'])
+    s.dark_header(data['title'], data['subtitle'])
+
+    items = data['security_items']
+    for (left, top, width, height), (icon, title, desc) in zip(
+            geo.grid(0.5, 1.7, len(items), 3, 4.2, 2.7, 3.8, 2.4), items):
+        s.rounded_rect(left, top, width, height, COLORS['dark2'])
+        s.icon(left, top + Inches(0.15), width, Inches(0.5),
+               icon, font_size=32, alignment=PP_ALIGN.CENTER)
+        s.text(left, top + Inches(0.7), width, Inches(0.4),
+               title, font_size=18, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left + Inches(0.3), top + Inches(1.2), Inches(3.2), Inches(1.0),
+               desc, font_size=13, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 12: 成本效益
+# =========================================================
+@layout('cost')
+def compile_cost(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    # 數據卡片
+    stats = data['stats']
+    for left, (num, label, color) in zip(geo.steps(0.5, 3.15, len(stats)), stats):
+        s.stat_card(left, Inches(1.5), num, label, COLORS[color])
+
+    # 成本比較表
+    s.rounded_rect(Inches(0.5), Inches(3.5), Inches(6.0), Inches(3.7), COLORS['white'])
+    s.text(Inches(0.8), Inches(3.65), Inches(5), Inches(0.4),
+           data['cost_title'], font_size=18, color=COLORS['dark'], bold=True)
+
+    rows = data['cost_compare']
+    cells = geo.table(0.8, 4.15, [Inches(2.0), Inches(1.7), Inches(1.7)], len(rows), 0.42, 0.38)
+    for row_i, ((item, ours, theirs), (item_box, ours_box, theirs_box)) in enumerate(zip(rows, cells)):
+        is_header = row_i == 0
+        is_total = row_i >= 5
+        bg = COLORS['primary'] if is_header else (HIGHLIGHT_BG if is_total else (COLORS['white'] if row_i % 2 == 0 else COLORS['light']))
+        fc = COLORS['white'] if is_header else (COLORS['green_check'] if is_total else COLORS['text_dark'])
+
+        left, top, width, height = item_box
+        s.rect(left, top, width, height, bg)
+        s.text(left + Inches(0.1), top, width - Inches(0.2), height,
+               item, font_size=12, color=fc, bold=is_header or is_total)
+
+        s.rect(*ours_box, bg)
+        s.text(*ours_box,
+               ours, font_size=12, color=fc, bold=is_header or is_total, alignment=PP_ALIGN.CENTER)
+
+        s.rect(*theirs_box, bg)
+        s.text(*theirs_box,
+               theirs, font_size=12, color=COLORS['white'] if is_header else COLORS['red_cross'],
+               bold=is_header, alignment=PP_ALIGN.CENTER)
+
+    # ROI 面板
+    s.rounded_rect(Inches(6.8), Inches(3.5), Inches(5.8), Inches(3.7), COLORS['primary'])
+    s.text(Inches(7.2), Inches(3.7), Inches(5), Inches(0.4),
+           data['roi_title'], font_size=20, color=COLORS['white'], bold=True)
+
+    roi_items = data['roi_items']
+    for top, (title, desc, result) in zip(geo.steps(4.25, 0.62, len(roi_items)), roi_items):
+        s.text(Inches(7.2), top, Inches(2.0), Inches(0.3),
+               title, font_size=13, color=COLORS['white'], bold=True)
+        s.text(Inches(7.2), top + Inches(0.25), Inches(3.0), Inches(0.25),
+               desc, font_size=11, color=COLORS['light2'])
+        s.text(Inches(10.5), top + Inches(0.05), Inches(2.0), Inches(0.3),
+               result, font_size=12, color=COLORS['gold'], bold=True, alignment=PP_ALIGN.RIGHT)
+
+
+# =========================================================
+# SLIDE 13: 服務方案
+# =========================================================
+@layout('plans')
+def compile_plans(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    plans = data['plans']
+    for i, ((left, top, width, height), (name, price, cap, color, features)) in enumerate(
+            zip(geo.row(0.5, 1.5, len(plans), 4.2, 3.8, 5.7), plans)):
+        color = COLORS[color]
+
+        # 推薦標記
+        if i == data.get('featured'):
+            s.rounded_rect(left + Inches(0.8), top - Inches(0.15), Inches(2.2), Inches(0.35), COLORS['accent'])
+            s.text(left + Inches(0.8), top - Inches(0.13), Inches(2.2), Inches(0.33),
+                   data['featured_label'], font_size=12, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+
+        s.rounded_rect(left, top + Inches(0.15), width, height, COLORS['white'])
+        # 頂部色帶
+        s.rect(left, top + Inches(0.15), width, Inches(1.3), color)
+        s.text(left, top + Inches(0.3), width, Inches(0.4),
+               name, font_size=22, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left, top + Inches(0.75), width, Inches(0.4),
+               price, font_size=28, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left, top + Inches(1.15), width, Inches(0.3),
+               cap, font_size=13, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+
+        # 功能列表
+        for offset, feat in zip(geo.steps(0, 0.45, len(features)), features):
+            ft = Inches(1.7) + top + offset
+            if feat == '—':
+                s.text(left + Inches(0.4), ft, Inches(3.0), Inches(0.35),
+                       '—', font_size=13, color=COLORS['light2'])
+            else:
+                s.text(left + Inches(0.4), ft, Inches(3.0), Inches(0.35),
+                       f'✓  {feat}', font_size=13, color=COLORS['green_check'])
+
+
+# =========================================================
+# SLIDE 14: 導入流程
+# =========================================================
+@layout('onboarding')
+def compile_onboarding(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    steps = data['steps']
+    top = Inches(2.2)
+    for i, (left, (num, title, desc, color)) in enumerate(zip(geo.steps(0.5, 3.3, len(steps)), steps)):
+        color = COLORS[color]
+
+        # 圓形步驟編號
+        s.circle(left + Inches(1.05), top, Inches(1.0), color)
+        s.text(left + Inches(1.05), top + Inches(0.1), Inches(1.0), Inches(0.8),
+               num, font_size=36, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+
+        # 連接線
+        if i < len(steps) - 1:
+            s.rect(left + Inches(2.15), top + Inches(0.45), Inches(1.3), Inches(0.04), color)
+
+        # 標題
+        s.text(left, top + Inches(1.2), Inches(3.1), Inches(0.4),
+               title, font_size=22, color=color, bold=True, alignment=PP_ALIGN.CENTER)
+        # 描述
+        s.text(left + Inches(0.2), top + Inches(1.7), Inches(2.7), Inches(1.0),
+               desc, font_size=14, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+    # 底部承諾
+    promises = data['promises']
+    for (left, top, width, height), (title, desc) in zip(
+            geo.row(0.5, 5.3, len(promises), 3.2, 2.9, 1.2), promises):
+        s.rounded_rect(left, top, width, height, COLORS['white'])
+        s.text(left, top + Inches(0.15), width, Inches(0.35),
+               title, font_size=15, color=COLORS['green_check'], bold=True, alignment=PP_ALIGN.CENTER)
+        s.text(left, top + Inches(0.55), width, Inches(0.35),
+               desc, font_size=12, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# SLIDE 15: CTA 結尾
+# =========================================================
+@layout('cta')
+def compile_cta(s, data):
+    s.background(COLORS['dark'])
+
+    # 裝飾
+    s.circle(Inches(-2), Inches(-2), Inches(7), COLORS['dark2'], decorative=True)
+    s.circle(Inches(10), Inches(4), Inches(6), COLORS['dark2'], decorative=True)
+    s.rect(Inches(0), Inches(0), s.width, Inches(0.08), COLORS['accent'])
+
+    # 主文
+    s.text(Inches(1), Inches(1.5), Inches(11), Inches(0.5),
+           data['lead'], font_size=20, color=COLORS['light2'])
+
+    s.text(Inches(1), Inches(2.2), Inches(11), Inches(1.0),
+           data['title'], font_size=46, color=COLORS['white'], bold=True)
+
+    s.rect(Inches(1), Inches(3.5), Inches(3), Inches(0.04), COLORS['accent'])
+
+    # 聯絡資訊
+    contact_info = data['contact_info']
+    for top, (icon, info) in zip(geo.steps(4.0, 0.55, len(contact_info)), contact_info):
+        s.icon(Inches(1.2), top, Inches(0.4), Inches(0.4),
+               icon, font_size=18)
+        s.text(Inches(1.8), top + Inches(0.02), Inches(5), Inches(0.4),
+               info, font_size=18, color=COLORS['light2'])
+
+    # CTA 按鈕
+    cta_title, cta_note = data['primary_cta']
+    s.rounded_rect(Inches(8.0), Inches(3.8), Inches(4.5), Inches(1.5), COLORS['accent'])
+    s.text(Inches(8.0), Inches(4.0), Inches(4.5), Inches(0.5),
+           cta_title, font_size=28, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+    s.text(Inches(8.0), Inches(4.5), Inches(4.5), Inches(0.4),
+           cta_note, font_size=16, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+
+    demo_title, demo_note = data['secondary_cta']
+    s.rounded_rect(Inches(8.0), Inches(5.5), Inches(4.5), Inches(1.0), COLORS['primary'])
+    s.text(Inches(8.0), Inches(5.6), Inches(4.5), Inches(0.5),
+           demo_title, font_size=24, color=COLORS['white'], bold=True, alignment=PP_ALIGN.CENTER)
+    s.text(Inches(8.0), Inches(6.05), Inches(4.5), Inches(0.35),
+           demo_note, font_size=14, color=COLORS['light2'], alignment=PP_ALIGN.CENTER)
+
+    # 底部
+    s.text(Inches(0), Inches(6.8), s.width, Inches(0.4),
+           data['footer'], font_size=12, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+
+# =========================================================
+# 學員報告 1：學習概況
+# =========================================================
+@layout('report_summary')
+def compile_report_summary(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    # 數據卡片
+    stats = data['stats']
+    for left, (num, label, color) in zip(geo.steps(0.5, 3.15, len(stats)), stats):
+        s.stat_card(left, Inches(1.5), num, label, COLORS[color])
+
+    # 風險等級
+    icon, level, action, color = data['risk']
+    color = COLORS[color]
+    s.rounded_rect(Inches(0.5), Inches(3.5), Inches(6.0), Inches(3.7), COLORS['dark'])
+    s.rect(Inches(0.5), Inches(3.5), Inches(0.08), Inches(3.7), color)
+    s.text(Inches(0.8), Inches(3.7), Inches(5), Inches(0.4),
+           data['risk_title'], font_size=20, color=COLORS['white'], bold=True)
+    s.icon(Inches(0.8), Inches(4.4), Inches(0.8), Inches(0.7), icon, font_size=36)
+    s.text(Inches(1.7), Inches(4.4), Inches(4.5), Inches(0.7),
+           level, font_size=36, color=color, bold=True)
+    s.text(Inches(0.8), Inches(5.4), Inches(5.4), Inches(0.4),
+           f'建議行動：{action}', font_size=15, color=COLORS['light2'])
+    s.text(Inches(0.8), Inches(6.5), Inches(5.4), Inches(0.4),
+           data['footer'], font_size=11, color=COLORS['text_light'])
+
+    # 風險訊號
+    s.rounded_rect(Inches(6.8), Inches(3.5), Inches(5.8), Inches(3.7), COLORS['white'])
+    s.text(Inches(7.1), Inches(3.7), Inches(5), Inches(0.4),
+           data['factors_title'], font_size=20, color=COLORS['primary'], bold=True)
+    factors = data['factors']
+    for top, (icon, label) in zip(geo.steps(4.3, 0.5, len(factors)), factors):
+        s.icon(Inches(7.1), top, Inches(0.5), Inches(0.4), icon, font_size=18)
+        s.text(Inches(7.7), top + Inches(0.02), Inches(4.6), Inches(0.4),
+               label, font_size=15, color=COLORS['text_dark'])
+    if not factors:
+        s.text(Inches(7.1), Inches(4.3), Inches(5.2), Inches(0.4),
+               data['no_factors'], font_size=15, color=COLORS['green_check'])
+
+
+# =========================================================
+# 學員報告 2：學習趨勢
+# =========================================================
+@layout('report_trend')
+def compile_report_trend(s, data):
+    s.background(COLORS['light'])
+    s.header(data['title'], data.get('subtitle'))
+
+    panels = (
+        (0.5, 6.0, data['scores_title'], data['scores'], 'line', 'General', COLORS['accent']),
+        (6.8, 5.8, data['attendance_title'], data['weekly'], 'bar', '0"%"', COLORS['secondary']),
+    )
+    for left, width, title, points, chart_type, number_format, color in panels:
+        s.rounded_rect(Inches(left), Inches(1.6), Inches(width), Inches(5.5), COLORS['white'])
+        s.text(Inches(left + 0.3), Inches(1.75), Inches(width - 1), Inches(0.4),
+               title, font_size=20, color=COLORS['primary'], bold=True)
+        if points:
+            s.chart(Inches(left + 0.3), Inches(2.3), Inches(width - 0.6), Inches(4.5), chart_type,
+                    [label for label, _ in points], {title: [value for _, value in points]}, [color],
+                    number_format=number_format, font_size=12)
+        else:
+            s.text(Inches(left + 0.3), Inches(4.0), Inches(width - 0.6), Inches(0.5),
+                   data['empty_note'], font_size=16, color=COLORS['text_light'], alignment=PP_ALIGN.CENTER)
+
+
+# ====== 編譯 & 輸出 ======
+def compile_slide(spec, data):
+    """將單頁 spec 編譯成 SlidePlan"""
+    try:
+        compile_fn = LAYOUTS[data['layout']]
+    except KeyError:
+        raise ValueError(f"未知的版型：{data.get('layout')!r}") from None
+    s = SlidePlan(data['layout'], Inches(spec.get('slide_width', 13.333)),
+                  Inches(spec.get('slide_height', 7.5)), spec.get('brand_tag', '94Cram 智慧補教'))
+    compile_fn(s, data)
+    return s
+
+
+def compile_deck(spec):
+    """將整份 deck spec 編譯成 DeckPlan
+
+    某頁的內容不合版型（欄位型別、列的欄數、未知的色名）時引發 ValueError，訊息註明頁碼。
+    """
+    slides = []
+    for i, data in enumerate(spec['slides'], 1):
+        try:
+            slides.append(compile_slide(spec, data))
+        except (KeyError, TypeError, ValueError) as e:
+            detail = f'找不到 {e}' if isinstance(e, KeyError) else str(e)
+            raise ValueError(f"第 {i} 頁（{data.get('layout')}）：{detail}") from e
+    return DeckPlan(Inches(spec.get('slide_width', 13.333)), Inches(spec.get('slide_height', 7.5)), slides)
+
+
+# ====== 文字框合併 ======
+# 同一欄上下相疊的文字框（卡片的標題與描述、表格同一欄的各列）合併成一個多段落
+# 的文字框：第二段起以 space_before 補足原本兩框之間的距離。
+# 只在輸出 .pptx 且明確啟用（write_deck 的 merge_text、CLI 的 --merge-text）時進行；
+# 版面檢查、縮圖與 HTML 仍使用原本的形狀計畫。
+#
+# 各行高度依 textfit 的字型模型（行高 1.3 em、估計字寬）計算，不是實際字型的量測值，
+# 因此預設不啟用；啟用前以 merge_drift 檢查合併後各段的位置。上方段落必須確定
+# 不會自動換行（最寬一行不超過可用寬度的 MERGE_SLACK）；中間夾著的形狀與上方
+# 文字框重疊時不合併，以免改變前後順序。
+MERGE_SLACK = 0.9
+
+
+def _line_count(shape):
+    """文字框的行數；可能自動換行時回傳 None"""
+    props = shape.props
+    usable = shape.width - 2 * textfit.INSET_X
+    if textfit.text_width(props['text'], props['font_size'], props['font_name'], props['bold']) > usable * MERGE_SLACK:
+        return None
+    return len(_LINE_BREAK.split(props['text']))
+
+
+def _covers(shape, box):
+    left, top, right, bottom = box
+    return (shape.left < right and left < shape.left + shape.width
+            and shape.top < bottom and top < shape.top + shape.height)
+
+
+def merge_text_shapes(shapes):
+    """將上下相疊、同 left 同寬的文字框合併成 'paragraphs' 形狀，回傳新的形狀清單"""
+    out = []
+    stacks = {}         # (left, width) -> out 中仍可往下接的 'paragraphs' 索引
+    for shape in shapes:
+        if shape.kind != 'text':
+            out.append(shape)
+            continue
+        index = stacks.get((shape.left, shape.width))
+        stack = out[index] if index is not None else None
+        last = stack.props['paragraphs'][-1] if stack is not None else None
+        if last is not None and last['_lines'] is not None:
+            below = last['_top'] + last['_lines'] * round(
+                last['font_size'] * textfit.EMU_PER_PT * textfit.font_metrics(last['font_name']).line_height)
+            gap = shape.top - below
+            covered = any(_covers(other, (stack.left, stack.top, stack.left + stack.width, below))
+                          for other in out[index + 1:])
+            if gap >= 0 and not covered:
+                del out[index]
+                paragraphs = stack.props['paragraphs'] + [dict(shape.props, space_before=Emu(gap), space_after=None,
+                                                               _top=shape.top, _lines=_line_count(shape))]
+                bottom = max(stack.top + stack.height, shape.top + shape.height)
+                out.append(Shape('paragraphs', stack.left, stack.top, stack.width, bottom - stack.top,
+                                 {'paragraphs': paragraphs}))
+                stacks = {key: i - (i > index) for key, i in stacks.items() if i != index}
+                stacks[(shape.left, shape.width)] = len(out) - 1
+                continue
+        out.append(Shape('paragraphs', shape.left, shape.top, shape.width, shape.height,
+                         {'paragraphs': [dict(shape.props, _top=shape.top, _lines=_line_count(shape))]}))
+        stacks[(shape.left, shape.width)] = len(out) - 1
+    return [_unstack(shape) for shape in out]
+
+
+def _unstack(shape):
+    """只有一段的 'paragraphs' 還原成原本的文字框"""
+    if shape.kind != 'paragraphs':
+        return shape
+    paragraphs = [{key: value for key, value in para.items() if not key.startswith('_')}
+                  for para in shape.props['paragraphs']]
+    if len(paragraphs) == 1:
+        return shape._replace(kind='text', props=paragraphs[0])
+    return shape._replace(props={'paragraphs': paragraphs})
+
+
+def merge_drift(deck):
+    """比較合併前後各段文字的位置，回傳位移超過 lint.TOLERANCE 的 Issue（kind 為 merge_drift）
+
+    合併後的位置由輸出的 slide XML 讀回：文字框上緣、內距、各段的 space_before／
+    space_after，加上依 textfit 在完整寬度下換行後的行數與行高；與合併前同一段
+    文字的文字框上緣比較。
+    """
+    prs = new_presentation(deck.width, deck.height)
+    issues = []
+    for number, plan in enumerate(deck.slides, 1):
+        before = {}
+        for i, shape in enumerate(plan.shapes):
+            if shape.kind == 'text':
+                text = _LINE_BREAK.sub('\v', shape.props['text'])
+                before.setdefault((shape.left, text), []).append((shape.top, i))
+        slide = render_slide(prs, plan, merge_text=True)
+        for sp in slide.shapes:
+            if not sp.has_text_frame or len(sp.text_frame.paragraphs) < 2:
+                continue
+            frame = sp.text_frame
+            y = sp.top + frame.margin_top
+            for k, para in enumerate(frame.paragraphs):
+                if k:
+                    y += para.space_before or 0
+                # 字級、粗體與字型設在 a:pPr/a:defRPr（見 _PARA_XML）
+                rpr = para._pPr.find(qn('a:defRPr'))
+                size, bold = int(rpr.get('sz')) / 100, rpr.get('b') == '1'
+                font_name = rpr.find(qn('a:latin')).get('typeface')
+                # 同一欄可能有相同文字（表格的 ✓ ✗）：取位置最接近、尚未比對過的一個
+                candidates = before.get((sp.left, para.text))
+                if candidates:
+                    top, i = min(candidates, key=lambda item: abs(y - frame.margin_top - item[0]))
+                    candidates.remove((top, i))
+                    drift = y - frame.margin_top - top
+                    if abs(drift) > layout_lint.TOLERANCE:
+                        issues.append(layout_lint.Issue(
+                            number, 'merge_drift', i, None,
+                            f'{layout_lint._snippet(plan.shapes[i])} 合併後位移 {layout_lint._inches(drift)}'))
+                lines = textfit.wrap(para.text, sp.width, size, font_name, bold)
+                y += len(lines) * round(size * textfit.EMU_PER_PT * textfit.font_metrics(font_name).line_height)
+                y += para.space_after or 0
+    return issues
+
+
+def emit_shapes(slide, shapes):
+    """依序將 Shape 透過工具函數畫到投影片上，回傳建立的 pptx 形狀"""
+    out = []
+    for kind, left, top, width, height, props in shapes:
+        if kind == 'text':
+            out.append(add_text(slide, left, top, width, height, props['text'],
+                                font_size=props['font_size'], color=props['color'], bold=props['bold'],
+                                alignment=props['alignment'], font_name=props['font_name']))
+        elif kind == 'rect':
+            out.append(add_rect(slide, left, top, width, height, props['color'], alpha=props['alpha']))
+        elif kind == 'rounded_rect':
+            out.append(add_rounded_rect(slide, left, top, width, height, props['color'], alpha=props['alpha']))
+        elif kind == 'circle':
+            out.append(add_circle(slide, left, top, width, props['color'], alpha=props['alpha']))
+        elif kind == 'chart':
+            out.append(add_chart(slide, left, top, width, height, **props))
+        elif kind == 'image':
+            out.append(add_image(slide, left, top, width, height, props['path'], props['fit']))
+        elif kind == 'paragraphs':
+            first, *rest = props['paragraphs']
+            shape = add_text(slide, left, top, width, height, **first)
+            for para in rest:
+                add_para(shape.text_frame, **para)
+            out.append(shape)
+        else:
+            raise ValueError(f'未知的形狀種類：{kind!r}')
+    return out
+
+
+# ====== 基本範本 ======
+# python-pptx 內建範本有 11 種版面配置、縮圖與印表機設定，本產生器只用空白版面配置。
+# 每種投影片尺寸第一次使用時，裁掉其餘部分並設定尺寸與佈景主題配色，存成不壓縮
+# 的 zip；之後每份簡報都從記憶體中的這份範本開啟，不必再解壓與處理整個內建範本。
+BLANK_LAYOUT = 'Blank'
+_TRIMMED_RELS = (RT.THUMBNAIL, RT.PRINTER_SETTINGS)
+
+
+@functools.lru_cache(maxsize=None)
+def _base_template(width, height):
+    """裁剪後的基本範本（不壓縮的 .pptx 位元組）"""
+    prs = Presentation()
+    prs.slide_width = width
+    prs.slide_height = height
+    theme_part = prs.slide_master.part.part_related_by(RT.THEME)
+    theme_part._blob = _theme_blob(theme_part.blob)
+    for slide_layout in list(prs.slide_layouts):
+        if slide_layout.name != BLANK_LAYOUT:
+            prs.slide_layouts.remove(slide_layout)
+    for rels in (prs.part.package._rels, prs.part.rels):
+        for rId in [rId for rId, rel in rels.items() if rel.reltype in _TRIMMED_RELS]:
+            rels.pop(rId)
+
+    packed = io.BytesIO()
+    prs.save(packed)
+    stored = io.BytesIO()
+    with zipfile.ZipFile(packed) as src, zipfile.ZipFile(stored, 'w', zipfile.ZIP_STORED) as dst:
+        for info in src.infolist():
+            dst.writestr(info.filename, src.read(info))
+    return stored.getvalue()
+
+
+def new_presentation(width=Inches(13.333), height=Inches(7.5)):
+    """建立空白寬螢幕簡報（只有空白版面配置，見 blank_layout）"""
+    return Presentation(io.BytesIO(_base_template(int(width), int(height))))
+
+
+def blank_layout(prs):
+    """new_presentation 建立的簡報中唯一的版面配置：空白"""
+    return prs.slide_layouts[0]
+
+
+def render_slide(prs, plan, merge_text=False):
+    """在簡報尾端新增一頁，並輸出 SlidePlan；`merge_text` 時合併相疊的文字框（見 merge_text_shapes）"""
+    slide = prs.slides.add_slide(blank_layout(prs))
+    # 只新增不刪除形狀，快取最大 shape id，避免每次新增都搜尋整棵 spTree
+    slide.shapes.turbo_add_enabled = True
+    if plan.bg is not None:
+        add_bg(slide, plan.bg)
+    emit_shapes(slide, merge_text_shapes(plan.shapes) if merge_text else plan.shapes)
+    return slide
+
+
+def render_deck(deck, merge_text=False):
+    """將 DeckPlan 輸出成 Presentation"""
+    prs = new_presentation(deck.width, deck.height)
+    for plan in deck.slides:
+        render_slide(prs, plan, merge_text)
+    return prs
+
+
+# ====== 投影片快取 ======
+# 以每頁的輸入（形狀參數、用到的 COLORS、投影片尺寸）計算內容雜湊，
+# 將序列化後的 slide XML 存在磁碟上；內容沒變的頁面直接接回輸出的 zip，
+# 不再經過 python-pptx 建立形狀。
+CACHE_VERSION = 6
+
+
+def slide_key(plan, width, height, merge_text=False):
+    """計算單頁投影片的內容雜湊"""
+    payload = json.dumps({
+        'version': [CACHE_VERSION, pptx.__version__, assets.ASSET_VERSION, assets.IMAGE_DPI],
+        'merge_text': merge_text,
+        'size': [width, height],
+        'layout': plan.layout,
+        'bg': plan.bg,
+        'shapes': plan.shapes,
+    }, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SlideCache:
+    """以內容雜湊為 key 的 slide XML 磁碟快取（LRU 淘汰）
+
+    `suffix` 為快取檔的副檔名；同一目錄可依副檔名存放不同種類的內容（如縮圖），
+    各自計算數量與淘汰。
+    """
+
+    def __init__(self, directory, max_entries=512, suffix='.xml'):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}{self.suffix}')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        # 更新修改時間作為最近使用紀錄
+        os.utime(path)
+        self.hits += 1
+        return blob
+
+    def put(self, key, blob):
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+
+    def prune(self):
+        """超過 max_entries 時淘汰最久未使用的項目"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix):
+                entries.append((entry.stat().st_mtime, entry.path))
+        if len(entries) <= self.max_entries:
+            return 0
+        entries.sort()
+        stale = entries[:len(entries) - self.max_entries]
+        for _, path in stale:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return len(stale)
+
+
+class _SplicedPart:
+    """以既有的 slide XML 代替 part 序列化結果，其餘屬性轉交原 part"""
+
+    def __init__(self, part, blob):
+        self._part = part
+        self.blob = blob
+
+    def __getattr__(self, name):
+        return getattr(self._part, name)
+
+
+def save_package(prs, output, parts=None, date_time=None):
+    """將簡報寫入 `output`（路徑，或任何可寫入的二進位串流）
+
+    與 prs.save 相同，由 python-pptx 的 PackageWriter 逐一序列化 part 並立即寫入 zip；
+    `parts`（partname -> bytes）指定的 part 直接寫入快取 / 子行程產生的 XML，
+    不必先存成完整的 zip 再複製一次。`output` 無法 seek 時（stdout、socket、HTTP
+    回應）zipfile 會改用 data descriptor 逐筆寫出，仍是合法的 pptx。
+    指定 `date_time` 時所有 zip entry 使用該固定時間（見可重現輸出）。
+    """
+    package = prs.part.package
+    pkg_parts = tuple(package.iter_parts())
+    if parts:
+        pkg_parts = tuple(_SplicedPart(part, parts[str(part.partname)]) if str(part.partname) in parts
+                          else part for part in pkg_parts)
+    if date_time is None:
+        PackageWriter.write(output, package._rels, pkg_parts)
+    else:
+        _PinnedPackageWriter(output, package._rels, pkg_parts, date_time)._write()
+
+
+# ====== 可重現輸出 ======
+# 一般輸出的 zip entry 帶有存檔當下的時間，同一份 spec 每次輸出的位元組都不同。
+# --reproducible 將 zip 時間戳、entry 屬性與 core properties 日期固定為
+# SOURCE_DATE_EPOCH（reproducible-builds.org 慣例），未設定時使用 zip 可表示的
+# 最早時間 1980-01-01。shape id 與 relationship 編號本來就依輸出順序決定，
+# 快取與平行輸出也與循序輸出一致，因此相同輸入即得到相同的檔案雜湊。
+SOURCE_DATE_EPOCH_ENV = 'SOURCE_DATE_EPOCH'
+ZIP_EPOCH = 315532800   # 1980-01-01T00:00:00Z
+
+
+def reproducible_timestamp():
+    """可重現輸出使用的固定時間（UTC，naive datetime）"""
+    epoch = max(int(os.environ.get(SOURCE_DATE_EPOCH_ENV) or ZIP_EPOCH), ZIP_EPOCH)
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).replace(tzinfo=None)
+
+
+class _PinnedZipWriter:
+    """與 python-pptx 的 zip writer 相同，但每個 entry 使用固定的時間與屬性"""
+
+    def __init__(self, output, date_time):
+        self._zipf = zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._date_time = date_time.timetuple()[:6]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._zipf.close()
+
+    def write(self, pack_uri, blob):
+        info = zipfile.ZipInfo(pack_uri.membername, self._date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.create_system = 3              # 不論在哪個平台輸出都記為 Unix
+        info.external_attr = 0o600 << 16    # 與 ZipFile.writestr(name, ...) 預設相同
+        self._zipf.writestr(info, blob)
+
+
+class _PinnedPackageWriter(PackageWriter):
+    """以 _PinnedZipWriter 寫出的 PackageWriter"""
+
+    def __init__(self, pkg_file, pkg_rels, parts, date_time):
+        super().__init__(pkg_file, pkg_rels, parts)
+        self._date_time = date_time
+
+    def _write(self):
+        with _PinnedZipWriter(self._pkg_file, self._date_time) as phys_writer:
+            self._write_content_types_stream(phys_writer)
+            self._write_pkg_rels(phys_writer)
+            self._write_parts(phys_writer)
+
+
+def deck_key(deck, date_time=None, merge_text=False):
+    """計算整份簡報的輸入雜湊（各頁 slide_key、投影片尺寸與固定時間）
+
+    可重現輸出時，相同的 deck_key 保證得到相同位元組的 .pptx。
+    """
+    payload = json.dumps({
+        'version': [CACHE_VERSION, pptx.__version__],
+        'size': [deck.width, deck.height],
+        'date_time': date_time,
+        'slides': [slide_key(plan, deck.width, deck.height, merge_text) for plan in deck.slides],
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# ====== 平行輸出 ======
+def _render_slide_blobs(width, height, plans, images=(), merge_text=False):
+    """子行程：在獨立的 Presentation 中輸出多頁，回傳各頁的 slide XML
+
+    `images` 為主行程處理好的圖片（見 _image_requests），子行程不必重新縮圖。
+    """
+    assets.preload(images)
+    prs = new_presentation(width, height)
+    return [render_slide(prs, plan, merge_text).part.blob for plan in plans]
+
+
+def render_parallel(deck, indexes, jobs, merge_text=False):
+    """以 process pool 輸出 `indexes` 指定的頁面，回傳 {index: slide XML}"""
+    # 每個 worker 拿一組相鄰的頁面，減少行程間傳遞與 Presentation 建立次數
+    size = -(-len(indexes) // jobs)
+    groups = [indexes[i:i + size] for i in range(0, len(indexes), size)]
+    blobs = {}
+    with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+        futures = []
+        for group in groups:
+            plans = [deck.slides[i] for i in group]
+            images = [(request, assets.prepare(*request)) for request in dict.fromkeys(_image_requests(plans))]
+            futures.append((group, pool.submit(_render_slide_blobs, deck.width, deck.height, plans, images,
+                                                   merge_text)))
+        for group, future in futures:
+            blobs.update(zip(group, future.result()))
+    return blobs
+
+
+# ====== 輸出簡報 ======
+def write_deck(deck, output, cache=None, jobs=1, reproducible=False, merge_text=False):
+    """輸出 DeckPlan 至 `output`（路徑或可寫入的二進位串流，見 save_package）
+
+    有快取時只重建內容變動的頁面；`jobs` 大於 1 時，需要重建的頁面分給
+    子行程輸出，再併回同一份簡報。各頁只依賴空白版面配置（slideLayout7），
+    由主行程依序建立佔位頁，relationship 編號與循序輸出完全一致；有圖片的頁面
+    在佔位頁依相同順序加入圖片 part（見 _link_images），r:embed 的 rId 不變。
+    `reproducible` 時固定時間戳，相同輸入輸出相同位元組；`merge_text` 見 merge_text_shapes。
+    """
+    date_time = reproducible_timestamp() if reproducible else None
+    _prepare_images(deck, cache)
+    if cache is None and jobs <= 1:
+        prs = render_deck(deck, merge_text)
+        _pin_core_properties(prs, date_time)
+        save_package(prs, output, date_time=date_time)
+        return prs
+
+    blobs = {}
+    keys = {}
+    splicable = [i for i, plan in enumerate(deck.slides) if _splicable(plan)]
+    if cache is not None:
+        for i in splicable:
+            keys[i] = slide_key(deck.slides[i], deck.width, deck.height, merge_text)
+            blob = cache.get(keys[i])
+            if blob is not None:
+                blobs[i] = blob
+
+    missing = [i for i in splicable if i not in blobs]
+    if jobs > 1 and len(missing) > 1:
+        rendered = render_parallel(deck, missing, jobs, merge_text)
+        blobs.update(rendered)
+        if cache is not None:
+            for i, blob in rendered.items():
+                cache.put(keys[i], blob)
+
+    prs = new_presentation(deck.width, deck.height)
+    parts = {}
+    for i, plan in enumerate(deck.slides):
+        if i in blobs:
+            # 空白頁佔位，存檔時改寫入既有的 slide XML
+            slide = prs.slides.add_slide(blank_layout(prs))
+            _link_images(slide, plan)
+            parts[str(slide.part.partname)] = blobs[i]
+        else:
+            slide = render_slide(prs, plan, merge_text)
+            if i in keys:
+                cache.put(keys[i], slide.part.blob)
+    if cache is not None:
+        cache.prune()
+
+    _pin_core_properties(prs, date_time)
+    save_package(prs, output, parts, date_time)
+    return prs
+
+
+def _splicable(plan):
+    """頁面除了 slide XML 只引用圖片 part 時，才能快取或由子行程輸出後接回
+
+    圖表另有內嵌活頁簿與 chart part，一律在主行程輸出。
+    """
+    return all(shape.kind != 'chart' for shape in plan.shapes)
+
+
+def _image_requests(plans):
+    """各頁依輸出順序用到的圖片 (path, width, height, fit)"""
+    return [(shape.props['path'], shape.width, shape.height, shape.props['fit'])
+            for plan in plans for shape in plan.shapes if shape.kind == 'image']
+
+
+def _link_images(slide, plan):
+    """接回的頁面依 add_image 的順序加入圖片 relationship，rId 與 slide XML 中的 r:embed 一致"""
+    for path, width, height, fit in _image_requests([plan]):
+        slide.part.get_or_add_image_part(io.BytesIO(assets.prepare(path, width, height, fit)))
+
+
+def _prepare_images(deck, cache=None):
+    """輸出前以 thread pool 處理整份簡報用到的圖片，add_image 之後直接取用記憶體中的結果
+
+    有投影片快取目錄時，處理後的圖片也存在同一目錄（副檔名 .img）。
+    """
+    requests = _image_requests(deck.slides)
+    if not requests:
+        return
+    directory = getattr(cache, 'directory', None)
+    image_cache = SlideCache(directory, cache.max_entries, suffix='.img') if directory else None
+    assets.prepare_many(requests, os.cpu_count() or 1, image_cache)
+    if image_cache is not None:
+        image_cache.prune()
+
+
+def _pin_core_properties(prs, date_time):
+    """可重現輸出時，將 core properties 的建立 / 修改日期固定為 `date_time`"""
+    if date_time is not None:
+        prs.core_properties.created = date_time
+        prs.core_properties.modified = date_time
+
+
+def write_artifact(deck, output, directory, cache=None, jobs=1, merge_text=False):
+    """可重現輸出，並以 deck_key 為檔名存入成品目錄
+
+    成品已存在時直接複製到 `output`，完全不重新輸出。回傳 (deck_key, 是否命中)。
+    """
+    key = deck_key(deck, reproducible_timestamp(), merge_text)
+    path = os.path.join(directory, f'{key}.pptx')
+    hit = os.path.exists(path)
+    if not hit:
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        write_deck(deck, tmp_path, cache, jobs, reproducible=True, merge_text=merge_text)
+        os.replace(tmp_path, path)
+    if isinstance(output, (str, os.PathLike)):
+        if os.path.abspath(output) != os.path.abspath(path):
+            shutil.copyfile(path, output)
+    else:
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, output)
+    return key, hit
+
+
+# ====== 效能剖析 ======
+# 由 CLI 的 --profile 或環境變數 PPT_PROFILE 啟用（見 cli.py）。
+# 啟用期間以計數包裝暫時取代模組層級的形狀工具函數與 render_slide，關閉後還原，
+# 未啟用時輸出流程完全不受影響。tracemalloc 會拖慢執行，耗時僅供頁面間相對比較。
+PROFILED_HELPERS = ('add_bg', 'add_rect', 'add_rounded_rect', 'add_circle', 'add_text', 'add_para', 'add_chart',
+                    'add_image')
+
+SlideProfile = namedtuple('SlideProfile', 'index layout shapes paragraphs xml_bytes seconds peak_bytes')
+
+
+class SlideProfiler:
+    """逐頁記錄各種形狀數、段落數、slide XML 大小、耗時與記憶體配置峰值"""
+
+    def __init__(self):
+        self.rows = []
+        self._counts = None
+        self._saved = {}
+
+    def __enter__(self):
+        namespace = globals()
+        for name in PROFILED_HELPERS:
+            self._saved[name] = namespace[name]
+            namespace[name] = self._count(name[len('add_'):], namespace[name])
+        self._saved['render_slide'] = namespace['render_slide']
+        namespace['render_slide'] = self._measure(namespace['render_slide'])
+        tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        tracemalloc.stop()
+        globals().update(self._saved)
+        self._saved = {}
+
+    def _count(self, kind, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if self._counts is not None:
+                self._counts[kind] = self._counts.get(kind, 0) + 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    def _measure(self, fn):
+        @functools.wraps(fn)
+        def wrapper(prs, plan, *args):
+            self._counts = {}
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            start = time.perf_counter()
+            slide = fn(prs, plan, *args)
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            self.rows.append(SlideProfile(
+                index=len(self.rows) + 1,
+                layout=plan.layout,
+                shapes=self._counts,
+                paragraphs=len(slide.shapes._spTree.findall('.//' + qn('a:p'))),
+                xml_bytes=len(slide.part.blob),
+                seconds=seconds,
+                peak_bytes=peak - base,
+            ))
+            self._counts = None
+            return slide
+        return wrapper
+
+    def report(self):
+        """可寫成 JSON 的剖析結果"""
+        return {
+            'slides': [row._asdict() for row in self.rows],
+            'total': {
+                'shapes': sum(n for row in self.rows for kind, n in row.shapes.items()
+                              if kind not in ('bg', 'para')),
+                'paragraphs': sum(row.paragraphs for row in self.rows),
+                'xml_bytes': sum(row.xml_bytes for row in self.rows),
+                'seconds': sum(row.seconds for row in self.rows),
+                'peak_bytes': max((row.peak_bytes for row in self.rows), default=0),
+            },
+        }
+
+    def print_table(self):
+        kinds = [name[len('add_'):] for name in PROFILED_HELPERS]
+        print(f'{"頁":>3} {"版型":<14}' + ''.join(f'{kind:>{len(kind) + 1}}' for kind in kinds)
+              + f'{"段落":>6}{"XML KB":>9}{"ms":>9}{"峰值 KB":>9}')
+        for row in self.rows:
+            print(f'{row.index:>3} {row.layout:<14}'
+                  + ''.join(f'{row.shapes.get(kind, 0):>{len(kind) + 1}}' for kind in kinds)
+                  + f'{row.paragraphs:>6}{row.xml_bytes / 1024:>9.1f}{row.seconds * 1000:>9.1f}'
+                  + f'{row.peak_bytes / 1024:>9.1f}')
+        total = self.report()['total']
+        print(f'合計 {total["shapes"]} 個形狀、{total["paragraphs"]} 段、'
+              f'XML {total["xml_bytes"] / 1024:.1f} KB、{total["seconds"]:.2f} s')
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+
+# ====== 分校批次輸出 ======
+# 成本比較表中的一次性支出項目；3 年總計 = 一次性支出 + 3 ×（年度授權 + 維護費用）
+ONE_TIME_COSTS = ('建置費', '硬體採購')
+# 重算 3 年總計需要的列；cost_compare 缺少其中任何一列時整張表維持原樣
+COST_ROWS = ONE_TIME_COSTS + ('維護費用', '3 年總計')
+
+
+def _amount(text):
+    """取出字串中的數字，例如 'NT$2,999/月' -> 2999"""
+    digits = re.sub(r'[^0-9]', '', text)
+    return int(digits) if digits else 0
+
+
+def check_branch_spec(spec):
+    """檢查 deck spec 能否套用分校數據，回傳問題清單（空清單代表可以）
+
+    有成本試算（cost）頁時需要 plans 頁挑選方案；流失預警（churn）頁的風險等級
+    必須與 snapshot.RISK_LEVELS 一一對應。cost_compare 的列名不符時不算問題，
+    該表維持原樣（見 personalize_spec）。
+    """
+    problems = []
+    layouts = [data['layout'] for data in spec['slides']]
+    for i, data in enumerate(spec['slides'], 1):
+        if data['layout'] == 'cost':
+            if 'plans' not in layouts:
+                problems.append(f'第 {i} 頁（cost）依學員數挑選方案，但 spec 中沒有 plans 頁')
+            if any(len(row) != 3 for row in data['cost_compare']):
+                problems.append(f'第 {i} 頁（cost）：cost_compare 每列必須是 [項目, 94Cram, 對照]')
+        elif data['layout'] == 'plans':
+            if not data['plans'] or any(len(row) < 3 for row in data['plans']):
+                problems.append(f'第 {i} 頁（plans）：plans 必須至少一列，每列含名稱、月費與學員上限')
+        elif data['layout'] == 'churn':
+            levels = branch_snapshot.RISK_LEVELS
+            if len(data['risk_levels']) != len(levels):
+                problems.append(f"第 {i} 頁（churn）：risk_levels 必須依序有 {len(levels)} 列"
+                                f"（{'、'.join(levels)}），目前 {len(data['risk_levels'])} 列")
+            elif any(len(row) != 5 for row in data['risk_levels']):
+                problems.append(f'第 {i} 頁（churn）：risk_levels 每列必須是 [圖標, 等級, 人數, 處置, 顏色]')
+    return problems
+
+
+def _pick_plan(spec, students):
+    """依在籍學員數挑選服務方案，回傳 (方案名稱, 月費)"""
+    plans = next(d['plans'] for d in spec['slides'] if d['layout'] == 'plans')
+    for name, price, cap, *_ in plans:
+        if students <= _amount(cap):
+            return name, _amount(price)
+    name, price = plans[-1][0], plans[-1][1]
+    return name, _amount(price)
+
+
+def _cost_compare(rows, monthly):
+    """依方案月費重算成本比較表；缺少 COST_ROWS 中的列時回傳原表，對照的 3 年總計為 0 時不改「節省」"""
+    amounts = {item: (ours, theirs) for item, ours, theirs in rows}
+    if any(item not in amounts for item in COST_ROWS):
+        return rows
+    one_time = sum(_amount(amounts[k][0]) for k in ONE_TIME_COSTS)
+    total = one_time + 3 * (monthly * 12 + _amount(amounts['維護費用'][0]))
+    rival = _amount(amounts['3 年總計'][1])
+    cost_compare = []
+    for item, ours, theirs in rows:
+        if item == '年度授權':
+            ours = f'NT${monthly * 12:,}'
+        elif item == '3 年總計':
+            ours = f'NT${total:,}'
+        elif item == '節省' and rival:
+            theirs = f'{1 - total / rival:.0%}↓'
+        cost_compare.append([item, ours, theirs])
+    return cost_compare
+
+
+def personalize_spec(spec, branch, figures, days_back=60):
+    """以分校數據覆寫 deck spec 中的靜態數字，只複製有變動的頁面
+
+    `spec` 須通過 check_branch_spec。
+    """
+    slides = []
+    for data in spec['slides']:
+        if data['layout'] == 'cover':
+            data = dict(data, date=f"{branch.tenant_name} {branch.name} · {data['date']}")
+        elif data['layout'] == 'churn':
+            data = dict(data, risk_levels=[
+                [icon, level, f'{figures.risk_counts[key]} 名學員', action, color]
+                for key, (icon, level, _, action, color)
+                in zip(branch_snapshot.RISK_LEVELS, data['risk_levels'])
+            ])
+        elif data['layout'] == 'cost':
+            plan_name, monthly = _pick_plan(spec, figures.active_students)
+            rate = figures.attendance_rate
+            data = dict(data, cost_compare=_cost_compare(data['cost_compare'], monthly), stats=[
+                [str(figures.active_students), '在籍學員', 'primary'],
+                [f'{rate:.0%}' if rate is not None else '—', f'近 {days_back} 天出勤率', 'secondary'],
+                [f'NT${figures.collected:,}', f'近 {days_back} 天收款', 'accent'],
+                [plan_name, '建議方案', 'green_check'],
+            ])
+        slides.append(data)
+    return dict(spec, slides=slides)
+
+
+def _build_spec(spec, output, cache_dir=None, cache_size=512, reproducible=False, lint=False):
+    """編譯並輸出單份 deck spec（供批次的子行程使用）；`lint` 時版面有問題則不輸出並拋出 ValueError"""
+    plan = compile_deck(spec)
+    if lint:
+        issues = layout_lint.lint_deck(plan)
+        if issues:
+            raise ValueError(f'{output}：' + '；'.join(map(layout_lint.format_issue, issues)))
+    cache = SlideCache(cache_dir, cache_size) if cache_dir else None
+    write_deck(plan, output, cache, reproducible=reproducible)
+    return output
+
+
+def build_branch_decks(spec, snapshot, out_dir, as_of=None, cache_dir=None, cache_size=512, jobs=1,
+                       reproducible=False, lint=False):
+    """依本地快照為每個分校輸出一份簡報，逐份回傳輸出路徑
+
+    快照每張表只讀一次；之後以 generator 逐份產生 spec 並輸出，平行時最多只有
+    2 × jobs 份簡報在處理中，記憶體用量與分校數量無關。spec 不能套用分校數據時
+    （見 check_branch_spec），在讀取快照、輸出任何簡報之前引發 ValueError。
+    """
+    problems = check_branch_spec(spec)
+    if problems:
+        raise ValueError('；'.join(problems))
+    branches = branch_snapshot.load_branches(snapshot)
+    figures = branch_snapshot.load_figures(snapshot, as_of)
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = (
+        (personalize_spec(spec, branch, figures.get(branch.tenant_id, branch_snapshot.EMPTY_FIGURES)),
+         os.path.join(out_dir, f'{branch.tenant_slug or branch.tenant_id}-{branch.id}.pptx'))
+        for branch in branches
+    )
+    if jobs <= 1:
+        for branch_spec, output in tasks:
+            yield _build_spec(branch_spec, output, cache_dir, cache_size, reproducible, lint)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for branch_spec, output in tasks:
+            pending.append(pool.submit(_build_spec, branch_spec, output, cache_dir, cache_size, reproducible, lint))
+            if len(pending) >= jobs * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ====== 學員報告批次輸出 ======
+# 每位學員一份報告：spec 依 decks/student_report.json 的文字範本套入該學員的數據。
+# 完成的報告逐筆記錄在輸出目錄的 manifest.tsv（學員 id、輸入雜湊、路徑），
+# 中斷後重新執行時，雜湊相同且檔案仍在的學員直接略過。
+REPORT_VERSION = 1
+REPORT_MANIFEST = 'manifest.tsv'
+
+
+def _short_date(day):
+    """'2026-09-21' -> '9/21'"""
+    _, month, day = str(day)[:10].split('-')
+    return f'{int(month)}/{int(day)}'
+
+
+def report_spec(spec, student, as_of, days_back=60):
+    """以單一學員的數據（snapshot.Student）套入報告範本 spec 的文字"""
+    fields = {
+        'name': student.name or f'學員 {str(student.id)[:8]}',
+        'tenant': student.tenant_name or '—',
+        'grade': student.grade or '—',
+        'as_of': as_of,
+        'days': days_back,
+        'exams': len(student.scores),
+    }
+    rate = student.attendance_rate
+    numbers = (
+        f'{rate:.0%}' if rate is not None else '—',
+        f'{student.present}/{student.sessions}',
+        str(student.scores[-1][1]) if student.scores else '—',
+        str(student.risk_score),
+    )
+    slides = []
+    for data in spec['slides']:
+        data = dict(data, title=data['title'].format(**fields), subtitle=data.get('subtitle', '').format(**fields))
+        if data['layout'] == 'report_summary':
+            data.update(
+                stats=[[num, label.format(**fields), color]
+                       for num, (label, color) in zip(numbers, data['stat_labels'])],
+                risk=data['risk_levels'][student.risk_level],
+                factors=[data['factors'][key] for key in student.risk_factors],
+            )
+        elif data['layout'] == 'report_trend':
+            data.update(
+                scores=[[_short_date(day), score] for day, score in student.scores],
+                weekly=[[_short_date(day), round(rate * 100)] for day, rate in student.weekly],
+            )
+        slides.append(data)
+    return dict(spec, slides=slides)
+
+
+def _read_manifest(path):
+    """讀取已完成的報告 {學員 id: 輸入雜湊}；中斷時寫到一半的最後一行略過"""
+    done = {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.endswith('\n') and line.count('\t') == 2:
+                    student_id, key, _ = line.split('\t')
+                    done[student_id] = key
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _open_manifest(path):
+    """以附加模式開啟 manifest；上次中斷留下不完整的最後一行時，先補上換行再接著寫"""
+    torn = False
+    with contextlib.suppress(FileNotFoundError), open(path, 'rb') as f:
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b'\n'
+    manifest = open(path, 'a', encoding='utf-8')
+    if torn:
+        manifest.write('\n')
+    return manifest
+
+
+def _build_report(spec, output, reproducible=False, lint=False):
+    """子行程：輸出單份報告到暫存檔再改名，中斷時不會留下不完整的 .pptx"""
+    tmp_path = f'{output}.{os.getpid()}.tmp'
+    _build_spec(spec, tmp_path, reproducible=reproducible, lint=lint)
+    os.replace(tmp_path, output)
+    return output
+
+
+def build_student_reports(spec, snapshot, out_dir, as_of=None, days_back=60, jobs=1,
+                          reproducible=False, lint=False):
+    """依本地快照為每位在籍學員輸出一份報告，逐份回傳 (輸出路徑, 是否重新輸出)
+
+    學員由 snapshot.iter_students 依 id 逐位讀出，spec 以 generator 逐份產生，平行時
+    最多只有 2 × jobs 份報告在處理中；除了 manifest 的學員 id 與雜湊外，記憶體用量
+    與學員數無關。報告存放於 out_dir/<補習班 slug>/<學員 id>.pptx。
+    """
+    as_of = as_of or datetime.date.today().isoformat()
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, REPORT_MANIFEST)
+    done = _read_manifest(manifest_path)
+    spec_digest = hashlib.sha256(json.dumps([REPORT_VERSION, spec, days_back], ensure_ascii=False,
+                                            sort_keys=True).encode('utf-8')).hexdigest()
+
+    def tasks():
+        folders = set()
+        for student in branch_snapshot.iter_students(snapshot, as_of, days_back):
+            student_id = str(student.id)
+            key = hashlib.sha256((spec_digest + json.dumps(student, ensure_ascii=False, default=str))
+                                 .encode('utf-8')).hexdigest()
+            folder = os.path.join(out_dir, str(student.tenant_slug or student.tenant_id))
+            output = os.path.join(folder, f'{student_id}.pptx')
+            if done.get(student_id) == key and os.path.exists(output):
+                yield student_id, key, output, None
+                continue
+            if folder not in folders:
+                os.makedirs(folder, exist_ok=True)
+                folders.add(folder)
+            yield student_id, key, output, report_spec(spec, student, as_of, days_back)
+
+    with _open_manifest(manifest_path) as manifest, \
+            (ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else contextlib.nullcontext()) as pool:
+        pending = deque()
+        for student_id, key, output, student_spec in tasks():
+            if student_spec is None:
+                result = None
+            elif pool is None:
+                result = _build_report(student_spec, output, reproducible, lint)
+            else:
+                result = pool.submit(_build_report, student_spec, output, reproducible, lint)
+            pending.append((student_id, key, output, result))
+            while pending and (pool is None or len(pending) >= jobs * 2):
+                yield _finish_report(manifest, out_dir, *pending.popleft())
+        while pending:
+            yield _finish_report(manifest, out_dir, *pending.popleft())
+
+
+def _finish_report(manifest, out_dir, student_id, key, output, result):
+    """等待單份報告完成並寫入 manifest，回傳 (輸出路徑, 是否重新輸出)"""
+    if result is None:
+        return output, False
+    if isinstance(result, Future):
+        result.result()
+    manifest.write(f'{student_id}\t{key}\t{os.path.relpath(output, out_dir)}\n')
+    manifest.flush()
+    return output, True
@@ -0,0 +1,68 @@
+"""
+94CramManageSystem - 版面格線計算
+
+版型中卡片、列表與表格的位置由這裡整批算出（EMU 的 Box），取代各版型中
+手寫的 Inches(a + i * b) 與逐格重算的 sum(col_widths[:i])。
+
+  - 等距排列（row / column / grid）與原本手算相同，以 Inches(起點 + i × 間距)
+    計算，輸出的座標完全一致
+  - 寬度不一的排列（stack / table）以 itertools.accumulate 一次算出累計位移
+    （EMU 整數，沒有浮點誤差），之後每格 O(1) 取用；200 列的成績表也是線性時間
+
+NumPy 不是本專案的相依套件；每頁只有數十到數百個格子，純 Python 的整批
+累加已足夠，也讓座標維持 python-pptx 使用的整數 EMU。
+"""
+
+from collections import namedtuple
+from itertools import accumulate
+
+from pptx.util import Inches
+
+Box = namedtuple('Box', 'left top width height')
+
+
+def steps(origin, pitch, count):
+    """等距位置（英吋 → EMU）：origin + i × pitch，i = 0 … count - 1"""
+    return [Inches(origin + i * pitch) for i in range(count)]
+
+
+def stack(origin, sizes, gap=0):
+    """依序排列大小不一的格子，回傳各格起點（EMU）
+
+    `origin`、`sizes`、`gap` 皆為 EMU；第 i 格起點為 origin + sum(sizes[:i]) + i × gap，
+    以一次累加算完。
+    """
+    if not sizes:
+        return []
+    return list(accumulate(sizes[:-1], lambda pos, size: pos + size + gap, initial=origin))
+
+
+def row(left, top, count, pitch, width, height):
+    """水平等距排列 `count` 格（英吋）"""
+    top, width, height = Inches(top), Inches(width), Inches(height)
+    return [Box(x, top, width, height) for x in steps(left, pitch, count)]
+
+
+def column(left, top, count, pitch, width, height):
+    """垂直等距排列 `count` 格（英吋）"""
+    left, width, height = Inches(left), Inches(width), Inches(height)
+    return [Box(left, y, width, height) for y in steps(top, pitch, count)]
+
+
+def grid(left, top, count, cols, col_pitch, row_pitch, width, height):
+    """`count` 格依列優先排入 `cols` 欄的格線（英吋）"""
+    xs = steps(left, col_pitch, min(count, cols))
+    ys = steps(top, row_pitch, -(-count // cols))
+    width, height = Inches(width), Inches(height)
+    return [Box(xs[i % cols], ys[i // cols], width, height) for i in range(count)]
+
+
+def table(left, top, col_widths, rows, row_pitch, row_height):
+    """表格格線：回傳 `rows` 列，每列為各欄的 Box
+
+    `col_widths` 為各欄寬（EMU），`left`、`top`、`row_pitch`、`row_height` 為英吋。
+    欄位位移只計算一次，整張表 O(列數 × 欄數)。
+    """
+    xs = stack(Inches(left), col_widths)
+    height = Inches(row_height)
+    return [[Box(x, y, w, height) for x, w in zip(xs, col_widths)] for y in steps(top, row_pitch, rows)]
@@ -0,0 +1,200 @@
+"""
+94CramManageSystem - 圖標點陣圖
+
+版面中單獨一格的 emoji 圖標（😰 📋 🤖 🔴 …）原本是 20–40 pt 的文字框，
+實際外觀取決於觀看者的系統字型。改用彩色 emoji 字型，每個圖標只繪製一次，
+存成點陣圖後以圖片放入簡報：
+  - 點陣圖依 (字型雜湊, 字級, 圖標) 命名存放在 ICON_DIR，不同簡報、不同次執行共用；
+    彩色字型（CBDT／COLR／sbix／SVG 表）忽略文字顏色，不同顏色共用同一張
+  - 圖片形狀記錄點陣圖的路徑與內容雜湊，換了字型投影片快取自然失效
+  - 放入簡報時經過 assets 的縮圖與快取；相同圖標、相同字級位元組相同，
+    python-pptx 只存一份 media part
+
+字型依序使用：環境變數 CRAMDECK_EMOJI_FONT、專案內的 fonts/NotoColorEmoji.ttf、
+常見的系統 emoji 字型（SYSTEM_FONTS）。CRAMDECK_EMOJI_FONT 指定的檔案不存在時
+拋出例外。找不到字型、字型缺字，或 Pillow 沒有 raqm（libraqm）而遇到 ZWJ 組合字
+（👨‍🎓）時，該圖標照舊輸出文字框；CLI 以 fallback_warning 彙整成一行警告。
+只有 VS16 變體選擇符（❤️）時不需要 raqm：彩色字型的基本字元本來就是 emoji 字形。
+
+    CRAMDECK_EMOJI_FONT=/path/to/NotoColorEmoji.ttf python -m cramdeck
+"""
+
+import functools
+import hashlib
+import io
+import os
+import struct
+import tempfile
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont, features
+
+from . import textfit
+from .spec import BASE_DIR
+
+ICON_VERSION = 2
+EMOJI_FONT_ENV = 'CRAMDECK_EMOJI_FONT'
+# 點陣 emoji 字型只提供固定尺寸（Noto Color Emoji 109 px；Apple Color Emoji 有 96、160 px），
+# 依序嘗試；向量字型以第一個尺寸繪製
+RENDER_SIZES = (109, 160, 96)
+COLOR_TABLES = {b'CBDT', b'COLR', b'sbix', b'SVG '}
+BUNDLED_FONT = os.path.join(BASE_DIR, 'fonts', 'NotoColorEmoji.ttf')
+SYSTEM_FONTS = (
+    '/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf',            # Debian / Ubuntu
+    '/usr/share/fonts/noto/NotoColorEmoji.ttf',                     # Arch
+    '/usr/share/fonts/google-noto-emoji/NotoColorEmoji.ttf',        # Fedora（舊）
+    '/usr/share/fonts/google-noto-color-emoji-fonts/NotoColorEmoji.ttf',
+    '/usr/local/share/fonts/NotoColorEmoji.ttf',
+    '/System/Library/Fonts/Apple Color Emoji.ttc',                  # macOS
+    'C:\\Windows\\Fonts\\seguiemj.ttf',                             # Windows
+)
+# 圖標以文字框輸出的原因（見 fallback_warning）
+NO_FONT = '找不到 emoji 字型（設定 CRAMDECK_EMOJI_FONT 或安裝 Noto Color Emoji）'
+NEEDS_RAQM = 'Pillow 沒有 raqm（libraqm），無法排 ZWJ 組合字與膚色修飾'
+MISSING_GLYPH = 'emoji 字型缺字'
+ICON_DIR = os.environ.get('CRAMDECK_ICON_DIR') or os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'cramdeck', 'icons')
+# 私人使用區的字元：各字型都沒有，用來取得缺字符號（.notdef）的樣子
+_MISSING = '\ue000'
+_VARIATION = '\ufe0f'
+
+
+# ====== 字型 ======
+def emoji_font():
+    """使用的 emoji 字型路徑；都找不到時回傳 None
+
+    CRAMDECK_EMOJI_FONT 指定的檔案不存在時拋出 FileNotFoundError，不改用其他字型。
+    """
+    path = os.environ.get(EMOJI_FONT_ENV, '').strip()
+    if path:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f'{EMOJI_FONT_ENV} 指定的 emoji 字型不存在：{path}')
+        return path
+    return next((path for path in (BUNDLED_FONT,) + SYSTEM_FONTS if os.path.isfile(path)), None)
+
+
+def _table_tags(f):
+    """sfnt 表格目錄中的表名；字型集（.ttc）取第一套字型"""
+    header = f.read(12)
+    if header[:4] == b'ttcf':
+        (offset,) = struct.unpack('>I', f.read(4))
+        f.seek(offset)
+        header = f.read(12)
+    (count,) = struct.unpack('>H', header[4:6])
+    return {f.read(16)[:4] for _ in range(count)}
+
+
+@functools.lru_cache(maxsize=8)
+def _font(path, mtime_ns):
+    """(字型, 檔案雜湊, 是否為彩色字型)"""
+    with open(path, 'rb') as f:
+        blob = f.read()
+    color = bool(_table_tags(io.BytesIO(blob)) & COLOR_TABLES)
+    for size in RENDER_SIZES:
+        try:
+            return ImageFont.truetype(path, size), hashlib.sha256(blob).hexdigest(), color
+        except OSError:
+            continue
+    raise OSError(f'{path} 沒有可用的字級（{RENDER_SIZES}）')
+
+
+def is_icon(text):
+    """`text` 是否只由 emoji 組成（可帶變體選擇符、ZWJ、膚色修飾）"""
+    classes = [textfit.char_class(ch) for ch in text]
+    return 'emoji' in classes and all(c in ('emoji', 'mark') for c in classes)
+
+
+# ====== 繪製 ======
+def _draw(font, text, color):
+    """在透明畫布中央繪製 `text`，裁成置中的正方形；畫不出任何東西時回傳 None
+
+    `color` 為 None 時（彩色字型）以字型內嵌的顏色繪製。
+    """
+    canvas = Image.new('RGBA', (font.size * 3, font.size * 2), (0, 0, 0, 0))
+    ImageDraw.Draw(canvas).text((canvas.width // 2, canvas.height // 2), text, font=font,
+                                anchor='mm', embedded_color=True, fill=f'#{color or "000000"}')
+    box = canvas.getbbox()
+    if box is None:
+        return None
+    left, top, right, bottom = box
+    side = max(right - left, bottom - top)
+    x, y = (left + right - side) // 2, (top + bottom - side) // 2
+    return canvas.crop((x, y, x + side, y + side))
+
+
+def _render(font, text, color):
+    """繪製成 PNG 位元組；字型缺字時回傳 None"""
+    glyph = _draw(font, text, color)
+    if glyph is None:
+        return None
+    missing = _draw(font, _MISSING, color)
+    if (missing is not None and missing.size == glyph.size
+            and ImageChops.difference(missing, glyph).getbbox() is None):
+        return None
+    buf = io.BytesIO()
+    glyph.save(buf, 'PNG', optimize=True)
+    return buf.getvalue()
+
+
+@functools.lru_cache(maxsize=256)
+def _sprite(font_path, mtime_ns, text, color):
+    font, font_digest, _ = _font(font_path, mtime_ns)
+    key = hashlib.sha256(f'{ICON_VERSION}\0{font_digest}\0{font.size}\0{color}\0{text}'.encode('utf-8')).hexdigest()
+    path = os.path.join(ICON_DIR, f'{key}.png')
+    if os.path.exists(path):
+        return path
+    blob = _render(font, text, color)
+    if blob is None:
+        return None
+    os.makedirs(ICON_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=ICON_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp, path)
+    return path
+
+
+def _resolve(text, color):
+    """(點陣圖路徑, None)；無法繪製時為 (None, 原因)"""
+    font_path = emoji_font()
+    if font_path is None:
+        return None, NO_FONT
+    mtime_ns = os.stat(font_path).st_mtime_ns
+    if _font(font_path, mtime_ns)[2]:
+        color = None
+    # 沒有 raqm 時 Pillow 逐字排版：VS16 可以去掉，ZWJ 組合字、膚色修飾則無法組成單一字形
+    if not features.check('raqm'):
+        text = text.replace(_VARIATION, '')
+        if len(text) > 1:
+            return None, NEEDS_RAQM
+    path = _sprite(font_path, mtime_ns, text, color)
+    return (path, None) if path is not None else (None, MISSING_GLYPH)
+
+
+def sprite(text, color='000000'):
+    """圖標 `text` 的點陣圖路徑；不是圖標或無法繪製時回傳 None（原因見 fallback_warning）"""
+    text = text.strip()
+    if not is_icon(text):
+        return None
+    return _resolve(text, color)[0]
+
+
+def fallback_warning(plans=None):
+    """仍以文字框輸出的圖標彙整成一行警告；都已繪成點陣圖時回傳 None
+
+    `plans` 為 SlidePlan 序列；省略時（如批次輸出前）只檢查是否找得到字型。
+    """
+    if plans is None:
+        return None if emoji_font() is not None else f'⚠️ emoji 圖標仍以文字輸出：{NO_FONT}'
+    reasons = {}
+    for plan in plans:
+        for shape in plan.shapes:
+            text = shape.props['text'].strip() if shape.kind == 'text' else ''
+            if is_icon(text):
+                reason = _resolve(text, str(shape.props['color']))[1]
+                if reason is not None:
+                    reasons.setdefault(reason, set()).add(text)
+    if not reasons:
+        return None
+    count = sum(map(len, reasons.values()))
+    details = '；'.join(f"{reason}：{' '.join(sorted(texts))}" for reason, texts in reasons.items())
+    return f'⚠️ {count} 個 emoji 圖標仍以文字輸出。{details}'
@@ -0,0 +1,148 @@
+"""
+94CramManageSystem - 版面檢查
+
+在輸出前檢查每頁的形狀計畫（SlidePlan），找出：
+  - text_overlap：兩個文字框的文字範圍重疊
+  - off_slide：形狀超出投影片範圍
+  - card_overflow：文字超出所在的卡片（rect / rounded_rect）
+
+文字範圍以 textfit 估算字形實際佔用的範圍（依對齊方式，不含內距），而不是
+宣告的文字框大小；文字框設定了 spAutoFit，開啟後高度會隨文字調整。
+以 decorative=True 加入的裝飾形狀（封面、結尾頁超出邊界的圓形）不檢查。
+
+相交判斷以 x 軸掃描線進行：依左緣排序，只與 x 區間仍重疊的形狀比較 y，
+不做兩兩比對；每份簡報只需數毫秒，可在每次批次輸出前執行。
+"""
+
+from collections import namedtuple
+import heapq
+
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Inches
+
+from . import textfit
+
+# 1/100 吋以內的誤差（四捨五入、貼齊邊緣）不視為問題
+TOLERANCE = Inches(0.01)
+CARD_KINDS = ('rect', 'rounded_rect')
+
+Issue = namedtuple('Issue', 'slide kind shape other message')
+
+
+def text_box(shape):
+    """文字字形實際佔用的範圍 (left, top, right, bottom)；空字串回傳 None
+
+    不含文字框內距；最後一行只算字身高度（1 em），不含行距。
+    """
+    left, top, width, height, props = shape[1:]
+    text = props['text']
+    if not text.strip():
+        return None
+    size, font, bold = props['font_size'], props['font_name'], props['bold']
+    lines = textfit.wrap(text, width, size, font, bold)
+    inner = width - 2 * textfit.INSET_X
+    ink = min(inner, max(textfit.text_width(line, size, font, bold) for line in lines))
+    left += textfit.INSET_X
+    if props['alignment'] == PP_ALIGN.CENTER:
+        left += (inner - ink) // 2
+    elif props['alignment'] == PP_ALIGN.RIGHT:
+        left += inner - ink
+    top += textfit.INSET_Y
+    em = size * textfit.EMU_PER_PT
+    return left, top, left + ink, top + textfit.text_height(len(lines) - 1, size, font) - 2 * textfit.INSET_Y + em
+
+
+def _intersections(boxes):
+    """掃描線找出相交（面積大於 TOLERANCE）的方框，逐一回傳 (i, j)，i 在 boxes 中較前
+
+    `boxes` 為 (index, (left, top, right, bottom))。
+    """
+    ending = []     # (right, index)
+    active = {}
+    for i, box in sorted(boxes, key=lambda item: item[1][0]):
+        left, top, right, bottom = box
+        while ending and ending[0][0] <= left + TOLERANCE:
+            active.pop(heapq.heappop(ending)[1], None)
+        for j, other in active.items():
+            if other[1] < bottom - TOLERANCE and top < other[3] - TOLERANCE and other[2] > left + TOLERANCE:
+                yield (j, i) if j < i else (i, j)
+        active[i] = box
+        heapq.heappush(ending, (right, i))
+
+
+def _snippet(shape):
+    text = shape.props['text'].replace('\n', ' ')
+    return f'「{text[:12]}…」' if len(text) > 12 else f'「{text}」'
+
+
+def _inches(emu):
+    return f'{emu / 914400:.2f} 吋'
+
+
+def lint_slide(plan, number=1):
+    """檢查單頁 SlidePlan，回傳 Issue 清單；`number` 為頁碼（從 1 起算）"""
+    shapes = plan.shapes
+    decorative = getattr(plan, 'decorative', ())
+    texts, cards = [], []
+    issues = []
+    for i, shape in enumerate(shapes):
+        if i in decorative:
+            continue
+        if shape.kind == 'text':
+            box = text_box(shape)
+            if box is None:
+                continue
+            texts.append((i, box))
+        else:
+            box = (shape.left, shape.top, shape.left + shape.width, shape.top + shape.height)
+            if shape.kind in CARD_KINDS:
+                cards.append((i, box))
+
+        left, top, right, bottom = box
+        if (left < -TOLERANCE or top < -TOLERANCE or right > plan.width + TOLERANCE
+                or bottom > plan.height + TOLERANCE):
+            what = _snippet(shape) if shape.kind == 'text' else shape.kind
+            issues.append(Issue(number, 'off_slide', i, None, f'{what} 超出投影片範圍'))
+
+    for i, j in _intersections(texts):
+        issues.append(Issue(number, 'text_overlap', i, j, f'{_snippet(shapes[i])} 與 {_snippet(shapes[j])} 重疊'))
+
+    # 所在卡片：排在文字之前、包含整個文字框的卡片中面積最小者；
+    # 沒有卡片完整包含時，改取包含文字框左上角的卡片
+    text_boxes = dict(texts)
+    parents = {}
+    for i, j in _intersections(cards + texts):
+        if i not in text_boxes and j in text_boxes:
+            rank = _containment(shapes[i], shapes[j])
+            if rank is not None and (j not in parents or rank < parents[j][0]):
+                parents[j] = (rank, i)
+    for j, (_, i) in sorted(parents.items()):
+        card = shapes[i]
+        left, top, right, bottom = text_boxes[j]
+        excess = max(card.left - left, card.top - top,
+                     right - (card.left + card.width), bottom - (card.top + card.height))
+        if excess > TOLERANCE:
+            issues.append(Issue(number, 'card_overflow', j, i,
+                                f'{_snippet(shapes[j])} 超出卡片 {_inches(excess)}'))
+    return issues
+
+
+def _containment(card, text):
+    """卡片作為文字所在卡片的優先順序（越小越優先）；不包含文字框左上角時回傳 None"""
+    right, bottom = card.left + card.width, card.top + card.height
+    if not (card.left <= text.left < right and card.top <= text.top < bottom):
+        return None
+    whole = text.left + text.width <= right and text.top + text.height <= bottom
+    return not whole, card.width * card.height
+
+
+def lint_deck(deck):
+    """檢查整份 DeckPlan，回傳所有頁面的 Issue 清單"""
+    issues = []
+    for number, plan in enumerate(deck.slides, 1):
+        issues.extend(lint_slide(plan, number))
+    return issues
+
+
+def format_issue(issue):
+    return f'第 {issue.slide} 頁 {issue.kind}：{issue.message}'
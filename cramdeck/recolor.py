@@ -0,0 +1,192 @@
+"""
+94CramManageSystem - 簡報批次換色
+
+直接在 .pptx 的 zip 上改寫顏色，不載入 python-pptx 物件模型：
+  - XML member 解壓後以位元組層級的正規表示式取代 <a:srgbClr val="..."> 的色碼
+  - 沒有任何取代的 member（圖片、未用到舊色的 XML）直接複製壓縮後的資料，
+    不重新壓縮
+cramdeck 以佈景主題配色輸出的簡報，多數顏色只出現在 ppt/theme/theme1.xml，
+換色時只需重新壓縮這一個 part。
+
+    python -m cramdeck.recolor --map 4A6B8A=3E5F7F --map C48B6A=B87B5A docs/*.pptx --out-dir recolored
+"""
+
+import argparse
+import json
+import os
+import re
+import struct
+import sys
+import time
+import zipfile
+import zlib
+
+_HEX = re.compile(r'[0-9A-Fa-f]{6}')
+# 可能含有 srgbClr 的 member；.rels、[Content_Types].xml、docProps 不必解壓
+_COLOR_MEMBERS = re.compile(r'ppt/.*\.xml')
+
+
+def parse_mapping(pairs=(), palette=None):
+    """整理舊色 → 新色對照表（皆為大寫 6 位色碼）
+
+    `pairs` 為 'OLD=NEW' 字串；`palette` 為 JSON 檔，key 可以是舊色碼（可加 #），
+    也可以是 COLORS 中的顏色名稱（此時才載入 deck 取得舊色碼）。
+    """
+    items = [pair.split('=', 1) for pair in pairs]
+    if palette:
+        with open(palette, encoding='utf-8') as f:
+            entries = {key.strip().lstrip('#') if _HEX.fullmatch(key.strip().lstrip('#')) else key: value
+                       for key, value in json.load(f).items()}
+        if any(not _HEX.fullmatch(key) for key in entries):
+            from .deck import COLORS
+        for key, value in entries.items():
+            if not _HEX.fullmatch(key):
+                if key not in COLORS:
+                    raise ValueError(f'未知的顏色名稱：{key!r}')
+                key = str(COLORS[key])
+            items.append((key, value))
+
+    mapping = {}
+    for old, new in items:
+        old, new = old.strip().lstrip('#'), new.strip().lstrip('#')
+        if not (_HEX.fullmatch(old) and _HEX.fullmatch(new)):
+            raise ValueError(f'色碼格式錯誤：{old}={new}')
+        if old.upper() != new.upper():
+            mapping[old.upper().encode()] = new.upper().encode()
+    return mapping
+
+
+def compile_mapping(mapping):
+    """只比對對照表中的舊色碼
+
+    樣式以固定字串 srgbClr val=" 開頭，re 可以先以字串搜尋跳到候選位置；
+    加上 IGNORECASE 會關閉這個最佳化，因此改為同時列出大寫與小寫色碼。
+    """
+    if not mapping:
+        return None
+    alternatives = b'|'.join(re.escape(code) for old in mapping for code in {old, old.lower()})
+    return re.compile(rb'srgbClr val="(' + alternatives + rb')"')
+
+
+def recolor_xml(blob, pattern, mapping):
+    """取代 XML 中的 srgbClr 色碼，回傳 (新內容, 取代次數)"""
+    return pattern.subn(lambda m: b'srgbClr val="%s"' % mapping[m.group(1).upper()], blob)
+
+
+def _read_raw(zin, info):
+    """讀取 entry 壓縮後的原始資料（不解壓縮）"""
+    zin.fp.seek(info.header_offset)
+    header = zin.fp.read(zipfile.sizeFileHeader)
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    zin.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_len + extra_len)
+    return zin.fp.read(info.compress_size)
+
+
+def _write_raw(zout, info, raw):
+    """將壓縮後的原始資料原封不動寫入 `zout`（會改寫 `info` 的 header_offset）
+
+    zipfile 沒有公開「寫入已壓縮資料」的 API，這裡與 ZipFile.write 相同地
+    寫出 local header、登記 central directory 並更新 start_dir。
+    """
+    info.flag_bits &= ~0x08     # 大小與 CRC 已知，寫在 local header，不需要 data descriptor
+    info.header_offset = zout.fp.tell()
+    zout.fp.write(info.FileHeader())
+    zout.fp.write(raw)
+    zout.filelist.append(info)
+    zout.NameToInfo[info.filename] = info
+    zout.start_dir = zout.fp.tell()
+    zout._didModify = True
+
+
+def _inflate(info, raw):
+    if info.compress_type == zipfile.ZIP_STORED:
+        return raw
+    if info.compress_type != zipfile.ZIP_DEFLATED:
+        raise ValueError(f'不支援的壓縮方式：{info.filename}')
+    return zlib.decompress(raw, -zlib.MAX_WBITS)
+
+
+def _deflate(blob):
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(blob) + compressor.flush()
+
+
+def recolor_deck(src, dst, pattern, mapping):
+    """將 `src` 換色後寫到 `dst`，回傳取代次數
+
+    讀寫都直接處理壓縮後的資料（zlib raw deflate），略過 ZipFile 逐塊讀取與
+    CRC 驗證的額外負擔；只有實際換色的 member 重新壓縮。
+    """
+    total = 0
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            raw = _read_raw(zin, info)
+            if _COLOR_MEMBERS.fullmatch(info.filename):
+                blob, count = recolor_xml(_inflate(info, raw), pattern, mapping)
+                if count:
+                    total += count
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    info.CRC = zlib.crc32(blob)
+                    info.file_size = len(blob)
+                    raw = _deflate(blob)
+                    info.compress_size = len(raw)
+            _write_raw(zout, info, raw)
+    return total
+
+
+def output_paths(paths, out_dir):
+    """各輸入在 `out_dir` 中的輸出路徑：保留相對於所有輸入共同上層目錄的路徑，
+    不同目錄下的同名檔案不會互相覆寫；同一檔案重複指定時引發 ValueError
+    """
+    sources = [os.path.abspath(path) for path in paths]
+    duplicates = sorted({path for path in sources if sources.count(path) > 1})
+    if duplicates:
+        raise ValueError(f'重複指定的簡報：{", ".join(duplicates)}')
+    root = os.path.commonpath([os.path.dirname(path) for path in sources])
+    return [os.path.join(out_dir, os.path.relpath(path, root)) for path in sources]
+
+
+def recolor_file(path, dst, pattern, mapping):
+    """換色單一檔案輸出到 `dst`；`dst` 為 None 時原地改寫，回傳 (輸出路徑, 取代次數)"""
+    if dst is None:
+        dst = f'{path}.{os.getpid()}.tmp'
+        count = recolor_deck(path, dst, pattern, mapping)
+        os.replace(dst, path)
+        return path, count
+    os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+    return dst, recolor_deck(path, dst, pattern, mapping)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='cramdeck.recolor', description='在 .pptx zip 上直接批次換色')
+    parser.add_argument('decks', nargs='+', help='要換色的 .pptx')
+    parser.add_argument('--map', action='append', default=[], metavar='OLD=NEW', help='色碼對照，可重複指定')
+    parser.add_argument('--palette', metavar='JSON', help='色碼對照 JSON（key 可為舊色碼或 COLORS 名稱）')
+    parser.add_argument('--out-dir', help='輸出目錄（未指定時原地改寫）')
+    parser.add_argument('--quiet', '-q', action='store_true', help='不逐檔列出')
+    args = parser.parse_args(argv)
+
+    mapping = parse_mapping(args.map, args.palette)
+    if not mapping:
+        parser.error('請以 --map 或 --palette 指定色碼對照')
+    pattern = compile_mapping(mapping)
+    if args.out_dir:
+        try:
+            targets = output_paths(args.decks, args.out_dir)
+        except ValueError as exc:
+            parser.error(str(exc))
+    else:
+        targets = [None] * len(args.decks)
+
+    start = time.perf_counter()
+    for path, target in zip(args.decks, targets):
+        dst, count = recolor_file(path, target, pattern, mapping)
+        if not args.quiet:
+            print(f'🎨 {dst}：{count} 處')
+    elapsed = time.perf_counter() - start
+    print(f'📦 共換色 {len(args.decks)} 份簡報（{len(args.decks) / elapsed:.0f} 份/秒）', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""
+94CramManageSystem - 簡報輸出服務
+
+常駐的 HTTP 服務，bot-gateway 不必每次都啟動新的 Python 行程：
+  - 輸出在 process pool 中進行；每個子行程啟動時先 import python-pptx、輸出一次
+    預設簡報，XML 範本、字寬表與投影片快取都已就緒，之後的請求只重建有變動的頁面
+  - 相同的請求（spec 與格式相同）同時進來時只輸出一次，共用結果；最近的結果
+    另外保留在記憶體中。輸出固定為可重現模式，相同輸入必定得到相同位元組
+
+只用標準函式庫（asyncio），介面：
+
+    POST /render?format=pptx|html   body 為 deck spec JSON（空 body 代表預設 spec）
+    GET  /render?format=pptx|html   輸出預設 spec
+    GET  /media/<名稱>              HTML 引用的圖片（名稱為內容雜湊，可長期快取）
+    GET  /healthz                   服務統計（JSON）
+
+    python -m cramdeck.service --port 8765 -j 2
+    python -m cramdeck.service --stub http://127.0.0.1:8765 -c 50 -n 500
+"""
+
+import argparse
+import asyncio
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.parse
+
+from .spec import DEFAULT_SPEC, load_spec, validate_spec
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BODY = 2 * 1024 * 1024
+RESULT_CACHE_SIZE = 32
+MEDIA_CACHE_SIZE = 256
+MEDIA_PREFIX = '/media'
+WORKER_CACHE_SIZE = 1024
+CONTENT_TYPES = {
+    'pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'html': 'text/html; charset=utf-8',
+}
+MEDIA_TYPES = {'.png': 'image/png', '.jpg': 'image/jpeg'}
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+Request = namedtuple('Request', 'method path query headers body')
+
+
+class SpecError(ValueError):
+    """spec 通過 validate_spec，但內容不合版型（由子行程的 compile_deck 發現，回 400）"""
+
+
+# ====== 子行程 ======
+class _MemoryCache:
+    """與 deck.SlideCache 相同介面的記憶體 LRU 快取（每個子行程各自一份）"""
+
+    def __init__(self, max_entries=WORKER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        blob = self.entries.get(key)
+        if blob is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return blob
+
+    def put(self, key, blob):
+        self.entries[key] = blob
+        self.entries.move_to_end(key)
+
+    def prune(self):
+        stale = max(0, len(self.entries) - self.max_entries)
+        for _ in range(stale):
+            self.entries.popitem(last=False)
+        return stale
+
+
+_cache = None
+
+
+def _warm_worker(cache_dir, cache_size, spec_path):
+    """子行程初始化：載入 deck 並輸出一次預設簡報，讓範本與快取就緒"""
+    global _cache
+    from . import deck
+
+    _cache = deck.SlideCache(cache_dir, cache_size) if cache_dir else _MemoryCache(cache_size)
+    deck.write_deck(deck.compile_deck(load_spec(spec_path)), io.BytesIO(), _cache, reproducible=True)
+
+
+def _render(payload, fmt):
+    """子行程：將 spec JSON 輸出成 `fmt` 格式，回傳 (位元組, HTML 引用的圖片 {名稱: 位元組})"""
+    from . import deck
+
+    spec = json.loads(payload)
+    try:
+        plan = deck.compile_deck(spec)
+    except ValueError as e:
+        raise SpecError(str(e)) from None
+    if fmt == 'html':
+        from . import web
+
+        media = web.MediaStore(MEDIA_PREFIX)
+        return web.deck_html(plan, spec.get('name', ''), media=media).encode('utf-8'), media.files
+    buf = io.BytesIO()
+    deck.write_deck(plan, buf, _cache, reproducible=True)
+    return buf.getvalue(), {}
+
+
+# ====== 服務 ======
+class DeckService:
+    """以 process pool 輸出簡報，合併同時進行的相同請求"""
+
+    def __init__(self, jobs=1, cache_dir=None, cache_size=WORKER_CACHE_SIZE, spec_path=DEFAULT_SPEC):
+        self.pool = ProcessPoolExecutor(max_workers=jobs, initializer=_warm_worker,
+                                        initargs=(cache_dir, cache_size, spec_path))
+        self.jobs = jobs
+        self.default_payload = json.dumps(load_spec(spec_path), ensure_ascii=False, sort_keys=True)
+        self.inflight = {}
+        self.results = OrderedDict()
+        self.media = OrderedDict()
+        self.stats = {'requests': 0, 'builds': 0, 'coalesced': 0, 'result_hits': 0, 'errors': 0}
+
+    async def warm(self):
+        """等所有子行程完成初始化"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self.jobs)))
+
+    async def render(self, payload, fmt):
+        """輸出 spec JSON 字串，回傳 (位元組, 'hit' | 'coalesced' | 'miss')"""
+        key = hashlib.sha256(f'{fmt}\n{payload}'.encode('utf-8')).hexdigest()
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+            self.stats['result_hits'] += 1
+            return self._keep_media(result), 'hit'
+        future = self.inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return self._keep_media(await asyncio.shield(future)), 'coalesced'
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, _render, payload, fmt)
+        self.inflight[key] = future
+        self.stats['builds'] += 1
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            del self.inflight[key]
+        self.results[key] = result
+        if len(self.results) > RESULT_CACHE_SIZE:
+            self.results.popitem(last=False)
+        return self._keep_media(result), 'miss'
+
+    def _keep_media(self, result):
+        """保留結果引用的圖片供 /media/ 提供（最近用到的 MEDIA_CACHE_SIZE 張），回傳位元組"""
+        blob, files = result
+        for name, media in files.items():
+            self.media[name] = media
+            self.media.move_to_end(name)
+        while len(self.media) > MEDIA_CACHE_SIZE:
+            self.media.popitem(last=False)
+        return blob
+
+    async def handle(self, request):
+        """處理單一請求，回傳 (狀態碼, 標頭 dict, body)"""
+        if request.path == '/healthz':
+            body = json.dumps(dict(self.stats, inflight=len(self.inflight), jobs=self.jobs))
+            return 200, {'Content-Type': 'application/json'}, body.encode('utf-8')
+        if request.path.startswith(MEDIA_PREFIX + '/'):
+            name = request.path[len(MEDIA_PREFIX) + 1:]
+            media = self.media.get(name)
+            if media is None:
+                return _error(404, f'找不到 {request.path}')
+            headers = {'Content-Type': MEDIA_TYPES[os.path.splitext(name)[1]],
+                       'Cache-Control': 'public, max-age=31536000, immutable'}
+            return 200, headers, media
+        if request.path != '/render':
+            return _error(404, f'找不到 {request.path}')
+        if request.method not in ('GET', 'POST'):
+            return _error(405, f'不支援 {request.method}')
+
+        fmt = request.query.get('format', 'pptx')
+        if fmt not in CONTENT_TYPES:
+            return _error(400, f'不支援的格式：{fmt!r}')
+        payload = self.default_payload
+        if request.body.strip():
+            try:
+                spec = json.loads(request.body)
+            except ValueError as e:
+                return _error(400, f'spec 不是合法的 JSON：{e}')
+            problems = validate_spec(spec)
+            if problems:
+                return _error(400, '；'.join(problems))
+            payload = json.dumps(spec, ensure_ascii=False, sort_keys=True)
+
+        # 結構錯誤在上面由 validate_spec 擋下，內容錯誤由子行程編譯時以 SpecError 回報（400）；
+        # 編譯之後的例外都是內部錯誤，由 serve_connection 回 500
+        try:
+            blob, source = await self.render(payload, fmt)
+        except SpecError as e:
+            return _error(400, str(e))
+        return 200, {'Content-Type': CONTENT_TYPES[fmt], 'X-Cramdeck-Cache': source}, blob
+
+    async def serve_connection(self, reader, writer):
+        """單一連線：依序處理請求（HTTP/1.1 keep-alive）"""
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ValueError as e:
+                    status, headers, body = _error(413 if isinstance(e, _TooLarge) else 400, str(e))
+                    _write_response(writer, status, headers, body, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                self.stats['requests'] += 1
+                try:
+                    status, headers, body = await self.handle(request)
+                except Exception as e:
+                    print(f'❌ {request.method} {request.path}：{e!r}', file=sys.stderr)
+                    status, headers, body = _error(500, '輸出失敗')
+                if status != 200:
+                    self.stats['errors'] += 1
+                keep_alive = _keep_alive(request)
+                _write_response(writer, status, headers, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+# ====== HTTP ======
+class _TooLarge(ValueError):
+    pass
+
+
+async def _read_request(reader):
+    """讀取一個 HTTP 請求；連線已關閉時回傳 None，格式錯誤時拋出 ValueError"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split()
+    except ValueError:
+        raise ValueError('請求行格式錯誤') from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length') or 0)
+    if length > MAX_BODY:
+        raise _TooLarge(f'body 超過上限 {MAX_BODY} bytes')
+    body = await reader.readexactly(length) if length else b''
+    url = urllib.parse.urlsplit(target)
+    query = dict(urllib.parse.parse_qsl(url.query))
+    return Request(method.upper(), url.path, query, headers, body)
+
+
+def _keep_alive(request):
+    connection = request.headers.get('connection', '').lower()
+    return connection != 'close'
+
+
+def _error(status, message):
+    body = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+    return status, {'Content-Type': 'application/json; charset=utf-8'}, body
+
+
+def _write_response(writer, status, headers, body, keep_alive=True):
+    lines = [f'HTTP/1.1 {status} {REASONS.get(status, "")}', f'Content-Length: {len(body)}',
+             f'Connection: {"keep-alive" if keep_alive else "close"}']
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, jobs=1, cache_dir=None, cache_size=WORKER_CACHE_SIZE,
+                spec_path=DEFAULT_SPEC):
+    """啟動服務並持續執行"""
+    service = DeckService(jobs, cache_dir, cache_size, spec_path)
+    try:
+        await service.warm()
+        server = await asyncio.start_server(service.serve_connection, host, port)
+        print(f'🚀 簡報服務已啟動：http://{host}:{port}（{jobs} 個輸出行程）', flush=True)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+# ====== 測試用客戶端 ======
+async def _request(reader, writer, host, path, body):
+    writer.write((f'POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n'
+                  f'Content-Type: application/json\r\n\r\n').encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def stub_client(url, concurrency=50, total=500, bodies=(b'',), fmt='pptx'):
+    """模擬 bot-gateway：`concurrency` 條連線共送出 `total` 個請求，回傳各請求的秒數"""
+    parts = urllib.parse.urlsplit(url)
+    path = f'/render?format={fmt}'
+    latencies = []
+    counter = iter(range(total))
+
+    async def client():
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+        try:
+            for i in counter:
+                start = time.perf_counter()
+                status = await _request(reader, writer, parts.hostname, path, bodies[i % len(bodies)])
+                if status != 200:
+                    raise RuntimeError(f'HTTP {status}')
+                latencies.append(time.perf_counter() - start)
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies
+
+
+def _variants(spec_path, count):
+    """`count` 份只有封面日期不同的 spec（模擬各分校的個人化簡報）"""
+    spec = load_spec(spec_path)
+    bodies = []
+    for i in range(count):
+        slides = [dict(data, date=f"分校 {i + 1} · {data['date']}") if data['layout'] == 'cover' else data
+                  for data in spec['slides']]
+        bodies.append(json.dumps(dict(spec, slides=slides), ensure_ascii=False).encode('utf-8'))
+    return bodies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='cramdeck.service', description='94Cram 簡報輸出服務')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'監聽位址（預設 {DEFAULT_HOST}）')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'監聽埠號（預設 {DEFAULT_PORT}）')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, metavar='N',
+                        help='輸出行程數（預設為 CPU 核心數）')
+    parser.add_argument('--spec', default=DEFAULT_SPEC, help='預設的 deck spec JSON 路徑')
+    parser.add_argument('--cache', metavar='DIR', help='投影片快取放在磁碟 DIR（各行程共用）；預設為各行程的記憶體快取')
+    parser.add_argument('--cache-size', type=int, default=WORKER_CACHE_SIZE, help='快取最多保留的頁數')
+    parser.add_argument('--stub', metavar='URL', help='改為測試用客戶端，對 URL 的服務送出請求並統計延遲')
+    parser.add_argument('--concurrency', '-c', type=int, default=50, help='客戶端同時連線數（預設 50）')
+    parser.add_argument('--requests', '-n', type=int, default=500, help='客戶端請求總數（預設 500）')
+    parser.add_argument('--variants', type=int, default=1, help='客戶端輪流送出的不同 spec 數（預設 1）')
+    parser.add_argument('--format', choices=tuple(CONTENT_TYPES), default='pptx', help='客戶端請求的格式')
+    args = parser.parse_args(argv)
+
+    if args.stub:
+        bodies = _variants(args.spec, args.variants) if args.variants > 1 else (b'',)
+        start = time.perf_counter()
+        latencies = asyncio.run(stub_client(args.stub, args.concurrency, args.requests, bodies, args.format))
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        print(f'📨 {len(latencies)} 個請求，{args.concurrency} 條連線，{len(bodies)} 種 spec，'
+              f'{len(latencies) / elapsed:.0f} req/s')
+        print(f'⏱️  p50 {statistics.median(latencies) * 1000:.0f} ms · '
+              f'p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms · '
+              f'max {latencies[-1] * 1000:.0f} ms')
+        return 0
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.jobs, args.cache, args.cache_size, args.spec))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+94CramManageSystem - 分校數據快照讀取
+
+從 manage-backend 資料表（drizzle/schema）匯出的本地快照計算各分校簡報所需的數據。
+快照可以是 SQLite 檔，或一個內含 <資料表>.csv 的目錄。每張表只做一次整批讀取，
+逐列累加到每位學員的統計量，不做逐分校 / 逐學員查詢。
+
+學員報告（iter_students）則依學員 id 排序讀取各表並合併，一次只保留一位學員
+的資料；CSV 快照先逐列匯入暫存的 SQLite 檔再排序。
+
+流失風險評分與 apps/manage-backend/src/ai/churn.ts 相同：
+出席率、出席趨勢、成績退步、連續缺席四項加權，>= 60 高風險、>= 30 中風險。
+"""
+
+from collections import namedtuple
+import contextlib
+import csv
+import datetime
+import itertools
+import operator
+import os
+import sqlite3
+import tempfile
+
+from . import charts
+
+# 每張表讀取的欄位
+TABLES = {
+    'tenants': ('id', 'name', 'slug'),
+    'branches': ('id', 'tenant_id', 'name', 'address', 'phone'),
+    'manage_students': ('id', 'tenant_id', 'status'),
+    'inclass_attendances': ('tenant_id', 'student_id', 'date', 'status'),
+    'inclass_exams': ('id', 'exam_date'),
+    'inclass_exam_scores': ('exam_id', 'student_id', 'score'),
+    'manage_payments': ('tenant_id', 'amount', 'paid_at', 'status'),
+}
+
+# 學員報告另外讀取的欄位（舊的快照沒有時視為 NULL）
+STUDENT_COLUMNS = TABLES['manage_students'] + ('name', 'grade')
+
+Branch = namedtuple('Branch', 'id tenant_id tenant_name tenant_slug name address phone')
+BranchFigures = namedtuple('BranchFigures', 'active_students attendance_rate risk_counts collected')
+Student = namedtuple('Student', 'id tenant_id tenant_name tenant_slug name grade attendance_rate present '
+                                'sessions weekly scores risk_score risk_level risk_factors')
+
+RISK_LEVELS = ('high', 'medium', 'low')
+EMPTY_FIGURES = BranchFigures(0, None, {level: 0 for level in RISK_LEVELS}, 0)
+
+
+def iter_rows(source, table, columns=None):
+    """逐列讀取快照中的一張表（tuple，欄位順序同 `columns`，預設為 TABLES）"""
+    columns = columns or TABLES[table]
+    if os.path.isdir(source):
+        path = os.path.join(source, f'{table}.csv')
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                yield tuple(row.get(c) or None for c in columns)
+    else:
+        conn = sqlite3.connect(source)
+        try:
+            cursor = conn.execute(f'SELECT {", ".join(columns)} FROM {table}')
+            while True:
+                rows = cursor.fetchmany(5000)
+                if not rows:
+                    break
+                yield from rows
+        except sqlite3.OperationalError:
+            # 快照中沒有這張表
+            return
+        finally:
+            conn.close()
+
+
+def _day(value):
+    """將 timestamp 字串轉為日期（容許 'YYYY-MM-DD HH:MM:SS' 與 ISO 格式）"""
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+class _StudentStats:
+    """單一學員的累加統計量"""
+
+    __slots__ = ('att_total', 'att_present', 'first_total', 'first_present',
+                 'second_total', 'second_present', 'recent', 'exams', 'first_exam', 'last_exam')
+
+    def __init__(self):
+        self.att_total = self.att_present = 0
+        self.first_total = self.first_present = 0
+        self.second_total = self.second_present = 0
+        self.recent = []          # 最近 5 筆 (date, absent)
+        self.exams = 0
+        self.first_exam = None    # (exam_date, score)
+        self.last_exam = None
+
+    def add_attendance(self, day, status, cutoff, mid):
+        present = status in ('present', 'late')
+        if day >= cutoff:
+            self.att_total += 1
+            self.att_present += present
+            if day < mid:
+                self.first_total += 1
+                self.first_present += present
+            else:
+                self.second_total += 1
+                self.second_present += present
+        self.recent.append((day, status == 'absent'))
+        if len(self.recent) > 5:
+            self.recent.sort(reverse=True)
+            del self.recent[5:]
+
+    def add_score(self, day, score):
+        self.exams += 1
+        if self.first_exam is None or day < self.first_exam[0]:
+            self.first_exam = (day, score)
+        if self.last_exam is None or day >= self.last_exam[0]:
+            self.last_exam = (day, score)
+
+    def risk_factors(self):
+        """與 churn.ts 相同的加權評分項目，回傳 [(項目, 分數)]
+
+        項目：attendance（出勤率低）、attendance_drop（出勤率下滑）、score_drop（成績退步）、
+        low_score（最近成績不及格）、absences（連續缺席）。
+        """
+        factors = []
+        rate = self.att_present / self.att_total if self.att_total else 1
+        if rate < 0.5:
+            factors.append(('attendance', 35))
+        elif rate < 0.7:
+            factors.append(('attendance', 25))
+        elif rate < 0.85:
+            factors.append(('attendance', 15))
+
+        first_rate = self.first_present / self.first_total if self.first_total else 1
+        second_rate = self.second_present / self.second_total if self.second_total else 1
+        drop = first_rate - second_rate
+        if drop > 0.3:
+            factors.append(('attendance_drop', 25))
+        elif drop > 0.15:
+            factors.append(('attendance_drop', 15))
+
+        if self.exams >= 2:
+            score_drop = self.first_exam[1] - self.last_exam[1]
+            if score_drop >= 20:
+                factors.append(('score_drop', 25))
+            elif score_drop >= 10:
+                factors.append(('score_drop', 15))
+            if self.last_exam[1] < 50:
+                factors.append(('low_score', 10))
+
+        consecutive = 0
+        for _, absent in sorted(self.recent, reverse=True):
+            if not absent:
+                break
+            consecutive += 1
+        if consecutive >= 3:
+            factors.append(('absences', 15))
+        return factors
+
+    def risk_score(self):
+        """與 churn.ts 相同的加權評分（0-100）"""
+        return min(100, sum(points for _, points in self.risk_factors()))
+
+    def risk_level(self):
+        return _level(self.risk_score())
+
+
+def _level(score):
+    return 'high' if score >= 60 else 'medium' if score >= 30 else 'low'
+
+
+def load_branches(source):
+    """讀取所有分校（附上所屬補習班名稱）"""
+    tenants = {tid: (name, slug) for tid, name, slug in iter_rows(source, 'tenants')}
+    branches = []
+    for bid, tenant_id, name, address, phone in iter_rows(source, 'branches'):
+        tenant_name, tenant_slug = tenants.get(tenant_id, ('', ''))
+        branches.append(Branch(bid, tenant_id, tenant_name, tenant_slug, name, address, phone))
+    return branches
+
+
+def load_figures(source, as_of=None, days_back=60):
+    """整批計算每家補習班（tenant）的學員、出勤、風險與收款數據
+
+    manage-backend 的學員、出勤與繳費資料以 tenant_id 分隔，同一補習班的分校共用一組數據。
+    回傳 {tenant_id: BranchFigures}。
+    """
+    as_of = _day(as_of) if as_of else datetime.date.today()
+    cutoff = as_of - datetime.timedelta(days=days_back)
+    mid = as_of - datetime.timedelta(days=days_back // 2)
+
+    students = {}
+    for sid, tenant_id, status in iter_rows(source, 'manage_students'):
+        if (status or 'active') == 'active':
+            students[sid] = (tenant_id, _StudentStats())
+
+    for tenant_id, sid, day, status in iter_rows(source, 'inclass_attendances'):
+        entry = students.get(sid)
+        if entry is None or not day:
+            continue
+        day = _day(day)
+        if day <= as_of:
+            entry[1].add_attendance(day, status, cutoff, mid)
+
+    exam_dates = {eid: _day(day) for eid, day in iter_rows(source, 'inclass_exams') if day}
+    for exam_id, sid, score in iter_rows(source, 'inclass_exam_scores'):
+        entry = students.get(sid)
+        day = exam_dates.get(exam_id)
+        if entry is not None and day is not None and score is not None:
+            entry[1].add_score(day, int(score))
+
+    payments = {'tenant': [], 'amount': []}
+    for tenant_id, amount, paid_at, status in iter_rows(source, 'manage_payments'):
+        if status == 'paid' and paid_at and _day(paid_at) >= cutoff:
+            payments['tenant'].append(tenant_id)
+            payments['amount'].append(amount)
+
+    # 每位在籍學員一列的欄式資料，依補習班（及風險等級）以 charts.aggregate 彙總
+    columns = {'tenant': [], 'level': [], 'att_total': [], 'att_present': []}
+    for tenant_id, stats in students.values():
+        columns['tenant'].append(tenant_id)
+        columns['level'].append((tenant_id, stats.risk_level()))
+        columns['att_total'].append(stats.att_total)
+        columns['att_present'].append(stats.att_present)
+    tenants = tuple(dict.fromkeys(columns['tenant'] + payments['tenant']))
+    levels = tuple((tenant_id, level) for tenant_id in tenants for level in RISK_LEVELS)
+    _, active = charts.aggregate(columns, 'tenant', how='count', order=tenants)
+    _, att_total = charts.aggregate(columns, 'tenant', 'att_total', order=tenants)
+    _, att_present = charts.aggregate(columns, 'tenant', 'att_present', order=tenants)
+    _, risk = charts.aggregate(columns, 'level', how='count', order=levels)
+    _, collected = charts.aggregate(payments, 'tenant', 'amount', order=tenants)
+    risk = dict(zip(levels, risk))
+
+    figures = {}
+    for tenant_id, students_n, total, present, amount in zip(tenants, active, att_total, att_present, collected):
+        figures[tenant_id] = BranchFigures(
+            active_students=int(students_n),
+            attendance_rate=present / total if total else None,
+            risk_counts={level: int(risk[tenant_id, level]) for level in RISK_LEVELS},
+            collected=int(round(amount)),
+        )
+    return figures
+
+
+# ====== 學員報告 ======
+def _query(conn, sql):
+    """逐批讀取查詢結果"""
+    cursor = conn.execute(sql)
+    while True:
+        rows = cursor.fetchmany(5000)
+        if not rows:
+            return
+        yield from rows
+
+
+def _has_table(conn, *tables):
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return all(table in names for table in tables)
+
+
+def _select_list(conn, table, columns):
+    """SELECT 欄位清單；資料表沒有的欄位以 NULL 代替"""
+    existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+    return ', '.join(c if c in existing else f'NULL AS {c}' for c in columns)
+
+
+@contextlib.contextmanager
+def _sqlite_snapshot(source):
+    """SQLite 快照直接使用；CSV 目錄逐列匯入暫存 SQLite 檔（不整表載入記憶體）"""
+    if not os.path.isdir(source):
+        yield source
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'snapshot.db')
+        conn = sqlite3.connect(path)
+        try:
+            for table, columns in dict(TABLES, manage_students=STUDENT_COLUMNS).items():
+                conn.execute(f'CREATE TABLE {table} ({", ".join(columns)})')
+                conn.executemany(f'INSERT INTO {table} VALUES ({", ".join("?" * len(columns))})',
+                                 iter_rows(source, table, columns))
+            conn.commit()
+        finally:
+            conn.close()
+        yield path
+
+
+def _grouped(rows):
+    """依第一欄分組（rows 已依第一欄排序），逐組回傳 (key, [其餘欄位, …])"""
+    for key, group in itertools.groupby(rows, key=operator.itemgetter(0)):
+        yield key, [row[1:] for row in group]
+
+
+def _merge(students, *streams):
+    """依學員 id 合併：每位學員配上各 stream（_grouped）中同 id 的資料列"""
+    heads = [next(stream, None) for stream in streams]
+    for row in students:
+        matched = []
+        for i, stream in enumerate(streams):
+            while heads[i] is not None and heads[i][0] < row[0]:
+                heads[i] = next(stream, None)
+            if heads[i] is not None and heads[i][0] == row[0]:
+                matched.append(heads[i][1])
+                heads[i] = next(stream, None)
+            else:
+                matched.append([])
+        yield row, matched
+
+
+def iter_students(source, as_of=None, days_back=60, max_scores=8):
+    """逐位回傳在籍學員的報告數據（Student），依學員 id 排序
+
+    學員、出勤、成績三張表各以一次依 student_id 排序的查詢讀取，合併時只保留
+    目前這位學員的資料，記憶體用量與學員數無關。風險評分與 load_figures 相同；
+    `weekly` 為近 `days_back` 天每週的 (週起日, 出勤率)，`scores` 為最近
+    `max_scores` 次考試的 (考試日, 分數)。
+    """
+    as_of = _day(as_of) if as_of else datetime.date.today()
+    cutoff = as_of - datetime.timedelta(days=days_back)
+    mid = as_of - datetime.timedelta(days=days_back // 2)
+    weeks = -(-(days_back + 1) // 7)
+
+    with _sqlite_snapshot(source) as path:
+        conn = sqlite3.connect(path)
+        try:
+            tenants = {tid: (name, slug) for tid, name, slug in iter_rows(path, 'tenants')}
+            if not _has_table(conn, 'manage_students'):
+                return
+            students = _query(conn, f"SELECT {_select_list(conn, 'manage_students', STUDENT_COLUMNS)} "
+                                    f"FROM manage_students WHERE COALESCE(status, 'active') = 'active' ORDER BY id")
+            attendance = iter(())
+            if _has_table(conn, 'inclass_attendances'):
+                attendance = _grouped(_query(
+                    conn, 'SELECT student_id, date, status FROM inclass_attendances '
+                          'WHERE student_id IS NOT NULL AND date IS NOT NULL ORDER BY student_id'))
+            scores = iter(())
+            if _has_table(conn, 'inclass_exam_scores', 'inclass_exams'):
+                scores = _grouped(_query(
+                    conn, 'SELECT s.student_id, e.exam_date, s.score FROM inclass_exam_scores s '
+                          'JOIN inclass_exams e ON e.id = s.exam_id WHERE s.student_id IS NOT NULL '
+                          'AND e.exam_date IS NOT NULL AND s.score IS NOT NULL ORDER BY s.student_id'))
+
+            for (sid, tenant_id, _status, name, grade), (att_rows, score_rows) in _merge(
+                    students, attendance, scores):
+                stats = _StudentStats()
+                week_total, week_present = [0] * weeks, [0] * weeks
+                for day, status in att_rows:
+                    day = _day(day)
+                    if day > as_of:
+                        continue
+                    stats.add_attendance(day, status, cutoff, mid)
+                    if day >= cutoff:
+                        week = (as_of - day).days // 7
+                        week_total[week] += 1
+                        week_present[week] += status in ('present', 'late')
+                exams = sorted((_day(day), int(score)) for day, score in score_rows)
+                for day, score in exams:
+                    stats.add_score(day, score)
+
+                factors = stats.risk_factors()
+                risk = min(100, sum(points for _, points in factors))
+                tenant_name, tenant_slug = tenants.get(tenant_id, ('', ''))
+                yield Student(
+                    id=sid, tenant_id=tenant_id, tenant_name=tenant_name, tenant_slug=tenant_slug,
+                    name=name, grade=grade,
+                    attendance_rate=stats.att_present / stats.att_total if stats.att_total else None,
+                    present=stats.att_present, sessions=stats.att_total,
+                    weekly=tuple((str(as_of - datetime.timedelta(days=7 * w + 6)), week_present[w] / week_total[w])
+                                 for w in reversed(range(weeks)) if week_total[w]),
+                    scores=tuple((str(day), score) for day, score in exams[-max_scores:]),
+                    risk_score=risk, risk_level=_level(risk),
+                    risk_factors=tuple(key for key, _ in factors),
+                )
+        finally:
+            conn.close()
@@ -0,0 +1,115 @@
+"""
+94CramManageSystem - deck spec 讀取與檢查
+
+只使用標準函式庫，讓 --help、--list-slides、--check 不必載入 python-pptx。
+"""
+
+import json
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SPEC = os.path.join(BASE_DIR, 'decks', '94cram_marketing.json')
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, '94Cram_行銷簡報_Demo.pptx')
+REPORT_SPEC = os.path.join(BASE_DIR, 'decks', 'student_report.json')
+
+# deck.py 以 @layout 註冊的版型及各版型必填的欄位；新增版型或欄位時兩處需一起更新。
+# 學員報告版型只列範本中的欄位（stats、risk、scores、weekly 由 report_spec 依學員資料填入）
+LAYOUT_FIELDS = {
+    'cover': ('brand', 'title', 'subtitle', 'tagline', 'date', 'badge'),
+    'pain_points': ('title', 'pain_points'),
+    'solutions': ('title', 'systems', 'banner'),
+    'manage': ('title', 'funnel_title', 'funnel_stages', 'funnel_note', 'right_features'),
+    'churn': ('title', 'signals_title', 'signals', 'dashboard_title', 'risk_levels', 'footer'),
+    'inclass': ('title', 'cards', 'features_bottom'),
+    'showcase': ('title', 'screenshots'),
+    'stock': ('title', 'flow_items', 'bottom_features'),
+    'bot': ('title', 'subtitle', 'admin_title', 'admin_commands', 'admin_footer',
+            'parent_title', 'parent_features', 'parent_footer'),
+    'compare': ('title', 'col_widths', 'headers', 'compare_items', 'conclusion'),
+    'architecture': ('title', 'arch_layers', 'advantages'),
+    'security': ('title', 'subtitle', 'security_items'),
+    'cost': ('title', 'stats', 'cost_title', 'cost_compare', 'roi_title', 'roi_items'),
+    'plans': ('title', 'plans', 'featured_label'),
+    'onboarding': ('title', 'steps', 'promises'),
+    'cta': ('lead', 'title', 'contact_info', 'primary_cta', 'secondary_cta', 'footer'),
+    'report_summary': ('title', 'stat_labels', 'risk_title', 'risk_levels', 'footer',
+                       'factors_title', 'factors', 'no_factors'),
+    'report_trend': ('title', 'scores_title', 'attendance_title', 'empty_note'),
+}
+LAYOUT_NAMES = tuple(LAYOUT_FIELDS)
+
+# spec 可引用的圖片：必須是 ASSET_ROOT 之下的圖片檔（spec 可能來自 render 服務的使用者）
+ASSET_ROOT = BASE_DIR
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+# 投影片寬高（吋）：.pptx 允許的範圍
+SLIDE_SIZE_RANGE = (1, 56)
+
+
+def load_spec(path=DEFAULT_SPEC):
+    """讀取 JSON deck spec"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def validate_spec(spec):
+    """檢查 deck spec 的結構，回傳問題清單（空清單代表通過）"""
+    if not isinstance(spec, dict):
+        return ['deck spec 必須是 JSON 物件']
+    problems = []
+    for key in ('slide_width', 'slide_height'):
+        if key not in spec:
+            continue
+        low, high = SLIDE_SIZE_RANGE
+        if not isinstance(spec[key], (int, float)) or isinstance(spec[key], bool):
+            problems.append(f'{key} 必須是數字')
+        elif not low <= spec[key] <= high:
+            problems.append(f'{key} 必須介於 {low}–{high} 吋：{spec[key]}')
+    slides = spec.get('slides')
+    if not isinstance(slides, list) or not slides:
+        return problems + ['slides 必須是非空陣列']
+    for i, data in enumerate(slides, 1):
+        if not isinstance(data, dict):
+            problems.append(f'第 {i} 頁必須是 JSON 物件')
+        elif data.get('layout') not in LAYOUT_NAMES:
+            problems.append(f"第 {i} 頁：未知的版型：{data.get('layout')!r}")
+        else:
+            missing = [key for key in LAYOUT_FIELDS[data['layout']] if key not in data]
+            if missing:
+                problems.append(f"第 {i} 頁：{data['layout']} 缺少欄位：{', '.join(missing)}")
+            for path in _slide_images(data):
+                try:
+                    resolve_asset(path)
+                except ValueError as e:
+                    problems.append(f'第 {i} 頁：{e}')
+    return problems
+
+
+def _slide_images(data):
+    """單頁 spec 引用的圖片路徑"""
+    if data['layout'] == 'showcase' and isinstance(data.get('screenshots'), list):
+        return [entry[0] if isinstance(entry, list) and entry else entry for entry in data['screenshots']]
+    return []
+
+
+def resolve_asset(path):
+    """spec 中的圖片路徑（相對於 ASSET_ROOT）轉成實際路徑
+
+    解析符號連結後超出 ASSET_ROOT、不是圖片副檔名或檔案不存在時引發 ValueError。
+    """
+    if not isinstance(path, str) or not path:
+        raise ValueError(f'圖片路徑必須是非空字串：{path!r}')
+    root = os.path.realpath(ASSET_ROOT)
+    real = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, real]) != root:
+        raise ValueError(f'圖片路徑超出素材目錄：{path!r}')
+    if os.path.splitext(real)[1].lower() not in IMAGE_EXTENSIONS:
+        raise ValueError(f"圖片必須是 {'、'.join(IMAGE_EXTENSIONS)} 檔：{path!r}")
+    if not os.path.isfile(real):
+        raise ValueError(f'找不到圖片：{path!r}')
+    return real
+
+
+def list_slides(spec):
+    """回傳 [(頁碼, 版型, 標題)]"""
+    return [(i, data.get('layout'), data.get('title', ''))
+            for i, data in enumerate(spec.get('slides', []), 1)]
@@ -0,0 +1,68 @@
+"""
+94CramManageSystem - 簡報輸出服務測試
+
+    python -m unittest discover -s cramdeck/tests -t .
+"""
+
+import asyncio
+import copy
+import json
+import unittest
+from unittest import mock
+
+from cramdeck.service import DeckService, _request
+from cramdeck.spec import load_spec
+
+
+async def _post(service, body):
+    """經由真正的連線（serve_connection）送出一個請求，回傳狀態碼"""
+    server = await asyncio.start_server(service.serve_connection, '127.0.0.1', 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    async with server:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            return await _request(reader, writer, host, '/render?format=pptx', body)
+        finally:
+            writer.close()
+
+
+def _spec(**changes):
+    """預設 spec 的複本；`changes` 為 {版型: 要覆寫的欄位}，`deck` 覆寫最上層"""
+    spec = copy.deepcopy(load_spec())
+    spec.update(changes.pop('deck', {}))
+    for data in spec['slides']:
+        data.update(changes.get(data['layout'], {}))
+    return json.dumps(spec, ensure_ascii=False).encode('utf-8')
+
+
+class DeckServiceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = DeckService(jobs=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.close()
+
+    def post(self, body):
+        return asyncio.run(_post(self.service, body))
+
+    def test_default_spec_renders(self):
+        self.assertEqual(self.post(b''), 200)
+
+    def test_bad_value_is_client_error(self):
+        # 通過 validate_spec 的結構檢查，編譯時才發現型別錯誤
+        self.assertEqual(self.post(_spec(cover={'brand': 123})), 400)
+
+    def test_bad_slide_size_is_client_error(self):
+        self.assertEqual(self.post(_spec(deck={'slide_width': -5})), 400)
+
+    def test_render_fault_is_server_error(self):
+        errors = self.service.stats['errors']
+        with mock.patch.object(self.service, 'render', side_effect=RuntimeError('boom')):
+            self.assertEqual(self.post(_spec(cover={'brand': '94Cram'})), 500)
+        self.assertEqual(self.service.stats['errors'], errors + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+"""
+94CramManageSystem - 文字量測與自動縮字
+
+不開啟 PowerPoint、不需要字型檔，離線估算文字框內的排版：
+  - 每個字型一張字寬表（單位 1/1000 em）：ASCII 逐字查表，CJK 與全形標點
+    固定 1 em，emoji 另計；查過的字元記在該字型的快取表中
+  - 依 PowerPoint 的換行規則斷行：英數字以單字為單位、CJK 逐字可斷，
+    行首禁則（，。、）」等不放在行首，（「等不放在行尾）
+  - 文字框超出高度時，可由大到小找出放得下的最大字級
+
+斷行結果依 (文字, 字型, 字級, 粗體, 寬度) 快取，1,000 份簡報的批次中相同的
+文字只量測一次。位置與尺寸皆為 EMU，與 python-pptx 相同。
+"""
+
+from collections import namedtuple
+import functools
+import re
+
+EMU_PER_PT = 12700
+# python-pptx 文字框預設內距：左右 0.1 吋、上下 0.05 吋
+INSET_X = 91440
+INSET_Y = 45720
+MIN_FONT_SIZE = 8
+
+# Helvetica / Arial 系的 ASCII 字寬（0x20–0x7E），正黑體的英數字寬與此相近
+_ZWJ = '\u200d'
+_ZWJ_JOINED = re.compile('\u200d.')
+_ASCII_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+
+
+class FontMetrics:
+    """單一字型的字寬表
+
+    `latin` 為 0x20–0x7E 的字寬；`wide` 為 CJK、全形字元的字寬；`emoji` 為
+    emoji 的字寬（正黑體沒有 emoji，由系統字型補字，通常比 1 em 寬）；
+    `other` 為其他字元；`bold` 為粗體時英數字的放大倍率；`line_height` 為
+    單行高度（em）。
+    """
+
+    def __init__(self, latin=_ASCII_WIDTHS, wide=1000, emoji=1150, other=600,
+                 bold=1.06, line_height=1.3):
+        self.latin = dict(zip(map(chr, range(0x20, 0x7F)), latin))
+        self.wide = wide
+        self.emoji = emoji
+        self.other = other
+        self.bold = bold
+        self.line_height = line_height
+        self._widths = ({}, {})     # (一般, 粗體) 已查過的字元
+
+    def char_width(self, ch, bold=False):
+        """單一字元的字寬（1/1000 em）"""
+        widths = self._widths[bool(bold)]
+        width = widths.get(ch)
+        if width is None:
+            kind = char_class(ch)
+            if kind == 'latin':
+                width = self.latin.get(ch, self.other)
+                if bold:
+                    width = round(width * self.bold)
+            else:
+                width = {'wide': self.wide, 'emoji': self.emoji, 'mark': 0}.get(kind, self.other)
+            widths[ch] = width
+        return width
+
+    def width(self, text, bold=False):
+        """字串寬度（1/1000 em，不斷行）"""
+        if _ZWJ in text:
+            # ZWJ 組合的 emoji（👨‍🎓）只顯示為一個字形
+            text = _ZWJ_JOINED.sub('', text)
+        widths = self._widths[bool(bold)]
+        try:
+            return sum(map(widths.__getitem__, text))
+        except KeyError:
+            return sum(self.char_width(ch, bold) for ch in text)
+
+
+DEFAULT_FONT = 'Microsoft JhengHei'
+FONTS = {
+    DEFAULT_FONT: FontMetrics(),
+}
+
+
+def font_metrics(font_name):
+    """取得字型的字寬表；未登錄的字型使用正黑體的字寬"""
+    return FONTS.get(font_name) or FONTS[DEFAULT_FONT]
+
+
+# ====== 字元分類 ======
+_WIDE_RANGES = (
+    (0x1100, 0x115F), (0x2E80, 0x303E), (0x3041, 0x33FF), (0x3400, 0x4DBF),
+    (0x4E00, 0x9FFF), (0xA000, 0xA4CF), (0xAC00, 0xD7A3), (0xF900, 0xFAFF),
+    (0xFE30, 0xFE4F), (0xFF00, 0xFF60), (0xFFE0, 0xFFE6), (0x20000, 0x3FFFD),
+)
+_EMOJI_RANGES = (
+    (0x2190, 0x21FF), (0x2300, 0x23FF), (0x2460, 0x24FF), (0x25A0, 0x27BF),
+    (0x2B00, 0x2BFF), (0x1F000, 0x1FAFF),
+)
+# 不佔寬度、附在前一字元上的字元：變體選擇符、ZWJ、膚色修飾、組合符號
+_MARK_RANGES = (
+    (0x0300, 0x036F), (0x200B, 0x200F), (0xFE00, 0xFE0F), (0x1F3FB, 0x1F3FF), (0xE0020, 0xE007F),
+)
+
+
+def _in(ranges, code):
+    return any(lo <= code <= hi for lo, hi in ranges)
+
+
+@functools.lru_cache(maxsize=None)
+def char_class(ch):
+    """字元分類：'latin'、'wide'（CJK、全形）、'emoji'、'mark'（零寬）、'other'"""
+    code = ord(ch)
+    if code < 0x7F:
+        return 'latin'
+    if _in(_MARK_RANGES, code):
+        return 'mark'
+    if _in(_WIDE_RANGES, code):
+        return 'wide'
+    if _in(_EMOJI_RANGES, code):
+        return 'emoji'
+    return 'other'
+
+
+# ====== 斷行 ======
+# 行首禁則：不可出現在行首的標點；行尾禁則：不可出現在行尾的標點
+_NO_LINE_START = set('，。、；：？！）」』】》〉…—～,.;:?!)]}%·')
+_NO_LINE_END = set('（「『【《〈([{$')
+# 英數字單字（含尾端空白）或單一字元
+_TOKEN = re.compile(r'[!-~\u00a0-\u024f]+ *| +|.', re.S)
+_LINE_BREAK = re.compile('\n|\v')
+
+
+def _units(paragraph):
+    """將段落切成不可再分的斷行單位，並套用行首／行尾禁則"""
+    units = []
+    glue = False
+    for token in _TOKEN.findall(paragraph):
+        if units and (glue or token[0] in _NO_LINE_START or char_class(token[0]) == 'mark'
+                      or units[-1][-1] == _ZWJ):
+            units[-1] += token
+        else:
+            units.append(token)
+        glue = token[-1] in _NO_LINE_END
+    return units
+
+
+def _wrap_paragraph(paragraph, metrics, bold, limit):
+    """貪婪斷行；`limit` 為一行可用的寬度（1/1000 em）"""
+    lines = []
+    line, used = '', 0
+    for unit in _units(paragraph):
+        width = metrics.width(unit, bold)
+        if line and used + metrics.width(unit.rstrip(' '), bold) > limit:
+            lines.append(line.rstrip(' '))
+            line, used = '', 0
+            if unit.isspace():
+                continue
+        if not line and width > limit and len(unit) > 1 and char_class(unit[0]) == 'latin':
+            # 單一單位比一行還寬（長網址、長數字）：逐字斷開
+            for ch in unit:
+                ch_width = metrics.char_width(ch, bold)
+                if line and used + ch_width > limit and ch != ' ':
+                    lines.append(line.rstrip(' '))
+                    line, used = '', 0
+                line += ch
+                used += ch_width
+            continue
+        line += unit
+        used += width
+    lines.append(line.rstrip(' '))
+    return lines
+
+
+@functools.lru_cache(maxsize=65536)
+def wrap(text, width, font_size, font_name=DEFAULT_FONT, bold=False):
+    """將文字依文字框寬度（EMU，含內距）斷行，回傳各行字串的 tuple"""
+    metrics = font_metrics(font_name)
+    limit = (width - 2 * INSET_X) * 1000 / (font_size * EMU_PER_PT)
+    lines = []
+    for paragraph in _LINE_BREAK.split(text):
+        lines.extend(_wrap_paragraph(paragraph, metrics, bold, limit))
+    return tuple(lines)
+
+
+def text_width(text, font_size, font_name=DEFAULT_FONT, bold=False):
+    """最寬一行的寬度（EMU，不含內距、不自動斷行）"""
+    metrics = font_metrics(font_name)
+    widest = max(metrics.width(line, bold) for line in _LINE_BREAK.split(text))
+    return round(widest * font_size * EMU_PER_PT / 1000)
+
+
+def text_height(line_count, font_size, font_name=DEFAULT_FONT):
+    """`line_count` 行文字所需的文字框高度（EMU，含內距）"""
+    return round(line_count * font_size * EMU_PER_PT * font_metrics(font_name).line_height) + 2 * INSET_Y
+
+
+Fit = namedtuple('Fit', 'font_size lines height overflow')
+
+
+@functools.lru_cache(maxsize=65536)
+def measure(text, width, height, font_size, font_name=DEFAULT_FONT, bold=False):
+    """以指定字級排入 width × height（EMU）的文字框，回傳 Fit
+
+    `height` 為排版後所需高度；`overflow` 為超出文字框的高度（EMU，0 代表放得下）。
+    """
+    lines = wrap(text, width, font_size, font_name, bold)
+    needed = text_height(len(lines), font_size, font_name)
+    return Fit(font_size, lines, needed, max(0, needed - height))
+
+
+@functools.lru_cache(maxsize=65536)
+def fit(text, width, height, font_size, font_name=DEFAULT_FONT, bold=False, min_size=MIN_FONT_SIZE):
+    """在 `font_size` 與 `min_size` 之間（整數 pt）找出放得下的最大字級，回傳 Fit
+
+    字級越小所需高度越少，以二分搜尋；連 `min_size` 都放不下時回傳 `min_size` 的結果
+    （overflow 大於 0）。
+    """
+    best = measure(text, width, height, font_size, font_name, bold)
+    if not best.overflow or font_size <= min_size:
+        return best
+    lo, hi = min_size, int(font_size) - (font_size == int(font_size))
+    best = measure(text, width, height, lo, font_name, bold)
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        result = measure(text, width, height, mid, font_name, bold)
+        if result.overflow:
+            hi = mid - 1
+        else:
+            best, lo = result, mid + 1
+    return best
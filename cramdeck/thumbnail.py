@@ -0,0 +1,291 @@
+"""
+94CramManageSystem - 投影片縮圖
+
+直接由形狀計畫（SlidePlan）繪出縮圖，不必先輸出 .pptx 再以 LibreOffice 轉檔：
+  - SVG：viewBox 以 EMU 為單位，背景、矩形、圓角矩形、圓形與文字框一對一轉成
+    <rect> / <ellipse> / <text>，斷行與字級沿用 textfit 的排版結果
+  - PNG：以 Pillow（python-pptx 的相依套件）2 倍取樣繪製後縮小。指定字型檔
+    時繪出文字；未指定時文字以同色色條（greeking）表示，縮圖尺寸下已足夠辨識版面
+
+縮圖依頁面內容雜湊（slide_key）快取，內容沒變的頁面不重新繪製；需要繪製的
+頁面可分給多個行程平行處理。
+
+    python -m cramdeck --thumbnails previews --thumb-format png -j 4
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
+import json
+import os
+from xml.sax.saxutils import escape
+
+from pptx.enum.text import PP_ALIGN
+
+from . import assets, charts, textfit
+from .deck import slide_key
+
+THUMB_VERSION = 1
+THUMB_WIDTH = 480
+SUPERSAMPLE = 2
+# 圓角矩形預設圓角（roundRect adj 16667：短邊的 1/6）
+ROUND_RATIO = 0.16667
+# 字身上緣到基線的距離（em），CJK 字型約 0.88
+ASCENT = 0.88
+FONT_FAMILY = "'Microsoft JhengHei', 'PingFang TC', 'Noto Sans CJK TC', sans-serif"
+
+
+def _hex(color):
+    return f'#{color}'
+
+
+def _text_lines(shape):
+    """文字框各行的 (文字, 行頂 y, 行寬)，單位 EMU"""
+    left, top, width, height, props = shape[1:]
+    size, font, bold = props['font_size'], props['font_name'], props['bold']
+    line_height = size * textfit.EMU_PER_PT * textfit.font_metrics(font).line_height
+    for i, line in enumerate(textfit.wrap(props['text'], width, size, font, bold)):
+        yield line, top + textfit.INSET_Y + i * line_height, textfit.text_width(line, size, font, bold)
+
+
+def _line_left(shape, line_width):
+    """依對齊方式計算一行文字的左緣（EMU）"""
+    left, width, alignment = shape.left, shape.width, shape.props['alignment']
+    if alignment == PP_ALIGN.CENTER:
+        return left + (width - line_width) / 2
+    if alignment == PP_ALIGN.RIGHT:
+        return left + width - textfit.INSET_X - line_width
+    return left + textfit.INSET_X
+
+
+# ====== SVG ======
+_ANCHORS = {PP_ALIGN.CENTER: 'middle', PP_ALIGN.RIGHT: 'end'}
+
+
+def _svg_fill(props):
+    fill = f'fill="{_hex(props["color"])}"'
+    if props['alpha'] is not None:
+        fill += f' fill-opacity="{props["alpha"] / 100:g}"'
+    return fill
+
+
+def slide_svg(plan, width_px=THUMB_WIDTH):
+    """將 SlidePlan 繪成 SVG 字串"""
+    height_px = round(width_px * plan.height / plan.width)
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {plan.width} {plan.height}" '
+           f'width="{width_px}" height="{height_px}" font-family="{escape(FONT_FAMILY)}">']
+    if plan.bg is not None:
+        out.append(f'<rect width="{plan.width}" height="{plan.height}" fill="{_hex(plan.bg)}"/>')
+    for shape in plan.shapes:
+        kind, left, top, width, height, props = shape
+        if kind == 'rect':
+            out.append(f'<rect x="{left}" y="{top}" width="{width}" height="{height}" {_svg_fill(props)}/>')
+        elif kind == 'rounded_rect':
+            radius = round(min(width, height) * ROUND_RATIO)
+            out.append(f'<rect x="{left}" y="{top}" width="{width}" height="{height}" rx="{radius}" '
+                       f'{_svg_fill(props)}/>')
+        elif kind == 'circle':
+            out.append(f'<ellipse cx="{left + width // 2}" cy="{top + height // 2}" rx="{width // 2}" '
+                       f'ry="{height // 2}" {_svg_fill(props)}/>')
+        elif kind == 'text':
+            out.append(_svg_text(shape))
+        elif kind == 'chart':
+            out.append(f'<svg x="{left}" y="{top}" width="{width}" height="{height}" '
+                       f'viewBox="0 0 {width} {height}">{charts.chart_svg(props, width, height)}</svg>')
+        elif kind == 'image':
+            place = assets.placement(assets.source(props['path']), left, top, width, height, props['fit'])
+            uri = assets.data_uri(props['path'], width, height, props['fit'], _thumb_dpi(plan, width_px))
+            out.append(f'<image x="{place.left}" y="{place.top}" width="{place.width}" height="{place.height}" '
+                       f'preserveAspectRatio="none" href="{uri}"/>')
+        else:
+            raise ValueError(f'未知的形狀種類：{kind!r}')
+    out.append('</svg>')
+    return '\n'.join(out)
+
+
+def _svg_text(shape):
+    props = shape.props
+    size = props['font_size'] * textfit.EMU_PER_PT
+    lead = size * (textfit.font_metrics(props['font_name']).line_height - 1) / 2
+    anchor = _ANCHORS.get(props['alignment'])
+    if anchor == 'middle':
+        x = shape.left + shape.width // 2
+    elif anchor == 'end':
+        x = shape.left + shape.width - textfit.INSET_X
+    else:
+        x = shape.left + textfit.INSET_X
+    attrs = f'font-size="{size}" fill="{_hex(props["color"])}"'
+    if props['bold']:
+        attrs += ' font-weight="bold"'
+    if anchor:
+        attrs += f' text-anchor="{anchor}"'
+    spans = ''.join(
+        f'<tspan x="{x}" y="{round(line_top + lead + size * ASCENT)}">{escape(line)}</tspan>'
+        for line, line_top, _ in _text_lines(shape) if line
+    )
+    return f'<text {attrs}>{spans}</text>'
+
+
+# ====== PNG ======
+def slide_png(plan, width_px=THUMB_WIDTH, font=None):
+    """將 SlidePlan 繪成 PNG；`font` 為字型檔路徑，未指定時文字以色條表示"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    scale = width_px * SUPERSAMPLE / plan.width
+    size = (width_px * SUPERSAMPLE, round(plan.height * scale))
+    image = Image.new('RGBA', size, _rgb(plan.bg) if plan.bg is not None else (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    fonts = {}
+
+    for shape in plan.shapes:
+        kind, left, top, width, height, props = shape
+        box = (left * scale, top * scale, (left + width) * scale, (top + height) * scale)
+        if kind == 'text':
+            color = _rgb(props['color'])
+            em = props['font_size'] * textfit.EMU_PER_PT
+            lead = em * (textfit.font_metrics(props['font_name']).line_height - 1) / 2
+            for line, line_top, line_width in _text_lines(shape):
+                if not line:
+                    continue
+                x = _line_left(shape, line_width) * scale
+                if font is None:
+                    # 以字身中段高度的色條代表一行文字
+                    y = (line_top + lead + em * 0.25) * scale
+                    draw.rectangle((x, y, x + line_width * scale, y + em * 0.5 * scale), fill=color)
+                else:
+                    px = max(1, round(em * scale))
+                    if px not in fonts:
+                        fonts[px] = ImageFont.truetype(font, px)
+                    baseline = (line_top + lead + em * ASCENT) * scale
+                    draw.text((x, baseline), line, font=fonts[px], fill=color, anchor='ls')
+            continue
+        if kind == 'chart':
+            _draw_chart(draw, shape, scale)
+            continue
+        if kind == 'image':
+            _draw_image(image, shape, scale, _thumb_dpi(plan, width_px) * SUPERSAMPLE)
+            continue
+
+        fill = _rgb(props['color'])
+        target = draw
+        if props['alpha'] is not None:
+            # 半透明形狀先畫在獨立圖層再疊合
+            overlay = Image.new('RGBA', size, (0, 0, 0, 0))
+            target = ImageDraw.Draw(overlay)
+            fill += (round(255 * props['alpha'] / 100),)
+        if kind == 'rect':
+            target.rectangle(box, fill=fill)
+        elif kind == 'rounded_rect':
+            target.rounded_rectangle(box, radius=min(width, height) * ROUND_RATIO * scale, fill=fill)
+        elif kind == 'circle':
+            target.ellipse(box, fill=fill)
+        else:
+            raise ValueError(f'未知的形狀種類：{kind!r}')
+        if target is not draw:
+            image.alpha_composite(overlay)
+
+    image = image.convert('RGB').resize((width_px, round(size[1] / SUPERSAMPLE)), Image.LANCZOS)
+    buf = io.BytesIO()
+    image.save(buf, 'PNG', optimize=True)
+    return buf.getvalue()
+
+
+def _thumb_dpi(plan, width_px):
+    """縮圖的解析度：圖片只需處理到縮圖實際需要的像素"""
+    return width_px * assets.EMU_PER_INCH / plan.width
+
+
+def _draw_image(image, shape, scale, dpi):
+    from PIL import Image
+
+    kind, left, top, width, height, props = shape
+    place = assets.placement(assets.source(props['path']), left, top, width, height, props['fit'])
+    size = (max(1, round(place.width * scale)), max(1, round(place.height * scale)))
+    with Image.open(io.BytesIO(assets.prepare(props['path'], width, height, props['fit'], dpi=dpi))) as picture:
+        picture = picture.convert('RGBA').resize(size, Image.LANCZOS)
+    image.alpha_composite(picture, (round(place.left * scale), round(place.top * scale)))
+
+
+def _rgb(color):
+    return tuple(color)
+
+
+def _draw_chart(draw, shape, scale):
+    """以 chart_marks 的基本圖形繪製圖表"""
+    x0, y0 = shape.left * scale, shape.top * scale
+    for kind, color, geometry in charts.chart_marks(shape.props, shape.width, shape.height):
+        fill = _rgb(color)
+        if kind == 'rect':
+            x, y, w, h = (v * scale for v in geometry)
+            draw.rectangle((x0 + x, y0 + y, x0 + x + w, y0 + y + h), fill=fill)
+        elif kind == 'line':
+            points = [(x0 + x * scale, y0 + y * scale) for x, y in geometry]
+            draw.line(points, fill=fill, width=max(1, round(shape.height * 0.02 * scale)), joint='curve')
+        else:
+            cx, cy, outer, inner, start, end = geometry
+            cx, cy, outer, inner = x0 + cx * scale, y0 + cy * scale, outer * scale, inner * scale
+            if end > start:
+                # Pillow 的角度以 3 點鐘方向為 0
+                draw.arc((cx - outer, cy - outer, cx + outer, cy + outer), start - 90, end - 90,
+                         fill=fill, width=round(outer - inner))
+
+
+# ====== 批次輸出 ======
+def render_thumbnail(plan, fmt='svg', width_px=THUMB_WIDTH, font=None):
+    """繪製單頁縮圖，回傳位元組"""
+    if fmt == 'svg':
+        return slide_svg(plan, width_px).encode('utf-8')
+    if fmt == 'png':
+        return slide_png(plan, width_px, font)
+    raise ValueError(f'不支援的縮圖格式：{fmt!r}')
+
+
+def thumbnail_key(plan, width, height, fmt, width_px, font=None):
+    """縮圖的內容雜湊：頁面內容（slide_key）加上格式、寬度與字型"""
+    payload = json.dumps([THUMB_VERSION, slide_key(plan, width, height), fmt, width_px, font])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _render_group(plans, fmt, width_px, font):
+    """子行程：繪製一組頁面的縮圖"""
+    return [render_thumbnail(plan, fmt, width_px, font) for plan in plans]
+
+
+def render_thumbnails(deck, out_dir, fmt='svg', width_px=THUMB_WIDTH, jobs=1, cache=None, font=None):
+    """將 DeckPlan 每頁的縮圖寫到 `out_dir`（slide-01.svg …），回傳輸出路徑清單
+
+    `cache` 為 SlideCache（副檔名需與格式相同）；`jobs` 大於 1 時以 process pool 平行繪製。
+    """
+    blobs, keys = {}, {}
+    if cache is not None:
+        for i, plan in enumerate(deck.slides):
+            keys[i] = thumbnail_key(plan, deck.width, deck.height, fmt, width_px, font)
+            blob = cache.get(keys[i])
+            if blob is not None:
+                blobs[i] = blob
+
+    missing = [i for i in range(len(deck.slides)) if i not in blobs]
+    if jobs > 1 and len(missing) > 1:
+        size = -(-len(missing) // jobs)
+        groups = [missing[i:i + size] for i in range(0, len(missing), size)]
+        with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+            futures = [(group, pool.submit(_render_group, [deck.slides[i] for i in group], fmt, width_px, font))
+                       for group in groups]
+            for group, future in futures:
+                blobs.update(zip(group, future.result()))
+    else:
+        blobs.update(zip(missing, _render_group([deck.slides[i] for i in missing], fmt, width_px, font)))
+
+    if cache is not None:
+        for i in missing:
+            cache.put(keys[i], blobs[i])
+        cache.prune()
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(len(deck.slides)):
+        path = os.path.join(out_dir, f'slide-{i + 1:02d}.{fmt}')
+        with open(path, 'wb') as f:
+            f.write(blobs[i])
+        paths.append(path)
+    return paths
@@ -0,0 +1,217 @@
+"""
+94CramManageSystem - 網頁版簡報
+
+由與 .pptx 相同的形狀計畫（DeckPlan）輸出單一 HTML 檔，portal 可直接提供，不需轉檔：
+  - CSS 內嵌，每個形狀是一個絕對定位的元素，位置與大小依 EMU 換算成投影片
+    寬高的百分比；字級與內距以容器寬度單位（cqw）表示，投影片隨螢幕寬度等比縮放
+  - 只有前幾頁直接放在 HTML 中，其餘頁面包在 <template> 裡，捲動接近時才
+    建立 DOM，手機上的首次繪製只需處理第一頁
+  - 圖片預設以 data: URI 在 CSS 中內嵌，每張只內嵌一次，各處以 class 引用，
+    輸出仍是單一檔案；指定 external_media（CLI 的 --html-media）時改為依內容
+    雜湊寫到旁邊的 <檔名>_files/ 目錄，以 <img loading="lazy"> 引用，HTML 較小
+    但必須連同目錄一起提供。service 以 MediaStore 收集圖片，由 /media/ 另外提供
+
+    python -m cramdeck --format html -o deck.html
+    python -m cramdeck --format html --html-media -o deck.html
+"""
+
+import base64
+import hashlib
+import html
+import os
+from urllib.parse import quote
+
+from pptx.enum.text import PP_ALIGN
+
+from . import assets, charts, textfit
+
+FONT_FAMILY = "'Microsoft JhengHei','PingFang TC','Noto Sans CJK TC',sans-serif"
+EAGER_SLIDES = 1
+# 圓角矩形預設圓角（roundRect adj 16667：短邊的 1/6）
+ROUND_RATIO = 0.16667
+
+_PAGE = '''<!DOCTYPE html>
+<html lang="zh-Hant"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>{title}</title>
+<style>
+body{{margin:0;padding:16px 0;background:#e8e4df;font-family:{font}}}
+.s{{position:relative;max-width:1280px;margin:0 auto 16px;aspect-ratio:{width}/{height};overflow:hidden;container-type:inline-size;content-visibility:auto;contain-intrinsic-size:auto 720px}}
+.s>*{{position:absolute;margin:0;box-sizing:border-box}}
+.s>p{{padding:{inset_y}cqw {inset_x}cqw;line-height:{line_height};white-space:pre-wrap;overflow-wrap:anywhere;line-break:strict}}
+.o{{border-radius:50%}}
+{media}</style></head><body>
+{slides}
+<script>
+(function(){{var t=document.querySelectorAll('.s>template');function h(s){{var c=s.querySelector('template');c&&s.replaceChildren(c.content)}}
+if(!('IntersectionObserver' in window)){{t.forEach(function(c){{h(c.parentNode)}});return}}
+var io=new IntersectionObserver(function(es){{es.forEach(function(e){{if(e.isIntersecting){{h(e.target);io.unobserve(e.target)}}}})}},{{rootMargin:'100% 0px'}});
+t.forEach(function(c){{io.observe(c.parentNode)}})}})();
+</script>
+</body></html>
+'''
+
+
+def _num(value):
+    """數值取到小數第 2 位並去掉多餘的 0"""
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+def _hex(color, alpha=None):
+    if alpha is None:
+        return f'#{color}'
+    return f'#{color}{round(255 * alpha / 100):02X}'
+
+
+def _box(plan, left, top, width, height=None):
+    """絕對定位（投影片寬高的百分比）"""
+    style = (f'left:{_num(left * 100 / plan.width)}%;top:{_num(top * 100 / plan.height)}%;'
+             f'width:{_num(width * 100 / plan.width)}%')
+    if height is not None:
+        style += f';height:{_num(height * 100 / plan.height)}%'
+    return style
+
+
+def _cqw(plan, emu):
+    return f'{_num(emu * 100 / plan.width)}cqw'
+
+
+_ALIGN = {PP_ALIGN.CENTER: ';text-align:center', PP_ALIGN.RIGHT: ';text-align:right'}
+
+
+# ====== 圖片 ======
+class InlineMedia:
+    """圖片以 data: URI 內嵌在 CSS 中，相同位元組只內嵌一次"""
+
+    def __init__(self):
+        self.classes = {}
+
+    def element(self, style, blob):
+        digest = hashlib.sha256(blob).hexdigest()
+        if digest not in self.classes:
+            self.classes[digest] = (f'm{len(self.classes)}', blob)
+        return f'<div class="{self.classes[digest][0]}" role="img" style="{style}"></div>'
+
+    def css(self):
+        return ''.join(
+            f'.{name}{{background:url(data:{assets.mime_type(blob)};base64,'
+            f'{base64.b64encode(blob).decode("ascii")}) 0 0/100% 100% no-repeat}}\n'
+            for name, blob in self.classes.values())
+
+
+class MediaStore:
+    """圖片依內容雜湊命名並收集在 `files`，HTML 以 `prefix` 開頭的 URL 引用（由呼叫端提供檔案）"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.files = {}
+
+    def element(self, style, blob):
+        ext = 'png' if assets.mime_type(blob) == 'image/png' else 'jpg'
+        name = f'{hashlib.sha256(blob).hexdigest()[:16]}.{ext}'
+        if name not in self.files:
+            self.files[name] = blob
+            self.save(name, blob)
+        return f'<img style="{style}" alt="" loading="lazy" src="{self.prefix}/{name}">'
+
+    def save(self, name, blob):
+        pass
+
+    def css(self):
+        return ''
+
+
+class MediaFiles(MediaStore):
+    """圖片寫到 `directory`（同名檔案已存在時不重寫）"""
+
+    def __init__(self, directory, prefix):
+        super().__init__(prefix)
+        self.directory = directory
+
+    def save(self, name, blob):
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(blob)
+
+
+def media_files(output):
+    """HTML 輸出到 `output` 時，圖片放在旁邊的 <檔名>_files/ 目錄"""
+    directory = os.path.splitext(os.fspath(output))[0] + '_files'
+    return MediaFiles(directory, quote(os.path.basename(directory)))
+
+
+# ====== 形狀 ======
+def shape_html(plan, shape, media):
+    """單一形狀的 HTML 元素；圖片交給 `media`（InlineMedia 或 MediaStore）輸出"""
+    kind, left, top, width, height, props = shape
+    if kind == 'text':
+        style = (f'{_box(plan, left, top, width)};font-size:{_cqw(plan, props["font_size"] * textfit.EMU_PER_PT)};'
+                 f'color:{_hex(props["color"])}{_ALIGN.get(props["alignment"], "")}')
+        if props['bold']:
+            style += ';font-weight:700'
+        if props['font_name'] != textfit.DEFAULT_FONT:
+            style += f";font-family:'{html.escape(props['font_name'])}',{FONT_FAMILY}"
+        text = html.escape(props['text'].replace('\v', '\n'))
+        return f'<p style="{style}">{text}</p>'
+
+    if kind == 'chart':
+        return (f'<svg style="{_box(plan, left, top, width, height)}" viewBox="0 0 {width} {height}" '
+                f'role="img">{charts.chart_svg(props, width, height)}</svg>')
+
+    if kind == 'image':
+        place = assets.placement(assets.source(props['path']), left, top, width, height, props['fit'])
+        return media.element(_box(plan, *place), assets.prepare(props['path'], width, height, props['fit']))
+
+    style = f'{_box(plan, left, top, width, height)};background:{_hex(props["color"], props["alpha"])}'
+    if kind == 'rect':
+        return f'<div style="{style}"></div>'
+    if kind == 'rounded_rect':
+        return f'<div style="{style};border-radius:{_cqw(plan, min(width, height) * ROUND_RATIO)}"></div>'
+    if kind == 'circle':
+        return f'<div class="o" style="{style}"></div>'
+    raise ValueError(f'未知的形狀種類：{kind!r}')
+
+
+def slide_html(plan, number, media, lazy=False):
+    """單頁投影片的 <section>；`lazy` 時形狀包在 <template> 中，捲動接近時才建立"""
+    style = f' style="background:{_hex(plan.bg)}"' if plan.bg is not None else ''
+    body = ''.join(shape_html(plan, shape, media) for shape in plan.shapes)
+    if lazy:
+        body = f'<template>{body}</template>'
+    return f'<section class="s" id="slide-{number}" aria-label="{number}"{style}>{body}</section>'
+
+
+def deck_html(deck, title='', eager=EAGER_SLIDES, media=None):
+    """將 DeckPlan 輸出成完整的 HTML 頁面字串；前 `eager` 頁直接輸出，其餘延遲建立
+
+    `media` 省略時圖片內嵌（InlineMedia）。
+    """
+    metrics = textfit.font_metrics(textfit.DEFAULT_FONT)
+    media = media if media is not None else InlineMedia()
+    slides = '\n'.join(slide_html(plan, number, media, number > eager)
+                       for number, plan in enumerate(deck.slides, 1))
+    return _PAGE.format(
+        title=html.escape(title), font=FONT_FAMILY, width=deck.width, height=deck.height,
+        inset_x=_num(textfit.INSET_X * 100 / deck.width), inset_y=_num(textfit.INSET_Y * 100 / deck.width),
+        line_height=metrics.line_height, media=media.css(), slides=slides,
+    )
+
+
+def write_html(deck, output, title='', eager=EAGER_SLIDES, external_media=False):
+    """將 HTML 寫到 `output`（路徑或可寫入的二進位串流），回傳位元組數
+
+    `external_media` 時（`output` 須為路徑）圖片另存於 <檔名>_files/（見 media_files），
+    否則內嵌於 HTML 中。
+    """
+    if external_media and not isinstance(output, (str, os.PathLike)):
+        raise ValueError('圖片另存目錄時必須輸出到檔案')
+    media = media_files(output) if external_media else None
+    blob = deck_html(deck, title, eager, media).encode('utf-8')
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            f.write(blob)
+    else:
+        output.write(blob)
+    return len(blob)